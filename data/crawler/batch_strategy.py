@@ -0,0 +1,197 @@
+# batch_strategy.py - 여러 지점/모델의 마케팅 전략을 비동기로 일괄 생성
+import asyncio
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gemini_api import DEFAULT_MODEL, GeminiMarketingStrategist, GeminiRetryableError
+from metrics import METRICS
+from rate_limit import AsyncRateLimiter
+from response_cache import ResponseCache
+
+
+def make_job(branch, reviews, model=DEFAULT_MODEL, region=None):
+    """일괄 생성 작업 하나 생성"""
+    job = {'branch': branch, 'reviews': reviews, 'model': model}
+    if region:
+        job['region'] = region
+    return job
+
+
+async def _call_with_retries(strategist, prompt, max_retries, semaphore, limiter, executor):
+    """
+    재시도를 포함한 Gemini 호출 - 재시도도 매번 세마포어와 분당 제한을 거침
+
+    strategist 자체 재시도는 끈 상태(max_retries=0)로 호출하고, 백오프 대기는 슬롯을 잡지 않은 채 진행
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(max_retries + 1):
+        try:
+            async with semaphore:
+                await limiter.acquire()
+                return await loop.run_in_executor(executor, strategist._call_gemini_api, prompt)
+        except GeminiRetryableError as e:
+            if attempt >= max_retries:
+                raise
+
+            delay = strategist.retry_backoff * (2 ** attempt)
+            strategist.retry_count += 1
+            METRICS.retry('gemini')
+            print(f"🔁 [{strategist.branch_name}/{strategist.model}] "
+                  f"재시도 {attempt + 1}/{max_retries} ({delay:.1f}초 후): {e}")
+            await asyncio.sleep(delay)
+
+
+async def _run_job(job, api_key, semaphore, limiter, executor, cache_executor, cache,
+                   strategist_options):
+    started_at = time.monotonic()
+    options = dict(strategist_options)
+    if job.get('region'):
+        options['branch_region'] = job['region']
+    max_retries = options.pop('max_retries', 0)
+
+    strategist = GeminiMarketingStrategist(
+        api_key=api_key,
+        cache=cache,
+        use_cache=cache is not None,
+        model=job.get('model', DEFAULT_MODEL),
+        branch_name=job['branch'],
+        max_retries=0,
+        **options
+    )
+
+    result = {
+        'branch': job['branch'],
+        'model': strategist.model,
+        'strategy': None,
+        'source': None,
+        'error': None,
+        'elapsed': 0.0
+    }
+
+    summary = strategist._create_review_summary(job['reviews'])
+
+    if not strategist.api_key:
+        result['strategy'] = strategist._generate_fallback_strategy(summary)
+        result['source'] = 'fallback'
+        result['error'] = 'GEMINI_API_KEY 없음'
+    else:
+        loop = asyncio.get_running_loop()
+        prompt = strategist._create_strategy_prompt(summary)
+        # 캐시 파일 I/O는 단일 스레드 실행기에서 차례로 처리 (이벤트 루프를 막지 않고 캐시 갱신도 직렬화)
+        cache_key, cached_text = await loop.run_in_executor(
+            cache_executor, strategist._lookup_cache, prompt
+        )
+
+        if cached_text is not None:
+            result['strategy'] = strategist._format_strategy_output(cached_text)
+            result['source'] = 'cache'
+        else:
+            try:
+                generated_text = await _call_with_retries(
+                    strategist, prompt, max_retries, semaphore, limiter, executor
+                )
+
+                if cache_key is not None:
+                    await loop.run_in_executor(
+                        cache_executor,
+                        functools.partial(cache.put, cache_key, generated_text,
+                                          model=strategist.model)
+                    )
+                result['strategy'] = strategist._format_strategy_output(generated_text)
+                result['source'] = 'gemini'
+            except Exception as e:
+                print(f"❌ [{job['branch']}/{strategist.model}] Gemini 호출 실패: {e}")
+                result['strategy'] = strategist._generate_fallback_strategy(summary)
+                result['source'] = 'fallback'
+                result['error'] = str(e)
+
+    result['elapsed'] = round(time.monotonic() - started_at, 3)
+    return result
+
+
+async def generate_strategies_async(jobs, api_key=None, concurrency=4, requests_per_minute=60,
+                                    cache=None, use_cache=True, **strategist_options):
+    """
+    여러 (지점, 리뷰, 모델) 작업의 전략을 동시에 생성합니다.
+
+    Gemini 호출은 concurrency개까지 동시에 진행되고, 분당 requests_per_minute를 넘지 않습니다.
+    결과는 끝나는 순서대로 반환되며, 실패한 작업은 기본 전략으로 대체됩니다.
+
+    Args:
+        jobs: [{'branch': str, 'reviews': list, 'model': str}, ...] (make_job 참고)
+        api_key: Gemini API 키 (없으면 GEMINI_API_KEY 환경변수)
+        concurrency: 동시에 진행할 최대 API 호출 수
+        requests_per_minute: 분당 최대 API 호출 수 (0이면 제한 없음)
+        cache: 공유할 ResponseCache (없으면 기본 캐시 생성)
+        use_cache: 응답 캐시 사용 여부
+        max_retries: (strategist_options) 일시 오류 재시도 횟수 - 재시도도 분당 제한을 따름
+
+    Yields:
+        dict: {'branch', 'model', 'strategy', 'source', 'error', 'elapsed'}
+              source는 'gemini' | 'cache' | 'fallback'
+    """
+    if cache is None and use_cache:
+        cache = ResponseCache()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = AsyncRateLimiter(requests_per_minute, burst=concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor, \
+            ThreadPoolExecutor(max_workers=1) as cache_executor:
+        tasks = [
+            asyncio.ensure_future(
+                _run_job(job, api_key, semaphore, limiter, executor, cache_executor, cache,
+                         strategist_options)
+            )
+            for job in jobs
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def generate_strategies(jobs, **options):
+    """generate_strategies_async의 동기 버전 - 끝난 순서대로 결과 리스트 반환"""
+    async def collect():
+        return [result async for result in generate_strategies_async(jobs, **options)]
+
+    return asyncio.run(collect())
+
+
+def main():
+    """리뷰 파일마다 지점 하나로 보고 모델별 전략을 일괄 생성"""
+    import json
+
+    if len(sys.argv) < 2:
+        print("사용법: python batch_strategy.py 리뷰파일.json [리뷰파일2.json ...]")
+        print("  GEMINI_MODELS=gemini-1.5-flash,gemini-2.5-flash 로 비교할 모델 지정")
+        return
+
+    models = [m.strip() for m in os.getenv('GEMINI_MODELS', DEFAULT_MODEL).split(',') if m.strip()]
+
+    jobs = []
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            reviews = json.load(f)
+        branch = os.path.splitext(os.path.basename(path))[0]
+        for model in models:
+            jobs.append(make_job(branch, reviews, model=model))
+
+    print(f"🚀 {len(jobs)}개 작업 일괄 생성 시작")
+    started_at = time.monotonic()
+
+    for result in generate_strategies(jobs):
+        print(f"✅ {result['branch']} / {result['model']}: "
+              f"{result['source']} ({result['elapsed']}초)")
+
+    print(f"⏱️ 전체 소요 시간: {time.monotonic() - started_at:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# benchmark.py - 합성 리뷰 코퍼스 기반 성능 벤치마크와 회귀 검사
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+from fixed_iframe_crawler import parse_blog_post
+from report_renderer import render_batch
+from sentiment import analyze_sentiment, batch_analyze_reviews, get_sentiment_summary
+from strategy import generate_basic_marketing_strategy
+from synthetic_data import BLOG_SKINS, generate_reviews, iter_reviews, render_blog_post
+
+# 개발 머신에서 잰 기준 (CI는 같은 러너/파이썬 버전에서 main이 측정해 캐시한 기준을 --baseline으로 사용)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'benchmarks', 'baseline.json')
+
+SCALE_NAMES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+
+
+def parse_scales(spec):
+    """'1k,10k' -> [('1k', 1000), ('10k', 10000)]"""
+    scales = []
+    for name in spec.lower().split(','):
+        name = name.strip()
+        if name in SCALE_NAMES:
+            scales.append((name, SCALE_NAMES[name]))
+        elif name.isdigit():
+            scales.append((name, int(name)))
+        else:
+            raise ValueError(f"알 수 없는 규모: {name}")
+    return scales
+
+
+def _time_best(func, repeat):
+    """repeat번 실행해 가장 빠른 시간 반환 (GC는 측정 중 꺼둠)"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started_at = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started_at
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_sentiment(count, seed, repeat):
+    texts = [f"{r['title']} {r['content']}" for r in iter_reviews(count, seed)]
+
+    def run():
+        for text in texts:
+            analyze_sentiment(text)
+
+    return _time_best(run, repeat)
+
+
+def bench_batch_analyze(count, seed, repeat):
+    reviews = generate_reviews(count, seed)
+    return _time_best(lambda: batch_analyze_reviews(reviews), repeat)
+
+
+def bench_summary(count, seed, repeat):
+    analyzed = batch_analyze_reviews(generate_reviews(count, seed))
+    return _time_best(lambda: get_sentiment_summary(analyzed), repeat)
+
+
+def bench_parse_html(count, seed, repeat):
+    skins = itertools.cycle(BLOG_SKINS)
+    pages = [render_blog_post(review, skin=next(skins)) for review in iter_reviews(count, seed)]
+
+    def run():
+        for page in pages:
+            parse_blog_post(page)
+
+    return _time_best(run, repeat)
+
+
+def bench_report(count, seed, repeat):
+    analyzed = batch_analyze_reviews(generate_reviews(count, seed))
+    return _time_best(lambda: generate_basic_marketing_strategy(analyzed), repeat)
+
+
+def bench_report_batch(count, seed, repeat, reviews_per_branch=50):
+    # 리뷰를 지점별로 나눠 요약을 만든 뒤 세 형식을 한 번에 렌더링 (지점 수가 규모에 비례)
+    analyzed = batch_analyze_reviews(generate_reviews(count, seed))
+    size = reviews_per_branch
+    items = [(f"우리끼리 키즈카페 {index + 1}호점", get_sentiment_summary(analyzed[start:start + size]))
+             for index, start in enumerate(range(0, len(analyzed), size))]
+
+    def run():
+        for report in render_batch(items):
+            report.encoded('markdown')
+
+    return _time_best(run, repeat)
+
+
+# (이름, 함수, 사용할 규모 종류) - HTML 파싱은 느려서 별도 규모를 사용
+BENCHMARKS = [
+    ('analyze_sentiment', bench_sentiment, 'scales'),
+    ('batch_analyze_reviews', bench_batch_analyze, 'scales'),
+    ('get_sentiment_summary', bench_summary, 'scales'),
+    ('parse_blog_post', bench_parse_html, 'html_scales'),
+    ('basic_report', bench_report, 'scales'),
+    ('report_batch', bench_report_batch, 'scales'),
+]
+
+
+def run_benchmarks(scales, html_scales, seed=0, repeat=5, only=None):
+    """
+    벤치마크 실행
+
+    Returns:
+        dict: {'meta': {...}, 'results': {'이름@규모': {'items', 'seconds', 'us_per_item'}}}
+    """
+    results = {}
+    for name, func, scale_kind in BENCHMARKS:
+        if only and name not in only:
+            continue
+        for scale_name, count in (scales if scale_kind == 'scales' else html_scales):
+            key = f"{name}@{scale_name}"
+            seconds = func(count, seed, repeat)
+            results[key] = {
+                'items': count,
+                'seconds': round(seconds, 6),
+                'us_per_item': round(seconds / count * 1e6, 3)
+            }
+            print(f"⏱️ {key:<32} {seconds:>9.4f}초  ({results[key]['us_per_item']} µs/건)")
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+
+def compare_results(current, baseline, threshold=0.10, min_seconds=0.02):
+    """
+    기준 결과와 비교해 threshold(비율) 이상 느려진 항목 목록 반환
+
+    기준과 현재 모두 min_seconds보다 짧게 끝난 항목은 측정 잡음이 커서 판정에서 제외
+
+    Returns:
+        list: [(이름, 기준 µs/건, 현재 µs/건, 변화율), ...]
+    """
+    regressions = []
+    print(f"\n📈 기준 대비 비교 (허용 {threshold * 100:.0f}%)")
+    for key, result in current['results'].items():
+        base = baseline.get('results', {}).get(key)
+        if not base:
+            print(f"  ➕ {key}: 기준 없음")
+            continue
+
+        change = result['us_per_item'] / base['us_per_item'] - 1 if base['us_per_item'] else 0.0
+        noisy = max(result['seconds'], base.get('seconds', 0.0)) < min_seconds
+        if noisy:
+            mark = '💤'
+        else:
+            mark = '🔴' if change > threshold else ('🟢' if change < -threshold else '⚪')
+        print(f"  {mark} {key:<32} {base['us_per_item']:>10} → {result['us_per_item']:>10} µs/건 "
+              f"({change * 100:+.1f}%)")
+        if change > threshold and not noisy:
+            regressions.append((key, base['us_per_item'], result['us_per_item'], change))
+    return regressions
+
+
+def same_interpreter(current, baseline):
+    """두 결과가 같은 파이썬 버전(major.minor)에서 측정되었는지"""
+    def version(result):
+        return (result.get('meta', {}).get('python') or '').rsplit('.', 1)[0]
+    return version(current) == version(baseline)
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='감정 분석/파싱/보고서 벤치마크')
+    parser.add_argument('--scales', default='1k,10k', help="리뷰 규모 (1k,10k,100k,1m)")
+    parser.add_argument('--html-scales', default='1k', help="HTML 파싱 규모")
+    parser.add_argument('--only', nargs='+', help="실행할 벤치마크 이름")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="기준 결과 JSON 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준으로 저장")
+    parser.add_argument('--compare', action='store_true', help="기준 결과와 비교해 회귀 검사")
+    parser.add_argument('--threshold', type=float, default=0.10, help="회귀로 볼 감속 비율")
+    parser.add_argument('--min-seconds', type=float, default=0.02,
+                        help="이보다 짧은 측정은 잡음으로 보고 회귀 판정에서 제외")
+    args = parser.parse_args()
+
+    print("🏁 벤치마크 시작")
+    current = run_benchmarks(parse_scales(args.scales), parse_scales(args.html_scales),
+                             seed=args.seed, repeat=args.repeat, only=args.only)
+
+    if args.output:
+        _write_json(args.output, current)
+        print(f"💾 결과 저장: {args.output}")
+
+    if args.save_baseline:
+        _write_json(args.baseline, current)
+        print(f"📌 기준 결과 저장: {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ 기준 결과 파일이 없습니다: {args.baseline}")
+            sys.exit(2)
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressions = compare_results(current, baseline, args.threshold, args.min_seconds)
+        if not same_interpreter(current, baseline):
+            # 인터프리터가 다르면 속도 차이가 코드 변화인지 알 수 없으므로 판정하지 않음
+            print(f"\n⚠️ 기준은 Python {baseline.get('meta', {}).get('python')}에서 측정되어 "
+                  f"회귀 판정을 생략합니다 (현재 {current['meta']['python']})")
+            return
+        if regressions:
+            print(f"\n❌ 성능 회귀 {len(regressions)}건 발견")
+            sys.exit(1)
+        print("\n✅ 성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# crawl_executor.py - 상세 페이지 요청은 이벤트 루프에서, HTML 파싱은 프로세스 풀에서 처리
+import asyncio
+import collections
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from fixed_iframe_crawler import fetch_blog_post, main_frame_url, parse_blog_post_bytes
+from metrics import METRICS
+from rate_limit import AsyncRateLimiter
+from scheduler import BudgetExhausted
+
+
+def _init_parse_worker():
+    # fork로 복사된 부모 프로세스 지표를 비워서 작업자는 자기 지표만 돌려주도록
+    METRICS.reset()
+
+
+def _parse_in_worker(content, encoding, since, until):
+    """작업 프로세스에서 파싱하고 (결과, 이번 작업의 지표) 반환"""
+    result = parse_blog_post_bytes(content, encoding, since, until)
+    return result, METRICS.drain()
+
+
+class HybridCrawlExecutor:
+    """
+    상세 페이지 요청/파싱 실행기
+
+    - 요청: 백그라운드 스레드의 asyncio 이벤트 루프가 concurrency개까지 동시에 진행
+      (requests는 동기 라이브러리라 실제 호출은 스레드 풀에서, 분당 요청 수는 토큰 버킷으로 제한)
+    - 파싱: 받은 응답 바이트를 프로세스 풀(workers개)로 보내 BeautifulSoup 파싱을 여러 코어에서 실행
+    - 진행 중인 작업은 max_in_flight개까지만 두고, 넘으면 submit()이 자리가 날 때까지 기다립니다.
+
+    파싱 지표(parse 시간, posts_out_of_window 등)는 작업 프로세스가 결과와 함께 돌려주면 METRICS에 합치고,
+    대기 시간을 포함한 parse_pool 시간도 따로 기록합니다.
+
+    사용 예:
+        with HybridCrawlExecutor(workers=4) as executor:
+            reviews = crawl_naver_blog_multi(keywords, executor=executor)
+    """
+
+    def __init__(self, session=None, workers=None, concurrency=8, max_in_flight=None,
+                 requests_per_minute=40):
+        self.session = session
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.max_in_flight = max_in_flight or max(concurrency, self.workers) * 2
+        self.requests_per_minute = requests_per_minute
+
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._loop = None
+        self._thread = None
+        self._io_pool = None
+        self._parse_pool = None
+        self._semaphore = None
+        self._limiter = None
+
+    # 시작/종료
+    def start(self):
+        # 다른 스레드가 생기기 전에 작업 프로세스를 모두 띄워둠 (스레드가 있는 상태의 fork 방지)
+        self._parse_pool = ProcessPoolExecutor(max_workers=self.workers,
+                                               initializer=_init_parse_worker)
+        self._parse_pool.submit(int).result()
+
+        self._io_pool = ThreadPoolExecutor(max_workers=self.concurrency,
+                                           thread_name_prefix='crawl-io')
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='crawl-event-loop',
+                                        daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+        return self
+
+    async def _setup(self):
+        # asyncio 동기화 객체는 이벤트 루프 스레드 안에서 만들어야 함 (Python 3.9)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = AsyncRateLimiter(self.requests_per_minute, burst=self.concurrency)
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+        if self._io_pool is not None:
+            self._io_pool.shutdown()
+            self._io_pool = None
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # 작업
+    async def _fetch(self, link):
+        """요청 1회 (동시 요청 수와 분당 요청 수 제한 안에서)"""
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            await self._limiter.acquire()
+            return await loop.run_in_executor(self._io_pool, fetch_blog_post, link, self.session, False)
+
+    async def _fetch_and_parse(self, link, since, until, scheduler, reserved):
+        loop = asyncio.get_running_loop()
+        refund = reserved
+        try:
+            resp = await self._fetch(link)
+            frame_url = main_frame_url(link, resp) if resp is not None else None
+            if frame_url is not None:
+                # 껍데기 페이지의 iframe 본문은 두 번째 요청 (예산과 요청 수 제한에 따로 셈)
+                if scheduler is not None and not reserved and not scheduler.spend():
+                    raise BudgetExhausted(frame_url)
+                refund = False
+                METRICS.inc('iframe_follow')
+                resp = await self._fetch(frame_url)
+            if resp is None:
+                return None, None
+
+            with METRICS.timer('parse_pool'):
+                result, metrics_delta = await loop.run_in_executor(
+                    self._parse_pool, _parse_in_worker, resp.content, resp.encoding, since, until
+                )
+            METRICS.merge(metrics_delta)
+            return result
+        except BudgetExhausted:
+            raise
+        except Exception as e:
+            print(f"Error parsing {link}: {e}")
+            return None, None
+        finally:
+            if refund:
+                scheduler.refund()
+
+    def submit(self, link, since=None, until=None, scheduler=None, reserved=False):
+        """
+        상세 페이지 요청/파싱 예약 - (날짜, 본문)을 돌려줄 Future 반환
+
+        진행 중인 작업이 max_in_flight개면 하나가 끝날 때까지 기다립니다.
+        scheduler가 있으면 iframe 본문 요청에 예산을 쓰고(reserved면 미리 확보한 1회를 쓰고, 필요 없으면
+        돌려줌), 예산이 없으면 Future가 BudgetExhausted를 냅니다.
+        """
+        self._in_flight.acquire()
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_and_parse(link, since, until, scheduler, reserved), self._loop
+        )
+        future.add_done_callback(lambda _: self._in_flight.release())
+        return future
+
+    def map(self, links, since=None, until=None):
+        """links 순서대로 (날짜, 본문)을 내보냄"""
+        pending = collections.deque()
+        for link in links:
+            while pending and pending[0].done():
+                yield pending.popleft().result()
+            pending.append(self.submit(link, since, until))
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,230 @@
+# crawler_loadtest.py - 로컬 네이버 대체 서버를 상대로 크롤러 처리량 측정
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from unittest import mock
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import fixed_iframe_crawler as crawler
+from fake_naver_server import FakeNaverConfig, FakeNaverServer
+from synthetic_data import render_blog_post
+
+
+def _serve(config, ready_queue):
+    """별도 프로세스에서 대체 서버 실행 (크롤러 CPU 측정에 섞이지 않도록)"""
+    server = FakeNaverServer(config)
+    ready_queue.put(server.search_url)
+    server.serve_forever()
+
+
+def children_cpu_seconds():
+    """끝나서 회수된 자식 프로세스(파싱 작업자 등)의 CPU 시간 합계"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def verify_posts(config, reviews):
+    """
+    수집한 글을 대체 서버의 PostView 원본과 비교 - (스킨별 글 수, 날짜/본문이 다른 글 목록)
+
+    iframe 스킨은 껍데기 페이지라서 PostView를 따라가야만 원본 날짜와 본문을 얻습니다.
+    """
+    skins = {}
+    mismatches = []
+    for review in reviews:
+        blog_id, log_no = review['link'].rstrip('/').split('/')[-2:]
+        skin = config.draw_post(blog_id, log_no)[1]
+        skins[skin] = skins.get(skin, 0) + 1
+
+        original, _, rng = config.draw_post(blog_id, log_no, skin='smarteditor')
+        date, content = crawler.parse_blog_post(render_blog_post(original, skin='smarteditor', rng=rng))
+        if review['date'] != date.isoformat() or review['content'] != content[:500]:
+            mismatches.append({'link': review['link'], 'skin': skin, 'date': review['date'],
+                               'expected_date': date.isoformat()})
+    return skins, mismatches
+
+
+def run_load_test(config, keywords, max_page=2, verbose=False, items_per_page=None, prefetch=None,
+                  workers=0, concurrency=8):
+    """
+    대체 서버를 띄우고 crawl_naver_blog_multi를 실행해 성능 지표를 반환합니다.
+
+    Returns:
+        dict: posts, posts_per_sec, 요청 종류별 p50/p99 지연, 전송 바이트, 글당 CPU 시간 등
+    """
+    ready_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=_serve, args=(config, ready_queue), daemon=True)
+    server_process.start()
+    search_url = ready_queue.get(timeout=10)
+
+    latencies = {'search': [], 'detail': []}
+    status_counts = {}
+    transferred = {'bytes': 0}
+    original_get = crawler.requests.get
+
+    def timed_get(url, *args, **kwargs):
+        started_at = time.perf_counter()
+        response = original_get(url, *args, **kwargs)
+        elapsed = time.perf_counter() - started_at
+        kind = 'search' if url.startswith(search_url) else 'detail'
+        latencies[kind].append(elapsed)
+        transferred['bytes'] += len(response.content)
+        status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+        return response
+
+    patches = [
+        mock.patch.object(crawler, 'SEARCH_URL', search_url),
+        mock.patch.object(crawler, 'REQUEST_DELAY', (0, 0)),
+        mock.patch.object(crawler, 'PAGE_DELAY', (0, 0)),
+        mock.patch.object(crawler.requests, 'get', timed_get),
+    ]
+
+    output = io.StringIO()
+    try:
+        with contextlib.ExitStack() as stack:
+            for patch in patches:
+                stack.enter_context(patch)
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(output))
+
+            executor = None
+            if workers:
+                # 부하 테스트에서는 분당 요청 수 제한 없이 동시성만 적용
+                from crawl_executor import HybridCrawlExecutor
+                executor = stack.enter_context(HybridCrawlExecutor(
+                    workers=workers, concurrency=concurrency, requests_per_minute=0
+                ))
+
+            cpu_started_at = time.process_time()
+            children_started_at = children_cpu_seconds()
+            started_at = time.perf_counter()
+            reviews = crawler.crawl_naver_blog_multi(keywords, max_page=max_page,
+                                                     items_per_page=items_per_page,
+                                                     prefetch=prefetch, executor=executor)
+            wall = time.perf_counter() - started_at
+            cpu = time.process_time() - cpu_started_at
+
+        # 파싱 작업자는 executor가 닫힐 때 회수되므로 그 뒤에 읽음 (대체 서버 프로세스는 아직 실행 중)
+        child_cpu = children_cpu_seconds() - children_started_at
+    finally:
+        server_process.terminate()
+        server_process.join()
+
+    posts = len(reviews)
+    skins, mismatches = verify_posts(config, reviews)
+    detail_requests = len(latencies['detail'])
+    return {
+        'keywords': len(keywords),
+        'max_page': max_page,
+        'items_per_page': items_per_page or crawler.ITEMS_PER_PAGE,
+        'prefetch': crawler.SEARCH_PREFETCH if prefetch is None else prefetch,
+        'workers': workers,
+        'concurrency': concurrency if workers else 1,
+        'posts': posts,
+        'detail_requests': detail_requests,
+        'search_requests': len(latencies['search']),
+        'wall_seconds': round(wall, 3),
+        'posts_per_sec': round(posts / wall, 2) if wall else 0.0,
+        'requests_per_sec': round((detail_requests + len(latencies['search'])) / wall, 2) if wall else 0.0,
+        'search_latency_p50_ms': round(percentile(latencies['search'], 50) * 1000, 1),
+        'search_latency_p99_ms': round(percentile(latencies['search'], 99) * 1000, 1),
+        'detail_latency_p50_ms': round(percentile(latencies['detail'], 50) * 1000, 1),
+        'detail_latency_p99_ms': round(percentile(latencies['detail'], 99) * 1000, 1),
+        'bytes_total': transferred['bytes'],
+        'bytes_per_post': round(transferred['bytes'] / posts) if posts else 0,
+        'cpu_seconds': round(cpu + child_cpu, 3),
+        'cpu_parent_seconds': round(cpu, 3),
+        'cpu_children_seconds': round(child_cpu, 3),
+        'cpu_ms_per_post': round((cpu + child_cpu) / posts * 1000, 2) if posts else 0.0,
+        'status_counts': {str(k): v for k, v in sorted(status_counts.items())},
+        'posts_by_skin': dict(sorted(skins.items())),
+        'mismatched_posts': len(mismatches),
+        'mismatch_examples': mismatches[:5],
+    }
+
+
+def print_report(result):
+    print("\n📊 크롤러 부하 테스트 결과")
+    print(f"  키워드 {result['keywords']}개 x {result['max_page']}페이지 "
+          f"(페이지당 {result['items_per_page']}개, 미리 받기 {result['prefetch']}페이지)")
+    print(f"  파싱 프로세스 {result['workers']}개, 동시 요청 {result['concurrency']}개")
+    print(f"  수집 글: {result['posts']}개 (상세 요청 {result['detail_requests']}회, "
+          f"검색 요청 {result['search_requests']}회)")
+    print(f"  소요 시간: {result['wall_seconds']}초, 처리량: {result['posts_per_sec']}글/초 "
+          f"({result['requests_per_sec']}요청/초)")
+    print(f"  검색 지연 p50/p99: {result['search_latency_p50_ms']} / {result['search_latency_p99_ms']} ms")
+    print(f"  상세 지연 p50/p99: {result['detail_latency_p50_ms']} / {result['detail_latency_p99_ms']} ms")
+    print(f"  전송량: {result['bytes_total']:,} bytes (글당 {result['bytes_per_post']:,} bytes)")
+    print(f"  CPU: {result['cpu_seconds']}초 (부모 {result['cpu_parent_seconds']}초 + "
+          f"파싱 프로세스 {result['cpu_children_seconds']}초, 글당 {result['cpu_ms_per_post']} ms)")
+    print(f"  응답 코드: {result['status_counts']}")
+    print(f"  스킨별 글: {result['posts_by_skin']}, 원본과 다른 글: {result['mismatched_posts']}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='크롤러 부하 테스트')
+    parser.add_argument('--keywords', nargs='+',
+                        default=["우리끼리 키즈카페 대전문화점", "우리끼리 리뷰 대전"])
+    parser.add_argument('--max-page', type=int, default=2)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--items-per-page', type=int, help="검색 페이지당 처리할 글 수")
+    parser.add_argument('--prefetch', type=int, help="미리 받아둘 검색 페이지 수 (0이면 순차)")
+    parser.add_argument('--workers', type=int, default=0, help="파싱 프로세스 수 (0이면 순차)")
+    parser.add_argument('--concurrency', type=int, default=8, help="동시 상세 요청 수")
+    parser.add_argument('--latency', default='lognormal:0.05,0.5',
+                        help="서버 지연 분포 (예: fixed:0.1, uniform:0.05,0.3, lognormal:0.05,0.5)")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--burst-every', type=int, default=0)
+    parser.add_argument('--burst-length', type=int, default=0)
+    parser.add_argument('--skins', default='smarteditor=6,postviewarea=2,iframe=2')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="결과를 JSON 파일로 저장할 경로")
+    parser.add_argument('--verbose', action='store_true', help="크롤러 로그 출력")
+    args = parser.parse_args()
+
+    config = FakeNaverConfig(
+        page_size=args.page_size, latency=args.latency, error_rate=args.error_rate,
+        burst_every=args.burst_every, burst_length=args.burst_length, skins=args.skins,
+        seed=args.seed
+    )
+    result = run_load_test(config, args.keywords, max_page=args.max_page, verbose=args.verbose,
+                           items_per_page=args.items_per_page, prefetch=args.prefetch,
+                           workers=args.workers, concurrency=args.concurrency)
+    print_report(result)
+
+    if args.json:
+        directory = os.path.dirname(args.json)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+    # 스킨(iframe 포함)과 관계없이 원본 날짜/본문을 얻어야 함
+    if result['mismatched_posts']:
+        for example in result['mismatch_examples']:
+            print(f"❌ 원본과 다름: {example}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+# fake_gemini_server.py - 오프라인 테스트/벤치마크용 로컬 Gemini 대체 서버
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_PATH_RE = re.compile(r'^/v1beta/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$')
+
+# 결정적 응답을 만들 때 쓰는 문장 조각
+_CANNED_SECTIONS = [
+    ("현재 상황 분석", [
+        "긍정 리뷰 비율이 높아 기본 만족도는 안정적입니다.",
+        "청결과 안전에 대한 언급이 꾸준히 이어지고 있습니다.",
+        "주말 방문객 중심으로 재방문 의사가 확인됩니다.",
+    ]),
+    ("핵심 전략 방향", [
+        "만족 고객의 후기를 SNS 콘텐츠로 재활용합니다.",
+        "평일 오전 이용률을 높이는 시간대 할인 상품을 운영합니다.",
+        "부정 키워드가 나온 항목은 주 단위로 점검합니다.",
+    ]),
+    ("즉시 실행 가능한 액션 플랜", [
+        "포토 리뷰 작성 시 다음 방문 30분 무료 쿠폰을 제공합니다.",
+        "네이버 플레이스 소식 탭에 주 2회 공지를 올립니다.",
+        "입구에 청소 점검표를 게시해 청결 관리를 보여줍니다.",
+    ]),
+    ("SNS 마케팅 전략", [
+        "인스타그램 릴스로 아이들 놀이 장면을 주 3회 게시합니다.",
+        "지역 맘카페와 협업해 체험단을 모집합니다.",
+        "블로그에 연령별 추천 놀이 코스를 연재합니다.",
+    ]),
+    ("성과 측정 방법", [
+        "월별 긍정 리뷰 비율 70% 이상 유지를 목표로 합니다.",
+        "재방문 고객 비율을 매달 집계합니다.",
+        "쿠폰 사용률로 프로모션 효과를 측정합니다.",
+    ]),
+]
+
+_ERROR_STATUS = {
+    400: ('INVALID_ARGUMENT', 'Request contains an invalid argument.'),
+    403: ('PERMISSION_DENIED', 'The caller does not have permission.'),
+    429: ('RESOURCE_EXHAUSTED', 'Resource has been exhausted (e.g. check quota).'),
+    500: ('INTERNAL', 'An internal error has occurred.'),
+    503: ('UNAVAILABLE', 'The service is currently unavailable.'),
+}
+
+
+def parse_latency(spec):
+    """
+    지연 시간 분포 문자열을 (이름, 인자들)로 변환합니다.
+
+    - 'fixed:0.5'          : 항상 0.5초
+    - 'uniform:0.2,1.0'    : 0.2~1.0초 균등 분포
+    - 'lognormal:0.8,0.4'  : 중앙값 0.8초, 로그 표준편차 0.4
+    - 'none'               : 지연 없음
+    """
+    if not spec or spec == 'none':
+        return ('fixed', (0.0,))
+    name, _, args = spec.partition(':')
+    values = tuple(float(v) for v in args.split(',') if v)
+    expected = {'fixed': 1, 'uniform': 2, 'lognormal': 2}
+    if name not in expected or len(values) != expected[name]:
+        raise ValueError(f"지연 분포 형식이 잘못되었습니다: {spec}")
+    return (name, values)
+
+
+def parse_error_rates(spec):
+    """
+    오류 주입 비율 문자열을 dict로 변환합니다.
+
+    예: '429=0.05,403=0.01,timeout=0.02' -> {429: 0.05, 403: 0.01, 'timeout': 0.02}
+    """
+    rates = {}
+    if not spec:
+        return rates
+    for item in spec.split(','):
+        key, _, value = item.partition('=')
+        key = key.strip()
+        rates[key if key == 'timeout' else int(key)] = float(value)
+    return rates
+
+
+def canned_text(prompt, model):
+    """프롬프트와 모델이 같으면 항상 같은 전략 텍스트를 반환"""
+    digest = hashlib.sha256(f"{model}\n{prompt}".encode('utf-8')).digest()
+    lines = [f"## {model} 모의 응답 ({digest[:4].hex()})", ""]
+    for i, (title, sentences) in enumerate(_CANNED_SECTIONS):
+        lines.append(f"### {i + 1}. {title}")
+        for j in range(2):
+            sentence = sentences[(digest[i * 2 + j] + j) % len(sentences)]
+            lines.append(f"- {sentence}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class FakeGeminiConfig:
+    """대체 서버 동작 설정"""
+
+    def __init__(self, latency='none', error_rates=None, timeout_seconds=90.0,
+                 chunk_size=40, chunk_delay=0.05, seed=0):
+        self.latency = parse_latency(latency) if isinstance(latency, str) else latency
+        self.error_rates = (parse_error_rates(error_rates)
+                            if isinstance(error_rates, str) else dict(error_rates or {}))
+        self.timeout_seconds = timeout_seconds
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.seed = seed
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/stats':
+            self._send_json(200, self.server.snapshot_stats())
+        else:
+            self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        match = _PATH_RE.match(parsed.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+
+        if not match:
+            self.server.record('404')
+            self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+            return
+
+        try:
+            payload = json.loads(raw.decode('utf-8'))
+            prompt = ''.join(
+                part.get('text', '')
+                for content in payload['contents']
+                for part in content.get('parts', [])
+            )
+        except (ValueError, KeyError, TypeError):
+            self.server.record('400')
+            self._send_error(400)
+            return
+
+        model = match.group('model')
+        streaming = match.group('method') == 'streamGenerateContent'
+        query = parse_qs(parsed.query)
+
+        outcome, delay = self.server.draw_outcome()
+        time.sleep(delay)
+
+        if outcome == 'timeout':
+            # 응답 없이 붙잡고 있다가 연결 종료 (클라이언트 시간 초과 유도)
+            self.server.record('timeout')
+            time.sleep(self.server.config.timeout_seconds)
+            self.close_connection = True
+            return
+
+        if outcome is not None:
+            self.server.record(str(outcome))
+            self._send_error(outcome)
+            return
+
+        text = canned_text(prompt, model)
+        self.server.record('200')
+
+        if streaming and query.get('alt') == ['sse']:
+            self._send_stream(text)
+        elif streaming:
+            self._send_json(200, [self._candidate_payload(text)])
+        else:
+            self._send_json(200, self._candidate_payload(text, prompt))
+
+    def _send_error(self, code):
+        status, message = _ERROR_STATUS.get(code, ('UNKNOWN', 'Unknown error.'))
+        self._send_json(code, {'error': {'code': code, 'message': message, 'status': status}})
+
+    @staticmethod
+    def _candidate_payload(text, prompt='', finish_reason='STOP'):
+        payload = {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': finish_reason,
+                'index': 0
+            }]
+        }
+        if prompt:
+            payload['usageMetadata'] = {
+                'promptTokenCount': len(prompt) // 2,
+                'candidatesTokenCount': len(text) // 2,
+                'totalTokenCount': (len(prompt) + len(text)) // 2
+            }
+        return payload
+
+    def _send_stream(self, text):
+        config = self.server.config
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        chunks = [text[i:i + config.chunk_size] for i in range(0, len(text), config.chunk_size)]
+        for i, chunk in enumerate(chunks):
+            finish_reason = 'STOP' if i == len(chunks) - 1 else None
+            event = self._candidate_payload(chunk)
+            if finish_reason is None:
+                del event['candidates'][0]['finishReason']
+            line = f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n"
+            try:
+                self.wfile.write(line.encode('utf-8'))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            time.sleep(config.chunk_delay)
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    """
+    generateContent / streamGenerateContent 요청·응답 형식을 흉내 내는 로컬 서버
+
+    사용 예:
+        with FakeGeminiServer(FakeGeminiConfig(latency='lognormal:0.8,0.4')) as server:
+            strategist = GeminiMarketingStrategist(api_key='test', api_base=server.api_base)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or FakeGeminiConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._thread = None
+        super().__init__((host, port), _Handler)
+
+    @property
+    def api_base(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+    def draw_outcome(self):
+        """이번 요청의 (오류 종류 또는 None, 지연 시간) 결정"""
+        with self._lock:
+            name, args = self.config.latency
+            if name == 'uniform':
+                delay = self._random.uniform(*args)
+            elif name == 'lognormal':
+                median, sigma = args
+                delay = self._random.lognormvariate(0, sigma) * median
+            else:
+                delay = args[0]
+
+            roll = self._random.random()
+            for outcome, rate in self.config.error_rates.items():
+                if roll < rate:
+                    return outcome, delay
+                roll -= rate
+            return None, delay
+
+    def record(self, key):
+        with self._lock:
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def snapshot_stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def run_benchmark(server, jobs_count, concurrency, timeout, max_retries):
+    """대체 서버를 상대로 일괄 전략 생성을 돌려 처리량/재시도 횟수 측정"""
+    from batch_strategy import generate_strategies, make_job
+
+    reviews = [
+        {'title': f'리뷰 {i}', 'content': '아이들이 좋아해요. 깨끗하고 안전합니다.',
+         'sentiment': 'positive', 'positive_keywords': ['좋아', '깨끗', '안전'],
+         'negative_keywords': []}
+        for i in range(5)
+    ]
+    jobs = [make_job(f'지점{i:03d}', reviews) for i in range(jobs_count)]
+
+    started_at = time.monotonic()
+    results = generate_strategies(
+        jobs, api_key='fake-key', api_base=server.api_base, concurrency=concurrency,
+        requests_per_minute=0, use_cache=False, timeout=timeout, max_retries=max_retries,
+        retry_backoff=0.1
+    )
+    elapsed = time.monotonic() - started_at
+
+    sources = {}
+    for result in results:
+        sources[result['source']] = sources.get(result['source'], 0) + 1
+    latencies = sorted(r['elapsed'] for r in results)
+
+    print("\n📊 벤치마크 결과")
+    print(f"  작업 수: {jobs_count} (동시 {concurrency})")
+    print(f"  전체 시간: {elapsed:.2f}초, 처리량: {jobs_count / elapsed:.2f}건/초")
+    print(f"  작업 지연 p50: {latencies[len(latencies) // 2]:.2f}초, "
+          f"p99: {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:.2f}초")
+    print(f"  결과 출처: {sources}")
+    print(f"  서버 응답 통계: {server.snapshot_stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 Gemini 대체 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='none',
+                        help="지연 분포 (예: fixed:0.5, uniform:0.2,1.0, lognormal:0.8,0.4)")
+    parser.add_argument('--errors', default='',
+                        help="오류 주입 비율 (예: 429=0.05,403=0.01,timeout=0.02)")
+    parser.add_argument('--timeout-seconds', type=float, default=90.0,
+                        help="timeout 오류 시 응답을 붙잡아 둘 시간")
+    parser.add_argument('--chunk-delay', type=float, default=0.05, help="스트리밍 조각 간 지연")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bench', type=int, default=0,
+                        help="서버를 띄운 뒤 N개 작업으로 일괄 생성 벤치마크 실행")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--client-timeout', type=float, default=10.0)
+    parser.add_argument('--max-retries', type=int, default=2)
+    args = parser.parse_args()
+
+    config = FakeGeminiConfig(
+        latency=args.latency, error_rates=args.errors, timeout_seconds=args.timeout_seconds,
+        chunk_delay=args.chunk_delay, seed=args.seed
+    )
+    server = FakeGeminiServer(config, host=args.host, port=0 if args.bench else args.port)
+
+    if args.bench:
+        with server:
+            run_benchmark(server, args.bench, args.concurrency, args.client_timeout, args.max_retries)
+        return
+
+    print(f"🧪 Gemini 대체 서버 실행 중: {server.api_base}")
+    print(f"💡 GEMINI_API_BASE={server.api_base} 로 설정하면 gemini_api.py가 이 서버를 사용합니다.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 서버 종료")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
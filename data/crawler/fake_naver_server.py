@@ -0,0 +1,230 @@
+# fake_naver_server.py - 크롤러 부하 테스트용 로컬 네이버 검색/블로그 대체 서버
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from fake_gemini_server import parse_latency
+from synthetic_data import BLOG_SKINS, make_review, render_blog_post, render_search_page
+
+
+def parse_skin_weights(spec):
+    """'smarteditor=6,postviewarea=2,iframe=2' -> {'smarteditor': 6.0, ...}"""
+    weights = {}
+    for item in spec.split(','):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in BLOG_SKINS:
+            raise ValueError(f"알 수 없는 블로그 스킨: {name}")
+        weights[name] = float(value or 1)
+    return weights
+
+
+class FakeNaverConfig:
+    """대체 서버 동작 설정"""
+
+    def __init__(self, page_size=10, total_results=300, latency='none', error_rate=0.0,
+                 burst_every=0, burst_length=0, skins='smarteditor=6,postviewarea=2,iframe=2',
+                 seed=0):
+        self.page_size = page_size
+        self.total_results = total_results
+        self.latency = parse_latency(latency) if isinstance(latency, str) else latency
+        self.error_rate = error_rate
+        # burst_every개 요청마다 burst_length개 연속으로 429 응답
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.skins = parse_skin_weights(skins) if isinstance(skins, str) else dict(skins)
+        self.seed = seed
+
+    def draw_post(self, blog_id, log_no, skin=None):
+        """logNo의 (리뷰, 스킨, 렌더링용 난수 생성기) - 같은 logNo면 항상 같은 결과"""
+        review = make_review(int(log_no), self.seed)
+        review['link'] = f"https://blog.naver.com/{blog_id}/{log_no}"
+        rng = random.Random(f"{self.seed}:{log_no}")
+        if skin is None:
+            names = list(self.skins)
+            skin = rng.choices(names, weights=[self.skins[n] for n in names])[0]
+        return review, skin, rng
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='text/html; charset=UTF-8'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.record(str(status), len(data))
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        outcome, delay = self.server.draw_outcome()
+        time.sleep(delay)
+        if outcome is not None:
+            self._send(outcome, f"<html><body>error {outcome}</body></html>")
+            return
+
+        if parsed.path == '/search.naver':
+            keyword = query.get('query', [''])[0]
+            start = int(query.get('start', ['1'])[0])
+            self._send(200, self.server.search_page(keyword, start))
+        elif parsed.path.startswith('/blog.naver.com/PostView.naver'):
+            blog_id = query.get('blogId', [''])[0]
+            log_no = query.get('logNo', ['0'])[0]
+            self._send(200, self.server.blog_post(blog_id, log_no, skin='smarteditor'))
+        elif parsed.path.startswith('/blog.naver.com/'):
+            parts = parsed.path.strip('/').split('/')
+            if len(parts) != 3 or not parts[2].isdigit():
+                self._send(404, "<html><body>not found</body></html>")
+                return
+            self._send(200, self.server.blog_post(parts[1], parts[2]))
+        else:
+            self._send(404, "<html><body>not found</body></html>")
+
+
+class FakeNaverServer(ThreadingHTTPServer):
+    """
+    네이버 블로그 검색 결과(.total_tit a.link_tit)와 블로그 글 페이지를 흉내 내는 로컬 서버
+
+    블로그 링크는 http://host:port/blog.naver.com/{blogId}/{logNo} 형태라서
+    크롤러의 'blog.naver.com' 링크 필터를 그대로 통과합니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or FakeNaverConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._stats = {'requests': 0, 'bytes': 0}
+        self._thread = None
+        super().__init__((host, port), _Handler)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self):
+        return f"{self.base_url}/search.naver"
+
+    def draw_outcome(self):
+        """이번 요청의 (오류 상태 코드 또는 None, 지연 시간) 결정"""
+        config = self.config
+        with self._lock:
+            self._request_count += 1
+            count = self._request_count
+
+            name, args = config.latency
+            if name == 'uniform':
+                delay = self._random.uniform(*args)
+            elif name == 'lognormal':
+                median, sigma = args
+                delay = self._random.lognormvariate(0, sigma) * median
+            else:
+                delay = args[0]
+
+            if config.burst_every and config.burst_length:
+                if (count - 1) % config.burst_every >= config.burst_every - config.burst_length:
+                    return 429, delay
+            if config.error_rate and self._random.random() < config.error_rate:
+                return 500, delay
+            return None, delay
+
+    def record(self, status, size):
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['bytes'] += size
+            self._stats[status] = self._stats.get(status, 0) + 1
+
+    def snapshot_stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def _post_index(self, keyword, position):
+        digest = hashlib.sha256(f"{self.config.seed}:{keyword}:{position}".encode('utf-8')).digest()
+        return int.from_bytes(digest[:4], 'big') % 1000000
+
+    def search_page(self, keyword, start):
+        """start번째 결과부터 page_size개의 검색 결과 페이지"""
+        config = self.config
+        items = []
+        for position in range(start, min(start + config.page_size, config.total_results + 1)):
+            index = self._post_index(keyword, position)
+            review = make_review(index, config.seed)
+            blog_id = f"user{index % 5000}"
+            items.append({
+                'title': review['title'],
+                'link': f"{self.base_url}/blog.naver.com/{blog_id}/{index}",
+                'snippet': review['content'][:80]
+            })
+        return render_search_page(keyword, items)
+
+    def blog_post(self, blog_id, log_no, skin=None):
+        """logNo마다 항상 같은 글과 스킨을 반환"""
+        review, skin, rng = self.config.draw_post(blog_id, log_no, skin)
+        return render_blog_post(review, skin=skin, rng=rng)
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 네이버 검색/블로그 대체 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--total-results', type=int, default=300)
+    parser.add_argument('--latency', default='none')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--burst-every', type=int, default=0)
+    parser.add_argument('--burst-length', type=int, default=0)
+    parser.add_argument('--skins', default='smarteditor=6,postviewarea=2,iframe=2')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeNaverConfig(
+        page_size=args.page_size, total_results=args.total_results, latency=args.latency,
+        error_rate=args.error_rate, burst_every=args.burst_every, burst_length=args.burst_length,
+        skins=args.skins, seed=args.seed
+    )
+    server = FakeNaverServer(config, host=args.host, port=args.port)
+
+    print(f"🧪 네이버 대체 서버 실행 중: {server.base_url}")
+    print(f"💡 NAVER_SEARCH_URL={server.search_url} 로 설정하면 크롤러가 이 서버를 사용합니다.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 서버 종료")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
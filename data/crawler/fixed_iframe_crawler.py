@@ -3,111 +3,284 @@ from bs4 import BeautifulSoup
 import datetime
 import json
 import os
+import queue
+import re
+import threading
 import time
 import random
+from html import unescape
+from urllib.parse import urljoin
+from metrics import METRICS, write_run_metrics
+from naver_dates import DATE_SELECTORS, find_date_in_html, in_window, parse_naver_date
+from scheduler import BudgetExhausted
 
-def get_blog_post_date_and_content(link):
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1"
-        }
-        
-        resp = requests.get(link, headers=headers, timeout=10)
-        if resp.status_code != 200:
-            print(f"Failed to access {link}: {resp.status_code}")
-            return None, None
-            
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        
-        # 더 넓은 범위의 날짜 셀렉터
-        date_selectors = [
-            'span.se_publishDate', 'span.se_publish_time', 'span.date',
-            '.post_date', '.blog_date', '.date', '.time',
-            '[class*="date"]', '[class*="time"]',
-            '.blog_date', '.post-date'
-        ]
-        
-        date = None
-        for selector in date_selectors:
-            date_elements = soup.select(selector)
-            for elem in date_elements:
-                text = elem.get_text().strip()
-                if text and ('2024' in text or '2025' in text):
-                    date = text
-                    break
+# 검색 주소 (NAVER_SEARCH_URL로 로컬 대체 서버를 가리킬 수 있음)
+SEARCH_URL = os.getenv('NAVER_SEARCH_URL', 'https://search.naver.com/search.naver')
+
+# 요청 간 랜덤 딜레이 범위 (초)
+REQUEST_DELAY = (1, 2)
+PAGE_DELAY = (2, 3)
+
+# 기본 수집 기간 시작일 (이전 글은 본문 추출/저장 없이 건너뜀)
+DEFAULT_SINCE = datetime.date(2024, 1, 1)
+
+# 검색 페이지당 상세 페이지까지 처리할 글 수, 미리 받아둘 검색 페이지 수
+ITEMS_PER_PAGE = 5
+SEARCH_PREFETCH = 1
+
+# 본문 없이 PostView를 iframe(id="mainFrame")으로 여는 껍데기 페이지 판별
+MAIN_FRAME_RE = re.compile(r'<iframe\b[^>]*\bid=["\']mainFrame["\'][^>]*>', re.IGNORECASE)
+IFRAME_SRC_RE = re.compile(r'\bsrc=["\']([^"\']+)["\']', re.IGNORECASE)
+
+def find_main_frame_src(html):
+    """껍데기 페이지면 mainFrame iframe의 src 반환 (아니면 None)"""
+    tag = MAIN_FRAME_RE.search(html)
+    if tag is None:
+        return None
+    src = IFRAME_SRC_RE.search(tag.group(0))
+    return unescape(src.group(1)) if src else None
+
+def main_frame_url(link, resp):
+    """응답이 껍데기 페이지면 따라갈 mainFrame iframe의 절대 주소 (아니면 None)"""
+    if b'mainFrame' not in resp.content:
+        return None
+    src = find_main_frame_src(resp.text)
+    return urljoin(link, src) if src else None
+
+@METRICS.timed('parse')
+def parse_blog_post(html, since=None, until=None, now=None):
+    """
+    블로그 글 HTML에서 (날짜, 본문) 추출
+    
+    날짜(datetime.date)를 먼저 확인해 since~until 밖이면 본문은 추출하지 않고 (날짜, None) 반환
+    날짜를 찾지 못한 글은 기간을 확인할 수 없으므로, since/until이 있으면 (None, None) 반환
+    (기간이 없으면 오늘 날짜로 대체)
+    """
+    # 원문에서 날짜 요소를 바로 찾으면 기간 밖 글은 HTML 파싱도 하지 않음
+    date = find_date_in_html(html, now)
+    if date is not None and not in_window(date, since, until):
+        METRICS.inc('posts_out_of_window')
+        return date, None
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 더 넓은 범위의 날짜 셀렉터 (빠른 경로와 같은 순서)
+    for selector in DATE_SELECTORS:
+        if date:
+            break
+        for elem in soup.select(selector):
+            date = parse_naver_date(elem.get_text().strip(), now)
             if date:
                 break
-        
-        # 더 넓은 범위의 콘텐츠 셀렉터
-        content_selectors = [
-            'div.se-main-container', 'div#postViewArea', 'div.se_component_wrap',
-            '.post_content', '.blog_content', '.content', 'article',
-            '[class*="content"]', '[class*="post"]', '.se-main-container'
-        ]
-        
-        content = None
-        for selector in content_selectors:
-            content_elements = soup.select(selector)
-            for elem in content_elements:
-                text = elem.get_text().strip()
-                if text and len(text) > 100:  # 최소 100자 이상
-                    content = text
-                    break
-            if content:
+    
+    if date is None:
+        METRICS.inc('posts_undated')
+        if since is not None or until is not None:
+            # 오늘 날짜로 대체하면 기간 밖 글도 통과하므로 수집하지 않음 (실패로 기록되어 나중에 재시도)
+            print("❌ 날짜를 찾지 못해 수집 기간을 확인할 수 없습니다")
+            return None, None
+    elif not in_window(date, since, until):
+        METRICS.inc('posts_out_of_window')
+        return date, None
+    
+    # 더 넓은 범위의 콘텐츠 셀렉터
+    content_selectors = [
+        'div.se-main-container', 'div#postViewArea', 'div.se_component_wrap',
+        '.post_content', '.blog_content', '.content', 'article',
+        '[class*="content"]', '[class*="post"]', '.se-main-container'
+    ]
+    
+    content = None
+    for selector in content_selectors:
+        content_elements = soup.select(selector)
+        for elem in content_elements:
+            text = elem.get_text().strip()
+            if text and len(text) > 100:  # 최소 100자 이상
+                content = text
                 break
+        if content:
+            break
+    
+    # 기간 없이 호출했을 때만 날짜가 없으면 현재 날짜로 대체 (최근 게시물로 가정)
+    if not date:
+        date = (now or datetime.datetime.now()).date()
+    
+    # 콘텐츠가 없으면 제목으로 대체
+    if not content:
+        title_elem = soup.select_one('title, h1, .title')
+        content = title_elem.get_text().strip() if title_elem else "No content available"
+    
+    return date, content
+
+def parse_blog_post_bytes(content, encoding=None, since=None, until=None):
+    """응답 바이트를 디코딩해 parse_blog_post 실행 (프로세스 풀에서 호출)"""
+    return parse_blog_post(content.decode(encoding or 'utf-8', errors='replace'),
+                           since=since, until=until)
+
+def fetch_blog_post(link, session=None, follow_iframe=True, scheduler=None):
+    """
+    상세 페이지 요청 (200이 아니면 None) - 껍데기 페이지면 mainFrame iframe의 PostView를 받아 반환
+
+    iframe 요청도 예산 1회로 세므로, scheduler의 예산이 없으면 BudgetExhausted를 냅니다.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1"
+    }
+    
+    with METRICS.timer('detail_fetch'):
+        resp = (session or requests).get(link, headers=headers, timeout=10)
+    METRICS.add_bytes('detail_fetch', len(resp.content))
+    METRICS.inc('http_responses', stage='detail_fetch', status=resp.status_code)
+    if resp.status_code != 200:
+        print(f"Failed to access {link}: {resp.status_code}")
+        return None
+    
+    frame_url = main_frame_url(link, resp) if follow_iframe else None
+    if frame_url is not None:
+        if scheduler is not None and not scheduler.spend():
+            raise BudgetExhausted(frame_url)
+        METRICS.inc('iframe_follow')
+        return fetch_blog_post(frame_url, session=session, follow_iframe=False)
+    return resp
+
+def get_blog_post_date_and_content(link, session=None, since=None, until=None, scheduler=None):
+    try:
+        resp = fetch_blog_post(link, session=session, scheduler=scheduler)
+        if resp is None:
+            return None, None
+            
+        return parse_blog_post(resp.text, since=since, until=until)
         
-        # 날짜가 없으면 현재 날짜로 대체 (최근 게시물로 가정)
-        if not date:
-            date = "2024-06-10"
-        
-        # 콘텐츠가 없으면 제목으로 대체
-        if not content:
-            title_elem = soup.select_one('title, h1, .title')
-            content = title_elem.get_text().strip() if title_elem else "No content available"
-        
-        return date, content
-        
+    except BudgetExhausted:
+        raise
     except Exception as e:
         print(f"Error parsing {link}: {e}")
         return None, None
 
-def crawl_naver_blog(keyword: str, max_page: int = 2):
-    reviews = []
+def fetch_search_page(keyword, page, session=None):
+    """검색 결과 페이지를 받아 [(제목, 링크), ...] 반환 (실패하면 None)"""
+    start = (page - 1) * 10 + 1
+    url = f"{SEARCH_URL}?where=post&sm=tab_jum&query={keyword}&start={start}"
     
-    for page in range(1, max_page + 1):
-        print(f"Crawling page {page} for keyword: {keyword}")
-        
-        start = (page - 1) * 10 + 1
-        url = f"https://search.naver.com/search.naver?where=post&sm=tab_jum&query={keyword}&start={start}"
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3",
-            "Referer": "https://www.naver.com"
-        }
-        
-        try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            if resp.status_code != 200:
-                print(f"Failed to access search page: {resp.status_code}")
-                continue
-                
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3",
+        "Referer": "https://www.naver.com"
+    }
+    
+    try:
+        with METRICS.timer('search_fetch'):
+            resp = (session or requests).get(url, headers=headers, timeout=10)
+        METRICS.add_bytes('search_fetch', len(resp.content))
+        METRICS.inc('http_responses', stage='search_fetch', status=resp.status_code)
+        if resp.status_code != 200:
+            print(f"Failed to access search page: {resp.status_code}")
+            return None
+            
+        with METRICS.timer('search_parse'):
             soup = BeautifulSoup(resp.text, 'html.parser')
             
             # 🔥 수정된 부분: 올바른 셀렉터 사용
-            items = soup.select('.total_tit a.link_tit')
-            print(f"Found {len(items)} items")
-            
-            for i, item in enumerate(items[:5]):  # 페이지당 최대 5개
-                title = item.get('title') or item.text.strip()
-                link = item.get('href')
-                
+            items = [(item.get('title') or item.text.strip(), item.get('href'))
+                     for item in soup.select('.total_tit a.link_tit')]
+        print(f"Found {len(items)} items")
+        return items
+        
+    except Exception as e:
+        print(f"Error crawling page {page}: {e}")
+        return None
+
+def iter_search_pages(keyword, max_page, session=None, scheduler=None, prefetch=None):
+    """
+    검색 페이지를 순서대로 (페이지 번호, 항목) 으로 내보냄
+    
+    prefetch > 0이면 백그라운드 스레드가 최대 prefetch 페이지를 미리 받아두므로
+    다음 검색 페이지 요청이 현재 페이지의 상세 처리와 겹칩니다.
+    미리 받은 페이지는 내보낼 때 예산을 차감하므로, 중간에 멈추면 쓰지 않은 페이지는
+    예산에서 빠지지 않습니다 (예산이 남아 있을 때만 미리 받음).
+    검색 요청 사이에는 PAGE_DELAY만큼 간격을 둡니다.
+    """
+    prefetch = SEARCH_PREFETCH if prefetch is None else prefetch
+    
+    def fetch_pages(stop_event, charge):
+        for page in range(1, max_page + 1):
+            if stop_event.is_set():
+                return
+            # 스케줄러가 있으면 요청 예산 안에서만 요청
+            if scheduler is not None and not (scheduler.spend() if charge else scheduler.has_budget()):
+                print(f"⏸️ 요청 예산 소진: {keyword} {page}페이지부터 생략")
+                return
+            if page > 1:
+                if stop_event.wait(random.uniform(*PAGE_DELAY)):
+                    return
+            print(f"Crawling page {page} for keyword: {keyword}")
+            yield page, fetch_search_page(keyword, page, session=session)
+    
+    if prefetch <= 0:
+        yield from fetch_pages(threading.Event(), charge=True)
+        return
+    
+    pages = queue.Queue(maxsize=prefetch)
+    stop_event = threading.Event()
+    done = object()
+    
+    def put(item):
+        # 소비 쪽이 멈추면 (stop_event) 큐가 비기를 기다리지 않고 포기
+        while not stop_event.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def producer():
+        try:
+            for result in fetch_pages(stop_event, charge=False):
+                if not put(result):
+                    return
+        finally:
+            put(done)
+    
+    thread = threading.Thread(target=producer, name=f"search-prefetch-{keyword}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            result = pages.get()
+            if result is done:
+                break
+            if scheduler is not None and not scheduler.spend():
+                # 상세 페이지가 예산을 다 써서 미리 받은 페이지를 쓰지 못함
+                METRICS.inc('search_prefetch_discarded')
+                print(f"⏸️ 요청 예산 소진: {keyword} {result[0]}페이지부터 생략")
+                break
+            yield result
+    finally:
+        stop_event.set()
+        thread.join()
+
+def crawl_naver_blog(keyword: str, max_page: int = 2, session=None, scheduler=None,
+                     items_per_page=None, prefetch=None, since=DEFAULT_SINCE, until=None,
+                     executor=None):
+    reviews = []
+    items_per_page = items_per_page or ITEMS_PER_PAGE
+    
+    # (제목, 링크, 결과) - 결과는 재사용한 리뷰(dict), (날짜, 본문), 또는 executor의 Future
+    slots = []
+    
+    for page, items in iter_search_pages(keyword, max_page, session=session,
+                                         scheduler=scheduler, prefetch=prefetch):
+        if items is None:
+            continue
+        
+        try:
+            for i, (title, link) in enumerate(items[:items_per_page]):
                 print(f"Processing item {i+1}: {title[:50]}...")
                 print(f"Link: {link}")
                 
@@ -122,50 +295,103 @@ def crawl_naver_blog(keyword: str, max_page: int = 2):
                 
                 print("✅ Valid blog link found!")
                 
-                # 상세 페이지 진입해서 날짜/본문 파싱
-                date, content = get_blog_post_date_and_content(link)
+                if scheduler is not None:
+                    # 기간 밖이었거나 실패했던 글은 재시도 시점 전까지 다시 받지 않음
+                    reason = scheduler.rejected_reason(link, since=since, until=until)
+                    if reason is not None:
+                        print(f"⏭️ Skipped rejected post ({reason}): {title[:30]}...")
+                        continue
+                    # 이미 수집했고 재확인 시점이 아닌 글은 저장된 내용 재사용
+                    cached = scheduler.cached_review(link)
+                    if cached is not None:
+                        slots.append((title, link, cached))
+                        print(f"♻️ Reused review: {title[:30]}...")
+                        continue
+                    if not scheduler.spend():
+                        print("⏸️ 요청 예산 소진, 상세 페이지 생략")
+                        continue
+                
+                if executor is not None:
+                    # 요청과 파싱은 executor가 동시에 진행하고, 결과는 아래에서 순서대로 받음
+                    # 요청이 비동기로 진행되는 동안 뒤 글이 예산을 가져가지 않도록 iframe 본문 몫도
+                    # 지금 확보 (껍데기 페이지가 아니면 돌려받음)
+                    reserved = scheduler is not None and scheduler.spend()
+                    slots.append((title, link, executor.submit(link, since=since, until=until,
+                                                               scheduler=scheduler, reserved=reserved)))
+                    continue
                 
-                if date and content:
-                    try:
-                        # 날짜 파싱 개선 (조건 완화)
-                        date_str = date.replace('.', '-').replace('/', '-').split()[0]
-                        
-                        # 2024년 이후 모든 게시물 수집 (조건 완화)
-                        if '2024' in date_str or '2025' in date_str:
-                            review = {
-                                "title": title,
-                                "link": link,
-                                "date": date_str,
-                                "content": content[:500]  # 첫 500자만
-                            }
-                            reviews.append(review)
-                            print(f"✅ Added review: {title[:30]}...")
-                        else:
-                            print(f"❌ Date too old: {date_str}")
-                            
-                    except Exception as e:
-                        print(f"Date parsing error: {e}")
-                else:
-                    print("❌ Failed to get date/content")
+                # 상세 페이지 진입해서 날짜/본문 파싱
+                try:
+                    result = get_blog_post_date_and_content(link, session=session, since=since,
+                                                            until=until, scheduler=scheduler)
+                except BudgetExhausted:
+                    print("⏸️ 요청 예산 소진, iframe 본문 생략")
+                    continue
+                slots.append((title, link, result))
                 
                 # 요청 간 랜덤 딜레이
-                time.sleep(random.uniform(1, 2))
+                time.sleep(random.uniform(*REQUEST_DELAY))
                 
         except Exception as e:
             print(f"Error crawling page {page}: {e}")
+    
+    for title, link, result in slots:
+        if isinstance(result, dict):
+            reviews.append(result)
+            continue
         
-        # 페이지 간 딜레이
-        time.sleep(random.uniform(2, 3))
+        try:
+            date, content = result if isinstance(result, tuple) else result.result()
+        except BudgetExhausted:
+            # 예산이 없어 본문을 받지 못한 글은 실패로 기록하지 않고 다음 실행에서 다시 시도
+            print(f"⏸️ 요청 예산 소진, iframe 본문 생략: {title[:30]}...")
+            continue
+        if date and content:
+            review = {
+                "title": title,
+                "link": link,
+                "date": date.isoformat(),
+                "content": content[:500]  # 첫 500자만
+            }
+            reviews.append(review)
+            METRICS.inc('posts_collected')
+            if scheduler is not None:
+                scheduler.observe_post(keyword, review)
+            print(f"✅ Added review: {title[:30]}...")
+        elif date:
+            # 수집 기간 밖 (본문은 추출하지 않음)
+            print(f"❌ Date out of range: {date.isoformat()}")
+            if scheduler is not None:
+                scheduler.observe_rejected(keyword, link, 'out_of_window', date=date)
+        else:
+            print("❌ Failed to get date/content")
+            if scheduler is not None:
+                scheduler.observe_rejected(keyword, link, 'failed')
     
     return reviews
 
-def crawl_naver_blog_multi(keywords, max_page=2):
+@METRICS.timed('crawl')
+def crawl_naver_blog_multi(keywords, max_page=2, session=None, scheduler=None,
+                           items_per_page=None, prefetch=None, since=DEFAULT_SINCE, until=None,
+                           executor=None):
+    """키워드별 크롤링 후 링크 기준 중복 제거 (scheduler가 있으면 페이지 수는 스케줄러가 배정)"""
     all_reviews = []
     seen_links = set()
+    pages = scheduler.plan(keywords) if scheduler is not None else {}
     
     for keyword in keywords:
-        print(f"\n=== Crawling keyword: {keyword} ===")
-        reviews = crawl_naver_blog(keyword, max_page)
+        keyword_pages = pages.get(keyword, max_page)
+        if keyword_pages <= 0:
+            # 이번에 확인하지 않는 키워드는 지난 결과를 그대로 사용
+            print(f"\n=== Skipping keyword (not due): {keyword} ===")
+            reviews = scheduler.last_reviews(keyword)
+        else:
+            print(f"\n=== Crawling keyword: {keyword} ===")
+            reviews = crawl_naver_blog(keyword, keyword_pages, session=session, scheduler=scheduler,
+                                       items_per_page=items_per_page, prefetch=prefetch,
+                                       since=since, until=until, executor=executor)
+            if scheduler is not None:
+                reviews = scheduler.finish_keyword(keyword, keyword_pages, reviews)
         
         for r in reviews:
             if r['link'] not in seen_links:
@@ -178,33 +404,45 @@ def crawl_naver_blog_multi(keywords, max_page=2):
 def save_reviews_to_file(reviews, date_str):
     os.makedirs('data/reviews', exist_ok=True)
     path = f'data/reviews/{date_str}.json'
-    with open(path, 'w', encoding='utf-8') as f:
+    with METRICS.timer('file_write'), open(path, 'w', encoding='utf-8') as f:
         json.dump(reviews, f, ensure_ascii=False, indent=2)
     print(f"Reviews saved to: {path}")
 
 if __name__ == "__main__":
-    print("🚀 Starting fixed crawler...")
-    today = datetime.date.today().isoformat()
+    import argparse
+    import contextlib
+    from profiling import add_profile_arguments, profiler_from_args
     
-    keywords = [
-        "우리끼리 키즈카페 대전문화점",
-        "우리끼리 리뷰 대전"
-    ]
+    parser = add_profile_arguments(argparse.ArgumentParser(description='네이버 블로그 리뷰 크롤러'))
+    args = parser.parse_args()
+    profiler = profiler_from_args(args, 'crawl')
     
-    try:
-        result = crawl_naver_blog_multi(keywords)
-        save_reviews_to_file(result, today)
-        print(f"\n✅ SUCCESS: Saved {len(result)} reviews to data/reviews/{today}.json")
+    with profiler or contextlib.nullcontext():
+        print("🚀 Starting fixed crawler...")
+        today = datetime.date.today().isoformat()
+    
+        keywords = [
+            "우리끼리 키즈카페 대전문화점",
+            "우리끼리 리뷰 대전"
+        ]
+    
+        try:
+            result = crawl_naver_blog_multi(keywords)
+            save_reviews_to_file(result, today)
+            print(f"\n✅ SUCCESS: Saved {len(result)} reviews to data/reviews/{today}.json")
         
-        # 결과 미리보기
-        for i, review in enumerate(result[:3]):
-            print(f"\n--- Review {i+1} ---")
-            print(f"Title: {review['title']}")
-            print(f"Date: {review['date']}")
-            print(f"Link: {review['link']}")
-            print(f"Content: {review['content'][:100]}...")
+            # 결과 미리보기
+            for i, review in enumerate(result[:3]):
+                print(f"\n--- Review {i+1} ---")
+                print(f"Title: {review['title']}")
+                print(f"Date: {review['date']}")
+                print(f"Link: {review['link']}")
+                print(f"Content: {review['content'][:100]}...")
             
-    except Exception as e:
-        print(f"❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        except Exception as e:
+            print(f"❌ ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    # 단계별 지표 저장 (METRICS_PROM_TEXTFILE이 있으면 Prometheus 텍스트 파일도)
+    write_run_metrics('crawl')
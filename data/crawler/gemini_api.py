@@ -1,32 +1,110 @@
 # crawler/gemini_api.py - Gemini AI 마케팅 전략 생성 (저장 기능 포함)
 import os
 import json
-import requests
+import time
 from datetime import datetime
+from metrics import METRICS, write_run_metrics
+from report_renderer import DEFAULT_BRANCH, DEFAULT_REGION, RenderedReport, ReportRenderer, write_encoded
+from response_cache import ResponseCache
+from review_selector import select_representative_reviews
+
+_dotenv_loaded = False
+
+def load_env():
+    """환경변수 로딩 (.env 파일, 프로세스당 한 번만)"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()  # .env 파일에서 환경변수 로드
+    except ImportError:
+        print("⚠️ python-dotenv가 설치되지 않았습니다. pip install python-dotenv로 설치하세요.")
+
+DEFAULT_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+# 프롬프트 문구(_create_strategy_prompt)를 바꾸면 올려주세요 (파이프라인 단계 재실행 기준)
+PROMPT_TEMPLATE_VERSION = 1
+
+# 보고서에 표시할 모델 이름
+MODEL_DISPLAY_NAMES = {
+    "gemini-1.5-flash": "Gemini 1.5 Flash",
+    "gemini-1.5-pro": "Gemini 1.5 Pro",
+    "gemini-2.5-flash": "Gemini 2.5 Flash",
+}
+
+class GeminiRetryableError(Exception):
+    """재시도하면 성공할 수 있는 오류 (429, 5xx, 시간 초과, 연결 실패)"""
 
-# 환경변수 로딩
-try:
-    from dotenv import load_dotenv
-    load_dotenv()  # .env 파일에서 환경변수 로드
-except ImportError:
-    print("⚠️ python-dotenv가 설치되지 않았습니다. pip install python-dotenv로 설치하세요.")
 
 class GeminiMarketingStrategist:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, review_token_budget=1200, cache=None, use_cache=True,
+                 stream=False, model=DEFAULT_MODEL, branch_name=DEFAULT_BRANCH,
+                 branch_region=DEFAULT_REGION, api_base=None, timeout=60, max_retries=0,
+                 retry_backoff=2.0, session=None):
+        # 키가 직접 주어지지 않았을 때만 .env 로딩
+        if not api_key and not os.getenv('GEMINI_API_KEY'):
+            load_env()
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         if not self.api_key:
             print("⚠️ GEMINI_API_KEY가 설정되지 않았습니다.")
             print("💡 기본 전략 생성 모드로 작동합니다.")
             self.api_key = None
         
-        # gemini-1.5-flash 모델 사용 (최신)
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent"
+        # 프롬프트에 넣을 대표 리뷰의 토큰 예산 (프롬프트 크기 = 고정 템플릿 + 예산)
+        self.review_token_budget = review_token_budget
+        
+        # 기본은 gemini-1.5-flash 모델 사용
+        self.model = model
+        self.model_display_name = MODEL_DISPLAY_NAMES.get(model, model)
+        self.branch_name = branch_name
+        self.branch_region = branch_region
+        self.renderer = ReportRenderer(branch_name, branch_region)
+        # GEMINI_API_BASE로 로컬 대체 서버(fake_gemini_server.py)를 가리킬 수 있음
+        self.api_base = (api_base or os.getenv('GEMINI_API_BASE') or DEFAULT_API_BASE).rstrip('/')
+        self.base_url = f"{self.api_base}/models/{self.model}:generateContent"
+        self.stream_url = f"{self.api_base}/models/{self.model}:streamGenerateContent"
+        
+        # 호출 시간 초과와 재시도 설정 (429, 5xx, 시간 초과, 연결 실패만 재시도)
+        # 기본은 재시도 없음: 재시도마다 최악의 대기 시간이 timeout + 백오프만큼 늘어남
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_count = 0
+        
+        # 스트리밍 모드: 생성되는 대로 마크다운 파일에 이어 쓰기
+        self.stream = stream
+        
+        self.generation_config = {
+            "temperature": 0.7,
+            "topK": 40,
+            "topP": 0.95,
+            "maxOutputTokens": 2048,
+        }
         
-        # 저장 디렉토리 생성
-        self.ensure_directories()
+        # 동일 프롬프트 재호출을 막는 응답 캐시
+        self.cache = cache if cache is not None else (ResponseCache() if use_cache else None)
+        self.last_cache_info = {'enabled': self.cache is not None, 'hit': False, 'key': None}
+        
+        # 마지막 생성이 기본 전략(또는 끊긴 스트림)으로 끝났는지 여부
+        # last_fallback_retryable은 API 실패/끊김처럼 다시 시도하면 달라질 수 있을 때만 True (키 없음은 False)
+        self.last_fallback = False
+        self.last_fallback_retryable = False
+        
+        # 여러 호출/전략가가 연결을 재사용하도록 공유할 수 있는 requests.Session
+        self.session = session
+        
+        # 저장 디렉토리는 처음 저장할 때 생성
+        self._directories_ready = False
     
     def ensure_directories(self):
         """필요한 디렉토리들을 생성"""
+        if self._directories_ready:
+            return
+        self._directories_ready = True
+        
         directories = [
             'data',
             'data/reviews',
@@ -41,15 +119,31 @@ class GeminiMarketingStrategist:
             except Exception as e:
                 print(f"❌ 디렉토리 생성 실패 {directory}: {e}")
     
+    def config_fingerprint(self):
+        """전략 결과에 영향을 주는 설정 (프롬프트 버전, 모델, 생성 설정, 지점, 리뷰 예산)"""
+        return {
+            'prompt_template_version': PROMPT_TEMPLATE_VERSION,
+            'model': self.model,
+            'generation_config': self.generation_config,
+            'branch_name': self.branch_name,
+            'branch_region': self.branch_region,
+            'review_token_budget': self.review_token_budget,
+            'api': bool(self.api_key)
+        }
+    
     def generate_and_save_strategy(self, reviews_data):
         """리뷰 데이터를 바탕으로 AI 마케팅 전략 생성 및 저장"""
         print("🤖 마케팅 전략 생성 시작...")
         
-        # 전략 생성
-        strategy = self.generate_marketing_strategy(reviews_data)
-        
-        # 전략 저장
-        saved_files = self.save_strategy(strategy, reviews_data)
+        if self.stream and self.api_key:
+            # 스트리밍 생성 (생성과 동시에 저장)
+            strategy, saved_files = self._stream_and_save_strategy(reviews_data)
+        else:
+            # 전략 생성
+            strategy = self.generate_marketing_strategy(reviews_data)
+            
+            # 전략 저장
+            saved_files = self.save_strategy(strategy, reviews_data)
         
         print(f"✅ 전략 생성 및 저장 완료!")
         for file_path in saved_files:
@@ -59,12 +153,13 @@ class GeminiMarketingStrategist:
     
     def generate_marketing_strategy(self, reviews_data):
         """리뷰 데이터를 바탕으로 AI 마케팅 전략 생성"""
+        self.last_fallback = self.last_fallback_retryable = False
         
         # API 키가 없으면 기본 전략 반환
         if not self.api_key:
             print("🔄 API 키가 없으므로 기본 전략을 생성합니다...")
             summary = self._create_review_summary(reviews_data)
-            return self._generate_fallback_strategy(summary)
+            return self._generate_fallback_strategy(summary, retryable=False)
         
         # 리뷰 데이터 요약
         summary = self._create_review_summary(reviews_data)
@@ -72,27 +167,116 @@ class GeminiMarketingStrategist:
         # AI 프롬프트 생성
         prompt = self._create_strategy_prompt(summary)
         
+        # 캐시 확인 (같은 모델/설정/프롬프트면 API 호출 생략)
+        cache_key, cached_text = self._lookup_cache(prompt)
+        if cached_text is not None:
+            return self._format_strategy_output(cached_text)
+        
         # Gemini API 호출
         try:
-            strategy = self._call_gemini_api(prompt)
-            return strategy
+            generated_text = self._call_gemini_api(prompt)
+            if cache_key is not None:
+                self.cache.put(cache_key, generated_text, model=self.model)
+            return self._format_strategy_output(generated_text)
         except Exception as e:
             print(f"❌ Gemini API 호출 실패: {e}")
             # 실패시 기본 전략 반환
             return self._generate_fallback_strategy(summary)
     
-    def save_strategy(self, strategy_text, reviews_data):
-        """생성된 전략을 파일로 저장"""
+    def _lookup_cache(self, prompt):
+        """응답 캐시 조회 - (캐시 키, 캐시된 텍스트 또는 None) 반환"""
+        self.last_cache_info = {'enabled': self.cache is not None, 'hit': False, 'key': None}
+        if self.cache is None:
+            return None, None
+        
+        cache_key = ResponseCache.make_key(self.model, self.generation_config, prompt)
+        self.last_cache_info['key'] = cache_key
+        cached_text = self.cache.get(cache_key)
+        METRICS.cache_result('gemini_response', cached_text is not None)
+        if cached_text is not None:
+            print("♻️ 캐시된 응답 사용 (API 호출 생략)")
+            self.last_cache_info['hit'] = True
+        return cache_key, cached_text
+    
+    def _stream_and_save_strategy(self, reviews_data):
+        """스트리밍으로 전략을 생성하면서 마크다운 파일에 바로 기록"""
+        self.last_fallback = self.last_fallback_retryable = False
+        summary = self._create_review_summary(reviews_data)
+        prompt = self._create_strategy_prompt(summary)
+        
+        cache_key, cached_text = self._lookup_cache(prompt)
+        if cached_text is not None:
+            strategy = self._format_strategy_output(cached_text)
+            return strategy, self.save_strategy(strategy, reviews_data)
+        
+        self.ensure_directories()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        md_path = os.path.join('data', 'strategies', f"marketing_strategy_{timestamp}.md")
+        
+        header = self._format_strategy_header()
+        chunks = []
+        completed = False
+        
+        print(f"📡 스트리밍 저장: {md_path}")
+        with open(md_path, 'w', encoding='utf-8') as f:
+            f.write(header)
+            f.flush()
+            
+            try:
+                with METRICS.timer('gemini_call'):
+                    for text in self._stream_gemini_api(prompt):
+                        f.write(text)
+                        f.flush()
+                        chunks.append(text)
+                completed = True
+            except Exception as e:
+                print(f"❌ Gemini 스트리밍 중단: {e}")
+            
+            generated_text = ''.join(chunks)
+            footer = self._format_strategy_footer(interrupted=not completed)
+            if generated_text:
+                f.write(footer)
+        
+        if generated_text:
+            # 중간에 끊겨도 받은 부분까지는 보존
+            strategy = header + generated_text + footer
+            self.last_fallback = self.last_fallback_retryable = not completed
+            if completed and cache_key is not None:
+                self.cache.put(cache_key, generated_text, model=self.model)
+            saved_files = self.save_strategy(strategy, reviews_data, timestamp=timestamp,
+                                             markdown_written=True)
+        else:
+            # 아무것도 받지 못했으면 기본 전략으로 덮어쓰기
+            strategy = self._generate_fallback_strategy(summary)
+            saved_files = self.save_strategy(strategy, reviews_data, timestamp=timestamp)
+        
+        return strategy, saved_files
+    
+    @METRICS.timed('file_write')
+    def save_strategy(self, strategy, reviews_data, timestamp=None, markdown_written=False, extra_paths=()):
+        """
+        생성된 전략을 파일로 저장 (스트리밍으로 이미 쓴 마크다운은 다시 쓰지 않음)
+
+        strategy는 문자열이나 RenderedReport입니다. 마크다운은 한 번만 인코딩해 타임스탬프 파일,
+        latest.md, extra_paths(대시보드용 날짜 파일 등)에 한 번에 기록하고, JSON 보고서(dict)가 있으면
+        strategy_data의 'report'로 그대로 넣습니다.
+        """
+        if not isinstance(strategy, RenderedReport):
+            strategy = RenderedReport.from_markdown(self.branch_name, strategy)
+        self.ensure_directories()
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
         saved_files = []
         
         try:
-            # 1. 마크다운 파일로 저장
+            # 1. 마크다운 파일 (타임스탬프 파일 + latest.md + extra_paths)
             md_filename = f"marketing_strategy_{timestamp}.md"
             md_path = os.path.join('data', 'strategies', md_filename)
+            latest_path = os.path.join('data', 'strategies', 'latest.md')
             
-            with open(md_path, 'w', encoding='utf-8') as f:
-                f.write(strategy_text)
+            markdown_paths = [latest_path, *extra_paths]
+            if not markdown_written:
+                markdown_paths.insert(0, md_path)
+            write_encoded(strategy.encoded('markdown'), markdown_paths)
             
             saved_files.append(md_path)
             print(f"📝 마크다운 저장: {md_path}")
@@ -104,36 +288,40 @@ class GeminiMarketingStrategist:
             strategy_data = {
                 'timestamp': timestamp,
                 'generated_at': datetime.now().isoformat(),
-                'strategy_markdown': strategy_text,
+                'strategy_markdown': strategy.markdown,
                 'review_count': len(reviews_data) if reviews_data else 0,
                 'reviews_analyzed': reviews_data[:3] if reviews_data else [],  # 처음 3개만
-                'api_used': bool(self.api_key),
-                'model': 'gemini-1.5-flash',
+                'api_used': bool(self.api_key) and not self.last_cache_info['hit'],
+                'model': self.model,
+                'cache': self.last_cache_info,
+                'streamed': markdown_written,
                 'file_info': {
                     'markdown_file': md_filename,
                     'json_file': json_filename
                 }
             }
             
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(strategy_data, f, ensure_ascii=False, indent=2)
+            if 'json' in strategy.outputs:
+                # 렌더러가 만든 JSON 보고서(dict)를 다시 만들지 않고 그대로 포함
+                strategy_data['report'] = strategy['json']
+            
+            write_encoded(json.dumps(strategy_data, ensure_ascii=False, indent=2), [json_path])
             
             saved_files.append(json_path)
             print(f"💾 JSON 저장: {json_path}")
             
-            # 3. 최신 전략을 latest.md로도 저장
-            latest_path = os.path.join('data', 'strategies', 'latest.md')
-            with open(latest_path, 'w', encoding='utf-8') as f:
-                f.write(strategy_text)
-            
             saved_files.append(latest_path)
             print(f"🔄 최신 전략 저장: {latest_path}")
+            for path in extra_paths:
+                saved_files.append(path)
+                print(f"✅ Marketing strategy saved to: {path}")
             
         except Exception as e:
             print(f"❌ 저장 실패: {e}")
             
         return saved_files
     
+    @METRICS.timed('load_reviews')
     def load_reviews_from_file(self, file_path):
         """파일에서 리뷰 데이터를 불러오기"""
         try:
@@ -145,6 +333,7 @@ class GeminiMarketingStrategist:
             print(f"❌ 리뷰 파일 로드 실패: {e}")
             return []
     
+    @METRICS.timed('review_summary')
     def _create_review_summary(self, reviews):
         """리뷰 데이터 요약"""
         if not reviews:
@@ -157,19 +346,15 @@ class GeminiMarketingStrategist:
         # 주요 키워드 추출
         all_positive_keywords = []
         all_negative_keywords = []
-        key_reviews = []
         
         for review in reviews:
-            all_positive_keywords.extend(review.get('positive_keywords', []))
-            all_negative_keywords.extend(review.get('negative_keywords', []))
-            
-            # 대표적인 리뷰 내용 추출
-            key_reviews.append({
-                'title': review.get('title', '')[:100],
-                'content': review.get('content', '')[:200],
-                'sentiment': review.get('sentiment', 'neutral'),
-                'date': review.get('date', '')
-            })
+            all_positive_keywords.extend(review.get('positive_keywords') or ())
+            all_negative_keywords.extend(review.get('negative_keywords') or ())
+        
+        # 토큰 예산 안에서 대표/이질 리뷰 선택
+        key_reviews = select_representative_reviews(
+            reviews, token_budget=self.review_token_budget
+        )
         
         # 키워드 빈도 계산
         from collections import Counter
@@ -185,7 +370,7 @@ class GeminiMarketingStrategist:
             'negative_ratio': round(negative_count / len(reviews) * 100, 1),
             'top_positive_keywords': top_positive,
             'top_negative_keywords': top_negative,
-            'key_reviews': key_reviews[:3]  # 처음 3개만
+            'key_reviews': key_reviews
         }
     
     def _create_strategy_prompt(self, summary):
@@ -194,9 +379,9 @@ class GeminiMarketingStrategist:
 당신은 키즈카페 마케팅 전문가입니다. 다음 리뷰 분석 데이터를 바탕으로 구체적이고 실용적인 마케팅 전략을 제안해주세요.
 
 ## 키즈카페 정보
-- 업체명: 우리끼리 키즈카페 대전문화점
+- 업체명: {self.branch_name}
 - 업종: 무인 키즈카페
-- 지역: 대전 서구 문화점
+- 지역: {self.branch_region}
 
 ## 리뷰 분석 데이터
 - 총 리뷰 수: {summary['total_reviews']}개
@@ -210,13 +395,14 @@ class GeminiMarketingStrategist:
 ### 개선이 필요한 점
 {', '.join([f"{kw}({cnt}회)" for kw, cnt in summary['top_negative_keywords']]) if summary['top_negative_keywords'] else '데이터 없음'}
 
-### 주요 리뷰 내용
+### 주요 리뷰 내용 (군집별 대표 리뷰와 이질적인 리뷰)
 """
         
         if summary['key_reviews']:
             for i, review in enumerate(summary['key_reviews'], 1):
+                role = '대표' if review.get('role') == 'representative' else '이질'
                 prompt += f"""
-{i}. [{review['sentiment']}] {review['title']}
+{i}. [{review['sentiment']}/{role}, 유사 리뷰 {review.get('cluster_size', 1)}개] {review['title']}
    "{review['content']}"
 """
         else:
@@ -240,8 +426,32 @@ class GeminiMarketingStrategist:
         
         return prompt
     
+    @METRICS.timed('gemini_call')
     def _call_gemini_api(self, prompt):
-        """Gemini API 호출 (개선된 오류 처리)"""
+        """Gemini API 호출 (재시도 포함) - 생성된 원문 텍스트 반환"""
+        return self._with_retries(self._request_gemini_api, prompt)
+    
+    def _with_retries(self, request, prompt):
+        """request(prompt)가 GeminiRetryableError를 내면 max_retries번까지 지수 백오프로 다시 호출"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return request(prompt)
+            except GeminiRetryableError as e:
+                if attempt >= self.max_retries:
+                    # 호출자가 자체 재시도를 할 수 있도록 재시도 가능 여부를 유지
+                    raise GeminiRetryableError(f"API 호출 중 오류: {e}") from e
+                
+                delay = self.retry_backoff * (2 ** attempt)
+                self.retry_count += 1
+                METRICS.retry('gemini')
+                print(f"🔁 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}초 후): {e}")
+                time.sleep(delay)
+    
+    def _request_gemini_api(self, prompt):
+        """Gemini API 1회 호출 (개선된 오류 처리)"""
+        import requests
+        http = self.session or requests
+        
         url = f"{self.base_url}?key={self.api_key}"
         
         # API 키 확인 (보안을 위해 일부만 표시)
@@ -251,7 +461,7 @@ class GeminiMarketingStrategist:
             masked_key = f"{self.api_key[:3]}***"
             
         print(f"🔑 API Key 확인: {masked_key}")
-        print("🤖 모델: gemini-1.5-flash")
+        print(f"🤖 모델: {self.model}")
         
         headers = {
             'Content-Type': 'application/json',
@@ -263,18 +473,15 @@ class GeminiMarketingStrategist:
                     "text": prompt
                 }]
             }],
-            "generationConfig": {
-                "temperature": 0.7,
-                "topK": 40,
-                "topP": 0.95,
-                "maxOutputTokens": 2048,
-            }
+            "generationConfig": self.generation_config
         }
         
         print("📤 API 호출 중...")
         
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=60)
+            response = http.post(url, headers=headers, json=data, timeout=self.timeout)
+            METRICS.add_bytes('gemini_call', len(response.content))
+            METRICS.inc('http_responses', stage='gemini_call', status=response.status_code)
             
             print(f"📊 응답 상태: {response.status_code}")
             
@@ -285,8 +492,7 @@ class GeminiMarketingStrategist:
                 if 'candidates' in result and len(result['candidates']) > 0:
                     candidate = result['candidates'][0]
                     if 'content' in candidate and 'parts' in candidate['content']:
-                        generated_text = candidate['content']['parts'][0]['text']
-                        return self._format_strategy_output(generated_text)
+                        return candidate['content']['parts'][0]['text']
                     else:
                         raise Exception(f"응답 구조가 예상과 다릅니다: {result}")
                 else:
@@ -300,68 +506,120 @@ class GeminiMarketingStrategist:
                 raise Exception("API 키가 유효하지 않거나 권한이 없습니다 (403)")
             
             elif response.status_code == 429:
-                raise Exception("API 호출 한도를 초과했습니다 (429)")
+                raise GeminiRetryableError("API 호출 한도를 초과했습니다 (429)")
+            
+            elif response.status_code >= 500:
+                raise GeminiRetryableError(f"서버 오류: {response.status_code} - {response.text[:200]}")
             
             else:
                 raise Exception(f"API 호출 실패: {response.status_code} - {response.text}")
                 
         except requests.exceptions.Timeout:
-            raise Exception("API 호출 시간 초과 (60초)")
+            raise GeminiRetryableError(f"API 호출 시간 초과 ({self.timeout}초)")
         except requests.exceptions.ConnectionError:
-            raise Exception("네트워크 연결 실패")
+            raise GeminiRetryableError("네트워크 연결 실패")
+        except GeminiRetryableError:
+            raise
         except json.JSONDecodeError:
             raise Exception(f"응답 JSON 파싱 실패: {response.text[:200]}...")
         except Exception as e:
             raise Exception(f"API 호출 중 오류: {str(e)}")
     
-    def _format_strategy_output(self, generated_text):
-        """AI 생성 전략을 마크다운 형식으로 포맷팅"""
-        current_date = datetime.now().strftime('%Y년 %m월 %d일')
-        
-        formatted_strategy = f"""# 🤖 AI 생성 마케팅 전략 보고서
-
-**생성일**: {current_date}
-**분석 대상**: 우리끼리 키즈카페 대전문화점
-**생성 모델**: Google Gemini 1.5 Flash
-
----
-
-{generated_text}
+    def _stream_gemini_api(self, prompt):
+        """
+        Gemini 스트리밍 API 호출 - 생성된 텍스트 조각을 차례로 반환
 
----
-
-> 💡 **AI 생성 전략**: 이 전략은 Google Gemini 1.5 Flash가 실제 고객 리뷰를 분석하여 생성한 맞춤형 마케팅 전략입니다.
-"""
+        연결과 응답 상태 확인은 _call_gemini_api와 같은 재시도를 거칩니다. 조각을 받기 시작한 뒤
+        끊기면 이미 기록한 내용이 중복되지 않도록 여기서 다시 시도하지 않고 GeminiRetryableError를 냅니다.
+        """
+        import requests
+        
+        response = self._with_retries(self._open_gemini_stream, prompt)
+        with response:
+            # SSE 응답에는 charset이 없어 한글이 깨지지 않도록 UTF-8로 지정
+            response.encoding = 'utf-8'
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+                    
+                    event = json.loads(line[len('data:'):].strip())
+                    for candidate in event.get('candidates', [])[:1]:
+                        for part in candidate.get('content', {}).get('parts', []):
+                            if part.get('text'):
+                                METRICS.add_bytes('gemini_call', len(part['text'].encode('utf-8')))
+                                yield part['text']
+            except requests.exceptions.RequestException as e:
+                raise GeminiRetryableError(f"스트림 수신 중 오류: {e}") from e
+            except json.JSONDecodeError:
+                raise Exception(f"스트림 JSON 파싱 실패: {line[:200]}...")
+    
+    def _open_gemini_stream(self, prompt):
+        """스트리밍 요청 1회 - 응답 상태가 200이면 본문을 읽기 전의 응답 반환"""
+        import requests
+        http = self.session or requests
+        
+        url = f"{self.stream_url}?alt=sse&key={self.api_key}"
+        
+        data = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": self.generation_config
+        }
+        
+        print("📤 스트리밍 API 호출 중...")
+        
+        # 읽기 타임아웃은 전체 응답이 아니라 조각 사이 간격에 적용됨
+        try:
+            response = http.post(url, headers={'Content-Type': 'application/json'},
+                                 json=data, stream=True, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            raise GeminiRetryableError(f"API 연결 시간 초과 ({self.timeout}초)")
+        except requests.exceptions.ConnectionError:
+            raise GeminiRetryableError("네트워크 연결 실패")
+        
+        print(f"📊 응답 상태: {response.status_code}")
+        METRICS.inc('http_responses', stage='gemini_call', status=response.status_code)
+        if response.status_code == 200:
+            return response
         
-        return formatted_strategy
+        with response:
+            if response.status_code == 403:
+                raise Exception("API 키가 유효하지 않거나 권한이 없습니다 (403)")
+            elif response.status_code == 429:
+                raise GeminiRetryableError("API 호출 한도를 초과했습니다 (429)")
+            elif response.status_code >= 500:
+                raise GeminiRetryableError(f"서버 오류: {response.status_code} - {response.text[:200]}")
+            raise Exception(f"API 호출 실패: {response.status_code} - {response.text[:200]}")
     
-    def _generate_fallback_strategy(self, summary):
-        """API 실패시 기본 전략 반환"""
-        return f"""# 📊 키즈카페 마케팅 전략 보고서 (기본 분석)
-
-**생성일**: {datetime.now().strftime('%Y년 %m월 %d일')}
-**총 리뷰 수**: {summary['total_reviews']}개
-
-## 현재 상황
-- 긍정 리뷰 비율: {summary['positive_ratio']}%
-- 부정 리뷰 비율: {summary['negative_ratio']}%
-
-## 기본 전략 제안
-1. 고객 만족도 향상을 위한 서비스 개선
-2. 긍정적 후기 확산을 위한 SNS 마케팅
-3. 정기적인 고객 피드백 수집 및 대응
-
-⚠️ **주의**: Gemini API 연결 실패로 기본 전략이 제공되었습니다.
-API 키를 확인하고 다시 시도해주세요.
-"""
+    def _format_strategy_header(self):
+        """AI 생성 전략 마크다운 머리말"""
+        return self.renderer.ai_header(self.model_display_name)
+    
+    def _format_strategy_footer(self, interrupted=False):
+        """AI 생성 전략 마크다운 꼬리말"""
+        return self.renderer.ai_footer(self.model_display_name, interrupted)
+    
+    def _format_strategy_output(self, generated_text):
+        """AI 생성 전략을 마크다운 형식으로 포맷팅"""
+        return self.renderer.ai_report(generated_text, self.model_display_name)
+    
+    def _generate_fallback_strategy(self, summary, retryable=True):
+        """API 실패시 기본 전략 반환 (키가 없어서 쓰는 경우는 retryable=False)"""
+        self.last_fallback = True
+        self.last_fallback_retryable = retryable
+        return self.renderer.fallback_report(summary)
 
 def main():
     """메인 실행 함수"""
     print("🚀 키즈카페 마케팅 전략 생성기 (Gemini 1.5 Flash)")
     print("=" * 60)
     
-    # Gemini 전략가 초기화
-    strategist = GeminiMarketingStrategist()
+    # Gemini 전략가 초기화 (GEMINI_STREAM=1이면 스트리밍 모드)
+    strategist = GeminiMarketingStrategist(stream=os.getenv('GEMINI_STREAM') == '1')
     
     # 리뷰 데이터 로드 시도
     review_files = [
@@ -436,6 +694,17 @@ def main():
         print("  1. GEMINI_API_KEY 환경변수 설정 확인")
         print("  2. 인터�net 연결 상태 확인")
         print("  3. Google AI Studio에서 API 키 재발급")
+    
+    # 단계별 지표 저장 (METRICS_PROM_TEXTFILE이 있으면 Prometheus 텍스트 파일도)
+    write_run_metrics('strategy')
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    import contextlib
+    from profiling import add_profile_arguments, profiler_from_args
+    
+    parser = add_profile_arguments(argparse.ArgumentParser(description='Gemini 마케팅 전략 생성기'))
+    args = parser.parse_args()
+    
+    with profiler_from_args(args, 'strategy') or contextlib.nullcontext():
+        main()
@@ -0,0 +1,303 @@
+# metrics.py - 파이프라인 단계별 성능 지표 수집 및 내보내기 (JSON / Prometheus 텍스트 파일)
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRIC_PREFIX = 'kidscafe'
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram과 같은 구조)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def merge(self, other):
+        """다른 히스토그램(같은 구간)의 관측값 합치기"""
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        self.bucket_counts = [a + b for a, b in zip(self.bucket_counts, other.bucket_counts)]
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            total += count
+            yield bound, total
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'avg': round(self.sum / self.count, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+            'buckets': {str(bound): count for bound, count in self.cumulative()}
+        }
+
+
+class MetricsRegistry:
+    """
+    카운터와 지연 시간 히스토그램을 모으는 저장소
+
+    사용 예:
+        with METRICS.timer('detail_fetch'):
+            resp = requests.get(link)
+        METRICS.add_bytes('detail_fetch', len(resp.content))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stage_listeners = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started_at = time.time()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def drain(self):
+        """
+        지금까지 모은 카운터/히스토그램을 꺼내고 비움
+
+        프로세스 풀 작업자가 결과와 함께 돌려주면 부모 프로세스에서 merge()로 합칩니다.
+        """
+        with self._lock:
+            delta = (self.counters, self.histograms)
+            self.counters, self.histograms = {}, {}
+        return delta
+
+    def merge(self, delta):
+        """drain()으로 꺼낸 지표를 이 저장소에 더함"""
+        counters, histograms = delta
+        with self._lock:
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, histogram in histograms.items():
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram)
+                else:
+                    self.histograms[key] = histogram
+
+    def add_stage_listener(self, listener):
+        """단계 시작/종료 알림 받을 객체 등록 (stage_started(stage), stage_finished(stage))"""
+        self._stage_listeners.append(listener)
+
+    def remove_stage_listener(self, listener):
+        if listener in self._stage_listeners:
+            self._stage_listeners.remove(listener)
+
+    @contextmanager
+    def timer(self, stage):
+        """블록 실행 시간을 stage_seconds{stage=...} 히스토그램에 기록"""
+        listeners = list(self._stage_listeners)
+        for listener in listeners:
+            listener.stage_started(stage)
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - started_at, stage=stage)
+            for listener in reversed(listeners):
+                listener.stage_finished(stage)
+
+    def timed(self, stage):
+        """함수 실행 시간을 stage_seconds{stage=...}에 기록하는 데코레이터"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def add_bytes(self, stage, size):
+        self.inc('bytes_transferred', size, stage=stage)
+
+    def cache_result(self, cache, hit):
+        self.inc('cache_hits' if hit else 'cache_misses', cache=cache)
+
+    def retry(self, target):
+        self.inc('retries', target=target)
+
+    @staticmethod
+    def peak_rss_bytes():
+        """프로세스 최대 메모리 사용량 (알 수 없으면 None)"""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # 리눅스는 KB, macOS는 바이트 단위
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def cache_hit_rates(self):
+        rates = {}
+        caches = {dict(labels)['cache'] for name, labels in self.counters
+                  if name in ('cache_hits', 'cache_misses')}
+        for cache in caches:
+            hits = self.counters.get(('cache_hits', (('cache', cache),)), 0)
+            misses = self.counters.get(('cache_misses', (('cache', cache),)), 0)
+            rates[cache] = round(hits / (hits + misses), 4) if hits + misses else 0.0
+        return rates
+
+    def to_dict(self, run_name=None):
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                dict({'name': name, 'labels': dict(labels)}, **histogram.to_dict())
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ]
+            cache_hit_rates = self.cache_hit_rates()
+
+        return {
+            'run': run_name,
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'duration_seconds': round(time.time() - self.started_at, 3),
+            'peak_rss_bytes': self.peak_rss_bytes(),
+            'counters': counters,
+            'histograms': histograms,
+            'cache_hit_rates': cache_hit_rates
+        }
+
+    def to_prometheus(self, run_name=None):
+        """Prometheus 텍스트 노출 형식으로 변환 (node_exporter textfile 수집기용)"""
+        lines = []
+        extra = {'run': run_name} if run_name else {}
+
+        def fmt_labels(labels):
+            merged = dict(extra, **labels)
+            if not merged:
+                return ''
+            body = ','.join(f'{k}="{str(v)}"' for k, v in sorted(merged.items()))
+            return '{' + body + '}'
+
+        with self._lock:
+            counter_names = sorted({name for name, _ in self.counters})
+            for name in counter_names:
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{metric}{fmt_labels(dict(labels))} {value}")
+
+            histogram_names = sorted({name for name, _ in self.histograms})
+            for name in histogram_names:
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (n, labels), histogram in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    labels = dict(labels)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f"{metric}_bucket{fmt_labels(dict(labels, le=bound))} {count}")
+                    lines.append(f"{metric}_bucket{fmt_labels(dict(labels, le='+Inf'))} {histogram.count}")
+                    lines.append(f"{metric}_sum{fmt_labels(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{metric}_count{fmt_labels(labels)} {histogram.count}")
+
+            hit_rates = self.cache_hit_rates()
+
+        if hit_rates:
+            lines.append(f"# TYPE {METRIC_PREFIX}_cache_hit_ratio gauge")
+            for cache, rate in sorted(hit_rates.items()):
+                lines.append(f"{METRIC_PREFIX}_cache_hit_ratio{fmt_labels({'cache': cache})} {rate}")
+
+        peak = self.peak_rss_bytes()
+        if peak is not None:
+            lines.append(f"# TYPE {METRIC_PREFIX}_peak_rss_bytes gauge")
+            lines.append(f"{METRIC_PREFIX}_peak_rss_bytes{fmt_labels({})} {peak}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds{fmt_labels({})} {int(time.time())}")
+        return '\n'.join(lines) + '\n'
+
+
+def _atomic_write(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_run_metrics(run_name, output_dir='data/metrics', prometheus_path=None, registry=None):
+    """
+    실행이 끝날 때 지표를 저장합니다.
+
+    - {output_dir}/{run_name}_{타임스탬프}.json 에 JSON 저장
+      (실행마다 새 파일이 생기므로 output_dir는 .gitignore 대상 - 변화 없는 실행이 커밋을 만들지 않도록)
+    - prometheus_path (또는 METRICS_PROM_TEXTFILE 환경변수)가 있으면 Prometheus 텍스트 파일도 저장
+
+    Returns:
+        list: 저장된 파일 경로
+    """
+    registry = registry or METRICS
+    prometheus_path = prometheus_path or os.getenv('METRICS_PROM_TEXTFILE')
+    saved_files = []
+
+    try:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        json_path = os.path.join(output_dir, f"{run_name}_{timestamp}.json")
+        _atomic_write(json_path, json.dumps(registry.to_dict(run_name), ensure_ascii=False, indent=2))
+        saved_files.append(json_path)
+        print(f"📈 지표 저장: {json_path}")
+
+        if prometheus_path:
+            _atomic_write(prometheus_path, registry.to_prometheus(run_name))
+            saved_files.append(prometheus_path)
+            print(f"📈 Prometheus 지표 저장: {prometheus_path}")
+    except Exception as e:
+        print(f"⚠️ 지표 저장 실패: {e}")
+
+    return saved_files
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+METRICS = MetricsRegistry()
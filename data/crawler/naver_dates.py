@@ -0,0 +1,110 @@
+# naver_dates.py - 네이버 블로그 날짜 표기를 date 객체로 변환
+import datetime
+import re
+
+# 2025. 6. 10. 14:30 / 2025.06.10. / 2025/06/10 14:30 / 2025-06-10 / 2025년 6월 10일
+ABSOLUTE_DATE_RE = re.compile(
+    r'(?P<year>(?:19|20)\d{2})\s*(?:[./\-]|년)\s*(?P<month>\d{1,2})\s*(?:[./\-]|월)\s*(?P<day>\d{1,2})'
+)
+
+# 3시간 전 / 15분 전 / 2일 전 / 1주 전 / 2개월 전
+RELATIVE_DATE_RE = re.compile(r'(?P<amount>\d+)\s*(?P<unit>초|분|시간|일|주|개월|달)\s*전')
+
+# 방금 전 / 오늘 / 어제 / 그제(그저께)
+NAMED_DAY_RE = re.compile(r'방금|오늘|어제|그제|그저께')
+
+# 블로그 글 날짜 요소 셀렉터 (앞에 있을수록 우선, 같은 셀렉터 안에서는 문서 순서)
+DATE_SELECTORS = (
+    'span.se_publishDate', 'span.se_publish_time', 'span.date',
+    '.post_date', '.blog_date', '.date', '.time',
+    '[class*="date"]', '[class*="time"]',
+    '.blog_date', '.post-date'
+)
+
+# 클래스 이름에 date/time이 들어간 여는 태그 (BeautifulSoup 없이 원문에서 바로 찾기)
+# text는 태그 바로 뒤의 짧은 텍스트 (자식 태그가 먼저 나오면 None)
+DATE_ELEMENT_RE = re.compile(
+    r'<(?P<tag>[a-z][a-z0-9]*)\b[^>]*\bclass="(?P<classes>[^"]*(?:date|time)[^"]*)"[^>]*>'
+    r'(?:\s*(?P<text>[^<]{2,40}?)\s*<)?',
+    re.IGNORECASE
+)
+
+# 'span.date' / '.date' / '[class*="date"]' 형태의 셀렉터 분해
+_SELECTOR_RE = re.compile(r'^(?P<tag>[a-z]*)(?:\.(?P<token>[\w-]+)|\[class\*="(?P<part>[\w-]+)"\])$')
+_RELATIVE_UNITS = {
+    '초': datetime.timedelta(seconds=1),
+    '분': datetime.timedelta(minutes=1),
+    '시간': datetime.timedelta(hours=1),
+    '일': datetime.timedelta(days=1),
+    '주': datetime.timedelta(weeks=1),
+    '개월': datetime.timedelta(days=30),
+    '달': datetime.timedelta(days=30),
+}
+
+_NAMED_DAY_OFFSETS = {'방금': 0, '오늘': 0, '어제': 1, '그제': 2, '그저께': 2}
+
+
+def parse_naver_date(text, now=None):
+    """
+    네이버 날짜 표기를 date로 변환 (알 수 없는 형식이면 None)
+
+    '3시간 전', '어제' 같은 상대 표기는 now(기본: 현재 시각) 기준으로 계산합니다.
+    """
+    if not text:
+        return None
+
+    match = ABSOLUTE_DATE_RE.search(text)
+    if match:
+        try:
+            return datetime.date(int(match['year']), int(match['month']), int(match['day']))
+        except ValueError:
+            return None
+
+    now = now or datetime.datetime.now()
+    match = RELATIVE_DATE_RE.search(text)
+    if match:
+        return (now - int(match['amount']) * _RELATIVE_UNITS[match['unit']]).date()
+
+    match = NAMED_DAY_RE.search(text)
+    if match:
+        return (now - datetime.timedelta(days=_NAMED_DAY_OFFSETS[match.group()])).date()
+    return None
+
+
+def _selector_matches(selector, tag, classes):
+    rule = _SELECTOR_RE.match(selector)
+    if rule['tag'] and rule['tag'] != tag.lower():
+        return False
+    if rule['token']:
+        return rule['token'] in classes.split()
+    return rule['part'] in classes
+
+
+def find_date_in_html(html, now=None):
+    """
+    HTML 원문에서 날짜 요소를 찾아 date 반환 (파서를 거치지 않는 빠른 경로)
+
+    DATE_SELECTORS 순서대로 BeautifulSoup 경로와 같은 요소를 고르고,
+    고를 요소의 텍스트를 원문에서 바로 읽을 수 없으면 (자식 태그 등) 파서에 맡기도록 None 반환
+    """
+    candidates = [(match['tag'], match['classes'], match['text'])
+                  for match in DATE_ELEMENT_RE.finditer(html)]
+    for selector in DATE_SELECTORS:
+        for tag, classes, text in candidates:
+            if not _selector_matches(selector, tag, classes):
+                continue
+            if text is None:
+                return None
+            post_date = parse_naver_date(text, now)
+            if post_date is not None:
+                return post_date
+    return None
+
+
+def in_window(post_date, since=None, until=None):
+    """since <= post_date <= until (None이면 해당 쪽 제한 없음)"""
+    if since is not None and post_date < since:
+        return False
+    if until is not None and post_date > until:
+        return False
+    return True
@@ -0,0 +1,402 @@
+# pipeline.py - 크롤링 → 감정 분석 → 전략 생성 → 저장을 한 프로세스에서 실행
+#
+# 사용법:
+#   python pipeline.py all                 # 전체 실행 (단계 간 데이터는 메모리로 전달, 저장은 마지막에 한 번)
+#   python pipeline.py crawl               # 크롤링만 (data/reviews/{날짜}.json 저장)
+#   python pipeline.py analyze             # 저장된 리뷰에 감정 분석 결과 추가
+#   python pipeline.py trend               # 감정/부정 키워드 추이 갱신 및 이상 징후 감지
+#   python pipeline.py strategy            # 저장된 리뷰로 마케팅 전략 생성
+#   python pipeline.py export              # 최신 전략을 대시보드용 파일로 내보내기
+#
+# 무거운 모듈(requests, bs4, gemini_api)은 해당 단계가 실행될 때만 불러옵니다.
+# analyze/strategy/export는 입력 해시가 지난 실행과 같으면 저장된 결과를 재사용하고
+# 건너뜁니다 (data/cache/pipeline_manifest.json, --force로 무시).
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import shutil
+
+from metrics import METRICS, write_run_metrics
+from stage_manifest import StageManifest, content_hash, report_hash, reviews_hash
+
+DEFAULT_KEYWORDS = [
+    "우리끼리 키즈카페 대전문화점",
+    "우리끼리 리뷰 대전"
+]
+
+COMMANDS = ('crawl', 'analyze', 'trend', 'strategy', 'export', 'all')
+
+
+class PipelineContext:
+    """단계 사이에 메모리로 주고받는 데이터와 공유 자원 (HTTP 세션, 전략 생성기)"""
+
+    def __init__(self, args):
+        self.args = args
+        self.date_str = args.date
+        # 'all'이면 중간 결과를 파일로 쓰지 않고 export 단계에서 한 번에 저장
+        self.defer_writes = args.command == 'all'
+
+        self.reviews = None
+        self.analyzed = None
+        self.trend = None
+        self.strategy = None
+        self.report = None
+        self.strategy_saved = False
+        self.saved_files = []
+
+        # 단계별 입력 해시 기록 (--force면 사용하지 않음)
+        self.manifest = None if args.force else StageManifest()
+        self.analyzed_hash = None
+        self.strategy_hash = None
+        self.pending_records = {}
+        self.skipped = []
+
+        self._session = None
+        self._strategist = None
+
+    @property
+    def reviews_path(self):
+        return f'data/reviews/{self.date_str}.json'
+
+    @property
+    def session(self):
+        """크롤러와 Gemini 호출이 함께 쓰는 requests.Session (처음 쓸 때 생성)"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    @property
+    def strategist(self):
+        """응답 캐시를 포함한 전략 생성기 (처음 쓸 때 생성)"""
+        if self._strategist is None:
+            from gemini_api import GeminiMarketingStrategist
+            self._strategist = GeminiMarketingStrategist(
+                stream=self.args.stream, session=self._session,
+                max_retries=self.args.gemini_retries
+            )
+        return self._strategist
+
+    def lookup_stage(self, stage, input_hash):
+        """입력이 지난 실행과 같으면 그때의 기록 반환"""
+        if self.manifest is None:
+            return None
+        entry = self.manifest.lookup(stage, input_hash)
+        METRICS.cache_result('pipeline_stage', entry is not None)
+        if entry is not None:
+            print(f"⏭️ {stage}: 입력 변화 없음, 이전 결과 재사용")
+            METRICS.inc('stages_skipped', stage=stage)
+            self.skipped.append(stage)
+        return entry
+
+    def record_stage(self, stage, artifacts):
+        """실행한 단계의 결과를 산출물 경로와 함께 기록"""
+        if self.manifest is None or stage not in self.pending_records:
+            return
+        input_hash, output_hash = self.pending_records.pop(stage)
+        self.manifest.record(stage, input_hash, output_hash, artifacts)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+@METRICS.timed('load_reviews')
+def load_reviews(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        reviews = json.load(f)
+    print(f"📖 리뷰 데이터 로드: {path} ({len(reviews)}개)")
+    return reviews
+
+
+def _load_reviews_artifact(entry):
+    """analyze 기록의 리뷰 파일을 읽어 해시가 맞으면 반환"""
+    try:
+        with open(entry['artifacts'][0], 'r', encoding='utf-8') as f:
+            reviews = json.load(f)
+    except (OSError, IndexError, json.JSONDecodeError):
+        return None
+    return reviews if content_hash(reviews) == entry['output'] else None
+
+
+def _load_strategy_artifact(entry):
+    """strategy 기록의 JSON 파일에서 전략 본문을 읽어 해시가 맞으면 반환"""
+    for path in entry['artifacts']:
+        if not path.endswith('.json'):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                strategy = json.load(f).get('strategy_markdown')
+        except (OSError, json.JSONDecodeError):
+            return None
+        if strategy is not None and report_hash(strategy) == entry['output']:
+            return strategy
+    return None
+
+
+def run_crawl(ctx):
+    from fixed_iframe_crawler import DEFAULT_SINCE, crawl_naver_blog_multi, save_reviews_to_file
+
+    scheduler = None
+    if ctx.args.budget is not None:
+        # 요청 예산을 키워드별 활동량에 맞춰 나누고, 이미 수집한 글은 재사용
+        from scheduler import CrawlScheduler
+        scheduler = CrawlScheduler(budget=ctx.args.budget, items_per_page=ctx.args.items_per_page)
+
+    executor = None
+    if ctx.args.workers:
+        # 상세 페이지는 동시에 요청하고 파싱은 여러 프로세스에서
+        from crawl_executor import HybridCrawlExecutor
+        executor = HybridCrawlExecutor(session=ctx.session, workers=ctx.args.workers,
+                                       concurrency=ctx.args.concurrency)
+
+    print(f"🕷️ 크롤링 시작: {', '.join(ctx.args.keywords)}")
+    with executor or contextlib.nullcontext():
+        ctx.reviews = crawl_naver_blog_multi(ctx.args.keywords, max_page=ctx.args.max_page,
+                                             session=ctx.session, scheduler=scheduler,
+                                             items_per_page=ctx.args.items_per_page,
+                                             prefetch=ctx.args.prefetch,
+                                             since=ctx.args.since or DEFAULT_SINCE,
+                                             until=ctx.args.until, executor=executor)
+    print(f"✅ 크롤링 완료: {len(ctx.reviews)}개")
+
+    if scheduler is not None:
+        scheduler.save()
+        print(f"🗓️ 스케줄러: {scheduler.summary()}")
+
+    if not ctx.defer_writes:
+        save_reviews_to_file(ctx.reviews, ctx.date_str)
+
+
+def run_analyze(ctx):
+    from sentiment import LEXICON_VERSION, batch_analyze_reviews
+
+    reviews = ctx.reviews if ctx.reviews is not None else load_reviews(ctx.reviews_path)
+    input_hash = content_hash(reviews_hash(reviews), LEXICON_VERSION)
+
+    entry = ctx.lookup_stage('analyze', input_hash)
+    analyzed = _load_reviews_artifact(entry) if entry else None
+    if analyzed is not None:
+        ctx.analyzed, ctx.analyzed_hash = analyzed, entry['output']
+        return
+
+    ctx.analyzed = batch_analyze_reviews(reviews)
+    ctx.analyzed_hash = content_hash(ctx.analyzed)
+    ctx.pending_records['analyze'] = (input_hash, ctx.analyzed_hash)
+    print(f"✅ 감정 분석 완료: {len(ctx.analyzed)}개")
+
+    if not ctx.defer_writes:
+        from fixed_iframe_crawler import save_reviews_to_file
+        save_reviews_to_file(ctx.analyzed, ctx.date_str)
+        ctx.record_stage('analyze', [ctx.reviews_path])
+
+
+def _ensure_analyzed(ctx):
+    """감정 분석된 리뷰 준비 (단독 실행이면 저장된 리뷰를 읽고 필요하면 분석)"""
+    if ctx.analyzed is None:
+        reviews = ctx.reviews if ctx.reviews is not None else load_reviews(ctx.reviews_path)
+        if reviews and any('sentiment' not in r for r in reviews):
+            from sentiment import batch_analyze_reviews
+            reviews = batch_analyze_reviews(reviews)
+        ctx.analyzed = reviews
+    return ctx.analyzed
+
+
+def run_trend(ctx):
+    from trend import SNAPSHOT_PATH, TrendTracker
+
+    # 추적기 상태에 이미 반영된 리뷰는 건너뛰므로 같은 입력이 다시 와도 결과가 같음
+    tracker = TrendTracker()
+    tracker.update(_ensure_analyzed(ctx))
+    ctx.trend = tracker.snapshot()
+
+    if tracker.save():
+        print(f"📈 추이 상태 저장: {tracker.path}")
+    if tracker.write_snapshot():
+        ctx.saved_files.append(SNAPSHOT_PATH)
+    print(f"✅ 추이 갱신 완료: 최근 {ctx.trend['window_days']}일 리뷰 {ctx.trend['window_reviews']}개, "
+          f"이상 징후 {len(ctx.trend['alerts'])}건")
+
+
+def run_strategy(ctx):
+    from report_renderer import RenderedReport
+    from strategy import generate_marketing_report
+
+    _ensure_analyzed(ctx)
+    if ctx.analyzed_hash is None:
+        ctx.analyzed_hash = content_hash(ctx.analyzed)
+    if ctx.trend is None:
+        # 단독 실행이면 마지막 trend 단계의 요약 사용
+        from trend import load_snapshot
+        ctx.trend = load_snapshot()
+
+    # 기본 전략에는 추이 요약도 들어가므로 입력에 포함
+    input_hash = content_hash(ctx.analyzed_hash, ctx.strategist.config_fingerprint(), ctx.trend)
+    entry = ctx.lookup_stage('strategy', input_hash)
+    strategy = _load_strategy_artifact(entry) if entry else None
+    if strategy is not None:
+        # 이전 전략 파일이 그대로 있으므로 다시 저장하지 않음
+        ctx.strategy, ctx.strategy_hash = strategy, entry['output']
+        ctx.report = RenderedReport.from_markdown(ctx.strategist.branch_name, strategy)
+        ctx.strategy_saved = True
+        return
+
+    if ctx.args.stream and ctx.strategist.api_key:
+        # 스트리밍은 생성과 동시에 파일에 기록
+        ctx.strategy, saved_files = ctx.strategist.generate_and_save_strategy(ctx.analyzed)
+        ctx.report = RenderedReport.from_markdown(ctx.strategist.branch_name, ctx.strategy)
+        ctx.saved_files.extend(saved_files)
+        ctx.strategy_saved = True
+    else:
+        # 저장 단계까지 같은 보고서를 넘겨 마크다운/JSON을 다시 만들거나 인코딩하지 않음
+        ctx.report = generate_marketing_report(ctx.analyzed, strategist=ctx.strategist, trend=ctx.trend)
+        ctx.strategy = ctx.report.markdown
+    # 생성일은 해시에서 빼서, 같은 전략을 다른 날 다시 만들어도 export가 새 파일을 만들지 않음
+    ctx.strategy_hash = report_hash(ctx.strategy)
+    print("✅ 마케팅 전략 생성 완료")
+
+    # API 실패로 쓴 기본 전략이나 끊긴 응답만 다음 실행에서 다시 시도하도록 기록하지 않음
+    # (키가 없어서 만든 기본 전략은 입력이 같으면 결과도 같으므로 기록)
+    if not ctx.strategist.last_fallback_retryable:
+        ctx.pending_records['strategy'] = (input_hash, ctx.strategy_hash)
+        if ctx.strategy_saved:
+            ctx.record_stage('strategy', saved_files)
+
+    if not ctx.defer_writes:
+        export_strategy(ctx)
+
+
+def export_strategy(ctx):
+    """전략 보고서 저장 (타임스탬프 파일/JSON/latest.md + 대시보드용 날짜 파일)"""
+    from strategy import save_strategy_to_file, strategy_file_path
+
+    if ctx.strategy_saved:
+        ctx.saved_files.append(save_strategy_to_file(ctx.report, ctx.date_str))
+        return
+
+    # 마크다운 사본은 모두 한 번의 write_encoded로 기록
+    saved_files = ctx.strategist.save_strategy(ctx.report, ctx.analyzed,
+                                               extra_paths=[strategy_file_path(ctx.date_str)])
+    ctx.saved_files.extend(saved_files)
+    ctx.strategy_saved = True
+    ctx.record_stage('strategy', saved_files)
+
+
+def run_export(ctx):
+    if ctx.strategy is None and ctx.reviews is None and ctx.analyzed is None:
+        # 단독 실행: 최신 전략을 대시보드가 읽는 날짜 파일로 복사
+        latest_path = os.path.join('data', 'strategies', 'latest.md')
+        if not os.path.exists(latest_path):
+            print(f"❌ 내보낼 전략이 없습니다: {latest_path}")
+            return
+        from strategy import strategy_file_path
+
+        target = strategy_file_path(ctx.date_str)
+        with METRICS.timer('file_write'):
+            shutil.copyfile(latest_path, target)
+        ctx.saved_files.append(target)
+        print(f"✅ 대시보드용 전략 내보내기: {target}")
+        return
+
+    from fixed_iframe_crawler import save_reviews_to_file
+
+    reviews = ctx.analyzed if ctx.analyzed is not None else ctx.reviews
+    reviews_key = ctx.analyzed_hash or (content_hash(reviews) if reviews is not None else None)
+    input_hash = content_hash(reviews_key, ctx.strategy_hash)
+    if ctx.lookup_stage('export', input_hash):
+        # 리뷰도 전략도 그대로면 새 파일을 만들지 않음 (동일 내용 커밋 방지)
+        for stage in list(ctx.pending_records):
+            previous = ctx.manifest.get(stage) or {}
+            ctx.record_stage(stage, previous.get('artifacts', []))
+        return
+
+    first_saved = len(ctx.saved_files)
+    if reviews is not None:
+        save_reviews_to_file(reviews, ctx.date_str)
+        ctx.saved_files.append(ctx.reviews_path)
+        ctx.record_stage('analyze', [ctx.reviews_path])
+
+    if ctx.strategy is not None:
+        export_strategy(ctx)
+
+    if ctx.manifest is not None:
+        ctx.pending_records['export'] = (input_hash, input_hash)
+        ctx.record_stage('export', ctx.saved_files[first_saved:])
+
+
+STAGE_RUNNERS = {
+    'crawl': run_crawl,
+    'analyze': run_analyze,
+    'trend': run_trend,
+    'strategy': run_strategy,
+    'export': run_export,
+}
+
+
+def run_pipeline(args):
+    """선택한 단계(또는 전체)를 실행하고 컨텍스트 반환"""
+    stages = (['crawl', 'analyze', 'trend', 'strategy', 'export'] if args.command == 'all'
+              else [args.command])
+    ctx = PipelineContext(args)
+    try:
+        for stage in stages:
+            print(f"\n{'=' * 20} {stage} {'=' * 20}")
+            STAGE_RUNNERS[stage](ctx)
+        if ctx.manifest is not None and ctx.manifest.save():
+            print(f"🗂️ 단계 기록 저장: {ctx.manifest.path}")
+    finally:
+        ctx.close()
+
+    if ctx.saved_files:
+        print("\n📁 저장된 파일:")
+        for path in ctx.saved_files:
+            print(f"  📄 {path}")
+    return ctx
+
+
+def build_parser():
+    from profiling import add_profile_arguments
+
+    parser = argparse.ArgumentParser(description='키즈카페 리뷰 분석 파이프라인')
+    parser.add_argument('command', choices=COMMANDS, help="실행할 단계")
+    parser.add_argument('--date', default=datetime.date.today().isoformat(),
+                        help="결과 파일 날짜 (기본: 오늘)")
+    parser.add_argument('--keywords', nargs='+', default=DEFAULT_KEYWORDS, help="검색 키워드")
+    parser.add_argument('--max-page', type=int, default=2, help="키워드당 검색 페이지 수")
+    parser.add_argument('--since', type=datetime.date.fromisoformat,
+                        help="수집할 글의 시작 날짜 (YYYY-MM-DD, 기본: 2024-01-01)")
+    parser.add_argument('--until', type=datetime.date.fromisoformat,
+                        help="수집할 글의 마지막 날짜 (YYYY-MM-DD, 기본: 제한 없음)")
+    parser.add_argument('--items-per-page', type=int, default=5,
+                        help="검색 페이지당 상세 페이지까지 처리할 글 수")
+    parser.add_argument('--prefetch', type=int, default=1,
+                        help="상세 처리 중에 미리 받아둘 검색 페이지 수 (0이면 순차)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="상세 페이지 파싱 프로세스 수 (0이면 요청/파싱을 순차 실행)")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="--workers 사용 시 동시에 진행할 상세 페이지 요청 수")
+    parser.add_argument('--budget', type=int,
+                        help="크롤링 요청 예산 (지정하면 스케줄러가 키워드별 페이지 수 배정)")
+    parser.add_argument('--stream', action='store_true', help="Gemini 스트리밍 생성 사용")
+    parser.add_argument('--gemini-retries', type=int, default=0,
+                        help="Gemini 일시 오류(429, 5xx, 시간 초과) 재시도 횟수 "
+                             "(회당 최대 60초 + 백오프만큼 지연 증가)")
+    parser.add_argument('--force', action='store_true',
+                        help="입력이 같아도 모든 단계를 다시 실행")
+    return add_profile_arguments(parser)
+
+
+def main():
+    args = build_parser().parse_args()
+
+    from profiling import profiler_from_args
+    with profiler_from_args(args, f"pipeline_{args.command}") or contextlib.nullcontext():
+        run_pipeline(args)
+
+    write_run_metrics(f"pipeline_{args.command}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+# profiling.py - 파이프라인 단계별 프로파일링 (cProfile / 샘플링 / tracemalloc)
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from metrics import METRICS
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+
+class _StageSampler(threading.Thread):
+    """단계를 실행 중인 모든 스레드의 스택을 주기적으로 샘플링해 그 스레드의 현재 단계로 집계하는 스레드"""
+
+    def __init__(self, profiler, interval):
+        super().__init__(daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            stages = self.profiler.current_stages()
+            if not stages:
+                continue
+            frames = sys._current_frames()
+            for thread_id, stage in stages.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                stack.reverse()
+                self.profiler.record_sample(stage, tuple(stack))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class PipelineProfiler:
+    """
+    METRICS.timer로 구분된 파이프라인 단계마다 따로 프로파일링합니다.
+
+    - cprofile: 결정적 프로파일 (단계별 .prof 파일, pstats/snakeviz로 열람)
+    - sample  : 스레드별 스택 샘플링 (오버헤드 낮음, 단계별 collapsed stack .txt)
+    - memory  : tracemalloc으로 단계별 순증가/최대 메모리 기록, 종료 시 스냅샷 저장
+
+    단계가 중첩되면 안쪽 단계 시간은 안쪽 단계에만 기록됩니다.
+    단계는 스레드마다 따로 추적하므로 검색 페이지 미리 받기 스레드 같은 보조 스레드의 단계도
+    프로파일에 들어갑니다 (여러 스레드에서 겹친 단계 시간은 스레드별 합계).
+    메모리는 전역 측정이라 메인 스레드의 단계만 기록합니다.
+
+    사용 예:
+        with PipelineProfiler('cprofile', run_name='crawl') as profiler:
+            crawl_naver_blog_multi(keywords)
+    """
+
+    def __init__(self, mode='cprofile', run_name='run', output_dir='data/profiles', top_n=20,
+                 memory=False, interval=0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"알 수 없는 프로파일 모드: {mode}")
+        self.mode = mode
+        self.run_name = run_name
+        self.output_dir = os.path.join(
+            output_dir, f"{run_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        )
+        self.top_n = top_n
+        self.memory = memory
+        self.interval = interval
+
+        self._stacks = {}      # 스레드 id -> [(단계, 시작 시각), ...]
+        self._profiles = {}    # (단계, 스레드 id) -> cProfile.Profile (cProfile은 켠 스레드만 측정)
+        self._samples = {}
+        self._wall = Counter()
+        self._memory_before = {}
+        self._memory_net = Counter()
+        self._memory_peak = Counter()
+        self._snapshot = None
+        self._sampler = None
+        self._samples_lock = threading.Lock()
+        self._main_thread_id = threading.main_thread().ident
+
+    # 단계 경계 (METRICS 리스너, 단계를 실행하는 스레드에서 호출됨)
+    def _enable_profile(self, stage, thread_id):
+        profile = self._profiles.setdefault((stage, thread_id), cProfile.Profile())
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+는 프로파일러를 프로세스 전체에서 하나만 켤 수 있음 - 겹친 단계는 생략
+            METRICS.inc('profile_stages_skipped', stage=stage)
+
+    def stage_started(self, stage):
+        thread_id = threading.get_ident()
+        stack = self._stacks.setdefault(thread_id, [])
+
+        if self.mode == 'cprofile':
+            if stack:
+                self._profiles[(stack[-1][0], thread_id)].disable()
+            self._enable_profile(stage, thread_id)
+
+        if self.memory and thread_id == self._main_thread_id:
+            # 전체 스냅샷은 비싸므로 단계 경계에서는 현재/최대 사용량만 기록
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self._memory_before.setdefault(stage, []).append(current)
+
+        stack.append((stage, time.perf_counter()))
+
+    def stage_finished(self, stage):
+        thread_id = threading.get_ident()
+        stack = self._stacks.get(thread_id)
+        if not stack:
+            return
+
+        # 이벤트 루프 스레드에서는 여러 코루틴의 단계가 섞여 끝나므로 같은 이름의 마지막 항목을 꺼냄
+        index = next((i for i in range(len(stack) - 1, -1, -1) if stack[i][0] == stage), None)
+        if index is None:
+            return
+        _, entered_at = stack.pop(index)
+        with self._samples_lock:
+            self._wall[stage] += time.perf_counter() - entered_at
+
+        if self.mode == 'cprofile':
+            self._profiles[(stage, thread_id)].disable()
+            if stack:
+                self._enable_profile(stack[-1][0], thread_id)
+
+        if self.memory and thread_id == self._main_thread_id:
+            before = self._memory_before[stage].pop()
+            current, peak = tracemalloc.get_traced_memory()
+            self._memory_net[stage] += current - before
+            self._memory_peak[stage] = max(self._memory_peak[stage], peak - before)
+
+    def current_stages(self):
+        """{스레드 id: 현재 단계} (단계 밖에 있는 스레드는 제외)"""
+        return {thread_id: stack[-1][0] for thread_id, stack in list(self._stacks.items()) if stack}
+
+    def record_sample(self, stage, stack):
+        with self._samples_lock:
+            self._samples.setdefault(stage, Counter())[stack] += 1
+
+    # 시작/종료
+    def start(self):
+        if self.memory:
+            tracemalloc.start(10)
+        if self.mode == 'sample':
+            self._sampler = _StageSampler(self, self.interval)
+            self._sampler.start()
+        METRICS.add_stage_listener(self)
+        return self
+
+    def stop(self):
+        METRICS.remove_stage_listener(self)
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+        for profile in self._profiles.values():
+            profile.disable()
+        if self.memory:
+            self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        return self.write_reports()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # 결과 저장
+    def _stage_stats(self, stage, stream=None):
+        """단계의 스레드별 프로파일을 합친 pstats.Stats (기록이 없으면 None)"""
+        profiles = [profile for (name, _), profile in self._profiles.items() if name == stage]
+        stats = None
+        for profile in profiles:
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile, stream=stream)
+            else:
+                stats.add(profile)
+        return stats
+
+    def _cprofile_hotspots(self, stats, stream):
+        stats.sort_stats('tottime').print_stats(self.top_n)
+        return stream.getvalue()
+
+    def _sample_hotspots(self, stage):
+        samples = self._samples.get(stage, Counter())
+        total = sum(samples.values())
+        self_counts = Counter()
+        inclusive_counts = Counter()
+        for stack, count in samples.items():
+            self_counts[stack[-1]] += count
+            for frame in set(stack):
+                inclusive_counts[frame] += count
+
+        lines = [f"샘플 {total}개 (간격 {self.interval * 1000:.1f} ms)", "", "[자체 시간 상위]"]
+        for frame, count in self_counts.most_common(self.top_n):
+            lines.append(f"{count / total * 100:6.1f}%  {count:6d}  {frame}")
+        lines += ["", "[포함 시간 상위]"]
+        for frame, count in inclusive_counts.most_common(self.top_n):
+            lines.append(f"{count / total * 100:6.1f}%  {count:6d}  {frame}")
+        return '\n'.join(lines) + '\n'
+
+    def write_reports(self):
+        """단계별 프로파일 파일과 상위 N개 병목 요약 저장"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        saved_files = []
+        summary = [f"# {self.run_name} 프로파일 요약 ({self.mode})", ""]
+
+        for stage, wall in self._wall.most_common():
+            summary.append(f"## {stage} - {wall:.3f}초")
+
+            stream = io.StringIO()
+            stats = self._stage_stats(stage, stream) if self.mode == 'cprofile' else None
+            if stats is not None:
+                path = os.path.join(self.output_dir, f"{stage}.prof")
+                stats.dump_stats(path)
+                saved_files.append(path)
+                summary.append(self._cprofile_hotspots(stats, stream))
+
+            if self.mode == 'sample' and stage in self._samples:
+                path = os.path.join(self.output_dir, f"{stage}.collapsed.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    for stack, count in self._samples[stage].most_common():
+                        f.write(f"{';'.join(stack)} {count}\n")
+                saved_files.append(path)
+                summary.append(self._sample_hotspots(stage))
+
+            if self.memory and stage in self._memory_peak:
+                summary.append(f"[메모리] 순증가 {self._memory_net[stage] / 1024:.1f} KiB, "
+                               f"단계 내 최대 {self._memory_peak[stage] / 1024:.1f} KiB")
+                summary.append("")
+
+        if self._snapshot is not None:
+            path = os.path.join(self.output_dir, 'memory.snapshot')
+            self._snapshot.dump(path)
+            saved_files.append(path)
+            summary.append("## 종료 시점 메모리 할당 상위 (tracemalloc)")
+            for stat in self._snapshot.statistics('lineno')[:self.top_n]:
+                summary.append(f"{stat.size / 1024:10.1f} KiB  {stat.count:8d}개  {stat.traceback}")
+            summary.append("")
+
+        summary_path = os.path.join(self.output_dir, 'summary.txt')
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(summary))
+        saved_files.append(summary_path)
+
+        print(f"\n🔬 프로파일 저장: {self.output_dir}")
+        for stage, wall in self._wall.most_common(5):
+            print(f"  {stage:<16} {wall:.3f}초")
+        return saved_files
+
+
+def add_profile_arguments(parser):
+    """진입점 argparse에 프로파일링 옵션 추가"""
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES,
+                        help="단계별 프로파일링 (cprofile: 결정적, sample: 샘플링)")
+    parser.add_argument('--profile-dir', default='data/profiles', help="프로파일 저장 디렉토리")
+    parser.add_argument('--profile-top', type=int, default=20, help="요약할 상위 병목 개수")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="tracemalloc으로 단계별 메모리 할당도 기록")
+    parser.add_argument('--profile-interval', type=float, default=0.005,
+                        help="샘플링 간격 (초)")
+    return parser
+
+
+def profiler_from_args(args, run_name):
+    """--profile 옵션이 있으면 PipelineProfiler, 없으면 None"""
+    if not args.profile and not args.profile_memory:
+        return None
+    return PipelineProfiler(
+        mode=args.profile or 'cprofile', run_name=run_name, output_dir=args.profile_dir,
+        top_n=args.profile_top, memory=args.profile_memory, interval=args.profile_interval
+    )
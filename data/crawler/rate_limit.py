@@ -0,0 +1,35 @@
+# rate_limit.py - asyncio용 분당 요청 수 제한 (Gemini 일괄 생성과 크롤러 실행기가 함께 사용)
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    분당 요청 수 제한 (토큰 버킷)
+
+    burst 개수만큼은 바로 보내고, 이후에는 분당 requests_per_minute 속도로 토큰이 채워집니다.
+    """
+
+    def __init__(self, requests_per_minute=60, burst=1):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated_at) / self.interval)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) * self.interval)
@@ -0,0 +1,74 @@
+# records.py - 리뷰 레코드의 작은 메모리 표현 (__slots__ 레코드)
+
+# 크롤러가 만드는 필드와 감정 분석이 덧붙이는 필드 (JSON 저장 순서)
+BASE_FIELDS = ('title', 'link', 'date', 'content')
+ANALYSIS_FIELDS = ('sentiment', 'sentiment_confidence', 'sentiment_reasoning',
+                   'positive_keywords', 'negative_keywords')
+FIELDS = BASE_FIELDS + ANALYSIS_FIELDS
+
+# from_dict로 읽은 키 순서 (같은 순서는 튜플 하나를 공유)
+_KEY_ORDERS = {}
+
+
+class Review:
+    """
+    리뷰 한 건 (dict 대신 __slots__로 필드를 고정해 메모리 절약)
+
+    JSON의 알 수 없는 필드는 extra에 보관하고, from_dict로 읽은 리뷰는 원래 키 순서와
+    있던 필드(값이 None이어도)를 기억해 to_dict()에서 그대로 되돌립니다.
+    """
+
+    __slots__ = FIELDS + ('extra', '_keys')
+
+    def __init__(self, title=None, link=None, date=None, content=None, sentiment=None,
+                 sentiment_confidence=None, sentiment_reasoning=None, positive_keywords=None,
+                 negative_keywords=None, extra=None):
+        self.title = title
+        self.link = link
+        self.date = date
+        self.content = content
+        self.sentiment = sentiment
+        self.sentiment_confidence = sentiment_confidence
+        self.sentiment_reasoning = sentiment_reasoning
+        self.positive_keywords = positive_keywords
+        self.negative_keywords = negative_keywords
+        self.extra = extra
+        self._keys = BASE_FIELDS
+
+    @classmethod
+    def from_dict(cls, data):
+        extra = {k: v for k, v in data.items() if k not in FIELDS} or None
+        review = cls(*(data.get(field) for field in FIELDS), extra=extra)
+        keys = tuple(data)
+        review._keys = _KEY_ORDERS.setdefault(keys, keys)
+        return review
+
+    @property
+    def analyzed(self):
+        return self.sentiment is not None
+
+    def to_dict(self):
+        """
+        JSON 저장용 dict
+
+        원래 있던 키는 순서 그대로 (None 값 포함), 그 밖의 필드는 값이 있을 때만 덧붙입니다.
+        분석 필드도 하나씩 따로 판단하므로 감정 없이 키워드만 있는 리뷰도 키워드가 남습니다.
+        """
+        extra = self.extra or {}
+        data = {}
+        for key in self._keys:
+            if key in FIELDS:
+                data[key] = getattr(self, key)
+            elif key in extra:
+                data[key] = extra[key]
+        for field in FIELDS:
+            if field not in data:
+                value = getattr(self, field)
+                if value is not None:
+                    data[field] = value
+        for key, value in extra.items():
+            data.setdefault(key, value)
+        return data
+
+    def __repr__(self):
+        return f"Review(title={self.title!r}, date={self.date!r}, sentiment={self.sentiment!r})"
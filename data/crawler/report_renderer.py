@@ -0,0 +1,406 @@
+# report_renderer.py - 지점별 마케팅 보고서를 미리 컴파일한 템플릿으로 렌더링 (마크다운/JSON)
+import functools
+import json
+from datetime import datetime
+from string import Template
+
+from trend import format_trend_lines
+
+DEFAULT_BRANCH = "우리끼리 키즈카페 대전문화점"
+DEFAULT_REGION = "대전 서구 문화점"
+
+FORMATS = ('markdown', 'json')
+
+# 부정 키워드별 개선 항목 (키워드 목록, 항목 이름, 조치)
+IMPROVEMENT_RULES = (
+    (('더럽', '청소', '냄새'), '청결 관리', '관련 불만 해결을 위한 청소 횟수 증가'),
+    (('불친절', '직원'), '서비스 교육', '관련 직원 교육 프로그램 강화'),
+    (('비싸', '가격'), '가격 정책', '관련 합리적 요금제 검토'),
+)
+
+
+# 기본 전략 보고서 (지점 정보는 지점별로 한 번만 채우고, 나머지는 보고서마다 채움)
+BASIC_HEADER = Template("""# 📊 $branch_name 마케팅 전략 보고서
+
+**생성일**: $generated_date
+**분석 기간**: 2025년 6월 이후 작성된 리뷰
+**총 리뷰 수**: ${total_reviews}개
+**분석 방식**: 기본 규칙 기반 분석
+
+## 🎯 리뷰 감정 분석 결과
+
+### 전체 감정 분포
+- **긍정적 리뷰**: ${positive_count}개 (${positive_ratio}%)
+- **부정적 리뷰**: ${negative_count}개 (${negative_ratio}%)
+- **중립적 리뷰**: ${neutral_count}개 (${neutral_ratio}%)
+
+### 고객 만족도 지표
+**고객 만족도**: $satisfaction_emoji $satisfaction_level (${positive_ratio}%)
+
+""")
+
+POSITIVE_HEADING = "### 🔥 고객들이 가장 좋아하는 점\n"
+NEGATIVE_HEADING = "### ⚠️ 개선이 필요한 점\n"
+TREND_HEADING = "### 📈 최근 추이 및 이상 징후\n"
+
+STRATEGY_INTRO = """## 🚀 마케팅 전략 제안
+
+### 1. 즉시 실행 가능한 전략
+"""
+
+STRENGTH_STRATEGY = """
+#### 🎯 강점 극대화 전략
+- **긍정 리뷰 활용**: 고객 후기를 SNS 및 매장 내 적극 게시
+- **입소문 마케팅**: 만족한 고객들의 추천 이벤트 진행
+- **리뷰 인센티브**: 네이버/구글 리뷰 작성 고객 대상 할인 혜택
+"""
+
+IMPROVEMENT_STRATEGY = """
+#### 🔧 개선 우선 전략
+- **즉시 개선**: 부정적 피드백 사항 우선 해결
+- **고객 소통**: 불만 고객 직접 연락하여 관계 회복
+- **서비스 교육**: 직원 친절 서비스 교육 강화
+"""
+
+BRANCH_PLAYBOOK = Template("""
+### 2. 콘텐츠 마케팅 전략
+
+#### 📱 SNS 활용 방안
+- **인스타그램**: 아이들 놀이 모습 릴스 제작
+- **네이버 블로그**: 키즈카페 이용 팁 포스팅
+- **유튜브**: 시설 투어 및 놀이 가이드 영상
+
+#### 🏷️ 해시태그 전략
+- #$branch_tag
+- #${city}키즈카페
+- #무인키즈카페
+- #아이와함께$city
+
+### 3. 고객 관리 전략
+
+#### 🎁 프로모션 아이디어
+- **신규 고객**: 첫 방문 할인 쿠폰
+- **단골 고객**: VIP 멤버십 프로그램
+- **생일 이벤트**: 아이 생일 기념 무료 이용권
+- **리뷰 이벤트**: 포토 리뷰 작성시 다음 방문 할인
+
+#### 📊 고객 피드백 시스템
+- **정기 설문**: 월 1회 고객 만족도 조사
+- **즉시 대응**: 부정적 리뷰 24시간 내 답변
+- **개선 공지**: 고객 건의사항 반영 결과 공유
+
+### 4. 시설 및 서비스 개선 방안
+""")
+
+IMPROVEMENT_HEADING = "\n#### 🔧 우선 개선 항목\n"
+
+BASIC_FOOTER = """
+### 5. 성과 측정 및 모니터링
+
+#### 📈 KPI 지표
+- **리뷰 평점**: 월평균 4.0점 이상 목표
+- **긍정 리뷰 비율**: 70% 이상 유지
+- **신규 고객 비율**: 월 20% 이상
+- **재방문율**: 60% 이상
+
+#### 🔍 모니터링 계획
+- **일간**: 새로운 리뷰 확인 및 대응
+- **주간**: 고객 만족도 트렌드 분석
+- **월간**: 마케팅 성과 평가 및 전략 수정
+
+---
+
+> ⚠️ **참고**: 이 전략은 기본 분석으로 생성되었습니다.
+> 더 정교한 AI 전략을 원하시면 Gemini API 키를 설정해주세요.
+"""
+
+# Gemini 생성 전략의 머리말/꼬리말과 API 실패시 대체 전략
+AI_HEADER = Template("""# 🤖 AI 생성 마케팅 전략 보고서
+
+**생성일**: $generated_date
+**분석 대상**: $branch_name
+**생성 모델**: Google $model_name
+
+---
+
+""")
+
+AI_FOOTER = Template("""
+
+---
+
+> 💡 **AI 생성 전략**: 이 전략은 Google ${model_name}가 실제 고객 리뷰를 분석하여 생성한 맞춤형 마케팅 전략입니다.
+""")
+
+AI_INTERRUPTED_NOTE = """
+> ⚠️ **참고**: 응답 수신이 중간에 끊겨 일부 내용만 저장되었습니다.
+"""
+
+FALLBACK_REPORT = Template("""# 📊 키즈카페 마케팅 전략 보고서 (기본 분석)
+
+**생성일**: $generated_date
+**총 리뷰 수**: ${total_reviews}개
+
+## 현재 상황
+- 긍정 리뷰 비율: ${positive_ratio}%
+- 부정 리뷰 비율: ${negative_ratio}%
+
+## 기본 전략 제안
+1. 고객 만족도 향상을 위한 서비스 개선
+2. 긍정적 후기 확산을 위한 SNS 마케팅
+3. 정기적인 고객 피드백 수집 및 대응
+
+⚠️ **주의**: Gemini API 연결 실패로 기본 전략이 제공되었습니다.
+API 키를 확인하고 다시 시도해주세요.
+""")
+
+def _escape_template_value(value):
+    """이미 채운 값이 다음 substitute에서 자리표시자로 읽히지 않도록 $ 이스케이프"""
+    return str(value).replace('$', '$$')
+
+
+class _BranchTemplates:
+    """지점 정보만 먼저 채워 둔 템플릿 묶음 (지점마다 한 번 생성)"""
+
+    __slots__ = ('branch_name', 'region', 'basic_header', 'playbook', 'ai_header')
+
+    def __init__(self, branch_name, region):
+        self.branch_name = branch_name
+        self.region = region
+
+        words = branch_name.split()
+        city = region.split()[0] if region else ''
+        branch_tag = ''.join(word for word in words if word != '키즈카페')
+
+        name = _escape_template_value(branch_name)
+        self.basic_header = Template(BASIC_HEADER.safe_substitute(branch_name=name))
+        self.playbook = BRANCH_PLAYBOOK.substitute(branch_tag=branch_tag, city=city)
+        self.ai_header = Template(AI_HEADER.safe_substitute(branch_name=name))
+
+
+@functools.lru_cache(maxsize=1024)
+def branch_templates(branch_name=DEFAULT_BRANCH, region=DEFAULT_REGION):
+    return _BranchTemplates(branch_name, region)
+
+
+def _satisfaction(positive_ratio):
+    if positive_ratio >= 70:
+        return "매우 높음", "🟢"
+    if positive_ratio >= 50:
+        return "양호", "🟡"
+    return "개선 필요", "🔴"
+
+
+def _improvement_item(keyword):
+    for keywords, label, action in IMPROVEMENT_RULES:
+        if keyword in keywords:
+            return label, f"{keyword} {action}"
+    return f"{keyword} 개선", "고객 불만 사항 즉시 해결"
+
+
+class RenderedReport:
+    """
+    렌더링 결과 - 형식별 결과와, 여러 파일에 쓸 때 재사용하는 UTF-8 인코딩 결과
+
+    마크다운은 문자열, JSON은 dict로 두고 (다른 JSON에 그대로 넣을 수 있도록) 파일에 쓸 때만 직렬화합니다.
+    """
+
+    __slots__ = ('branch_name', 'outputs', '_encoded')
+
+    def __init__(self, branch_name, outputs):
+        self.branch_name = branch_name
+        self.outputs = outputs
+        self._encoded = {}
+
+    @classmethod
+    def from_markdown(cls, branch_name, text):
+        """이미 만들어진 마크다운(Gemini 전략, 저장된 전략 등)을 보고서로 감싸기"""
+        return cls(branch_name, {'markdown': text})
+
+    def __getitem__(self, fmt):
+        return self.outputs[fmt]
+
+    @property
+    def markdown(self):
+        return self.outputs.get('markdown')
+
+    def encoded(self, fmt='markdown'):
+        """형식별 UTF-8 바이트 (처음 한 번만 인코딩)"""
+        data = self._encoded.get(fmt)
+        if data is None:
+            value = self.outputs[fmt]
+            if not isinstance(value, str):
+                value = json.dumps(value, ensure_ascii=False, indent=2)
+            data = self._encoded[fmt] = value.encode('utf-8')
+        return data
+
+
+class ReportRenderer:
+    """
+    요약 통계 하나로 마크다운과 JSON 보고서를 한 번에 렌더링하는 보고서 렌더러
+
+    - 템플릿은 모듈을 불러올 때 한 번 컴파일하고, 지점 이름/지역이 들어가는 부분은
+      지점마다 한 번만 채워 둡니다 (branch_templates).
+    - 만족도, 개선 항목, 추이 문장 같은 파생 값은 보고서마다 한 번 계산해 모든 형식이 함께 씁니다.
+    - 문자열은 조각 목록을 모아 마지막에 한 번 이어 붙입니다.
+
+    사용 예:
+        renderer = ReportRenderer()
+        report = renderer.render(get_sentiment_summary(reviews), trend=snapshot)
+        report['markdown'], report['json']   # JSON은 dict, report.encoded('json')은 파일용 바이트
+
+        reports = render_batch([(branch, summary), ...])   # 여러 지점 일괄 렌더링
+    """
+
+    def __init__(self, branch_name=DEFAULT_BRANCH, region=DEFAULT_REGION):
+        self.branch_name = branch_name
+        self.region = region
+        self.templates = branch_templates(branch_name, region)
+
+    def _view(self, summary, trend, generated_at):
+        """형식 공통 값 (보고서마다 한 번 계산)"""
+        level, emoji = _satisfaction(summary['positive_ratio'])
+        negatives = summary['top_negative_keywords']
+        return {
+            'fields': {
+                'generated_date': generated_at.strftime('%Y년 %m월 %d일'),
+                'total_reviews': summary['total_reviews'],
+                'positive_count': summary['positive_count'],
+                'negative_count': summary['negative_count'],
+                'neutral_count': summary['neutral_count'],
+                'positive_ratio': summary['positive_ratio'],
+                'negative_ratio': summary['negative_ratio'],
+                'neutral_ratio': summary['neutral_ratio'],
+                'satisfaction_level': level,
+                'satisfaction_emoji': emoji,
+            },
+            'generated_at': generated_at,
+            'strategy_type': ('strength' if summary['positive_ratio'] > summary['negative_ratio']
+                              else 'improvement'),
+            'positives': summary['top_positive_keywords'],
+            'negatives': negatives,
+            'improvements': [_improvement_item(keyword) for keyword, _ in negatives[:3]],
+            'trend': trend,
+            'trend_lines': format_trend_lines(trend),
+        }
+
+    # 형식별 렌더링
+    def _markdown(self, view):
+        parts = [self.templates.basic_header.substitute(view['fields'])]
+
+        if view['positives']:
+            parts.append(POSITIVE_HEADING)
+            parts.extend(f"- **{keyword}**: {count}회 언급\n" for keyword, count in view['positives'])
+            parts.append("\n")
+        if view['negatives']:
+            parts.append(NEGATIVE_HEADING)
+            parts.extend(f"- **{keyword}**: {count}회 언급\n" for keyword, count in view['negatives'])
+            parts.append("\n")
+        if view['trend_lines']:
+            parts.append(TREND_HEADING)
+            parts.append("\n".join(view['trend_lines']) + "\n\n")
+
+        parts.append(STRATEGY_INTRO)
+        parts.append(STRENGTH_STRATEGY if view['strategy_type'] == 'strength' else IMPROVEMENT_STRATEGY)
+        parts.append(self.templates.playbook)
+        if view['improvements']:
+            parts.append(IMPROVEMENT_HEADING)
+            parts.extend(f"- **{label}**: {action}\n" for label, action in view['improvements'])
+        parts.append(BASIC_FOOTER)
+        return ''.join(parts)
+
+    def _json(self, view):
+        fields = view['fields']
+        report = {
+            'branch': self.branch_name,
+            'region': self.region,
+            'generated_at': view['generated_at'].isoformat(),
+            'summary': {key: fields[key] for key in (
+                'total_reviews', 'positive_count', 'negative_count', 'neutral_count',
+                'positive_ratio', 'negative_ratio', 'neutral_ratio'
+            )},
+            'satisfaction': {'level': fields['satisfaction_level'], 'emoji': fields['satisfaction_emoji']},
+            'top_positive_keywords': view['positives'],
+            'top_negative_keywords': view['negatives'],
+            'strategy_type': view['strategy_type'],
+            'improvements': [{'area': label, 'action': action} for label, action in view['improvements']],
+            'trend': view['trend'],
+        }
+        return report
+
+    _RENDERERS = {'markdown': _markdown, 'json': _json}
+
+    def render(self, summary, trend=None, generated_at=None, formats=FORMATS):
+        """
+        요약 통계(get_sentiment_summary 형식)로 보고서 렌더링
+
+        Returns:
+            RenderedReport: report['markdown'] (문자열) / report['json'] (dict)
+        """
+        view = self._view(summary, trend, generated_at or datetime.now())
+        return RenderedReport(self.branch_name, {
+            fmt: self._RENDERERS[fmt](self, view) for fmt in formats
+        })
+
+    # Gemini 전략 포맷
+    def ai_report(self, generated_text, model_name, interrupted=False, generated_at=None):
+        """Gemini 생성 전략에 머리말/꼬리말 붙이기"""
+        return ''.join((self.ai_header(model_name, generated_at), generated_text,
+                        self.ai_footer(model_name, interrupted)))
+
+    def ai_header(self, model_name, generated_at=None):
+        generated_at = generated_at or datetime.now()
+        return self.templates.ai_header.substitute(
+            generated_date=generated_at.strftime('%Y년 %m월 %d일'), model_name=model_name
+        )
+
+    @staticmethod
+    def ai_footer(model_name, interrupted=False):
+        footer = AI_FOOTER.substitute(model_name=model_name)
+        return footer + AI_INTERRUPTED_NOTE if interrupted else footer
+
+    @staticmethod
+    def fallback_report(summary, generated_at=None):
+        """API 실패시 간단한 기본 전략"""
+        generated_at = generated_at or datetime.now()
+        return FALLBACK_REPORT.substitute(
+            generated_date=generated_at.strftime('%Y년 %m월 %d일'),
+            total_reviews=summary['total_reviews'],
+            positive_ratio=summary['positive_ratio'],
+            negative_ratio=summary['negative_ratio']
+        )
+
+
+def render_batch(items, trend=None, generated_at=None, formats=FORMATS):
+    """
+    여러 지점 보고서 일괄 렌더링 (생성 시각은 한 번만 정하고 지점별 템플릿은 재사용)
+
+    Args:
+        items: [(지점 이름, 요약 통계), ...] 또는 [{'branch', 'summary', 'region', 'trend'}, ...]
+
+    Yields:
+        RenderedReport: items 순서대로
+    """
+    generated_at = generated_at or datetime.now()
+    renderers = {}
+    for item in items:
+        if isinstance(item, dict):
+            branch, summary = item['branch'], item['summary']
+            region, item_trend = item.get('region', DEFAULT_REGION), item.get('trend', trend)
+        else:
+            (branch, summary), region, item_trend = item, DEFAULT_REGION, trend
+
+        renderer = renderers.get((branch, region))
+        if renderer is None:
+            renderer = renderers[(branch, region)] = ReportRenderer(branch, region)
+        yield renderer.render(summary, item_trend, generated_at, formats)
+
+
+def write_encoded(data, paths):
+    """같은 내용을 여러 파일에 저장 (인코딩은 한 번만, 바이트 그대로 기록)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    for path in paths:
+        with open(path, 'wb') as f:
+            f.write(data)
+    return list(paths)
@@ -0,0 +1,103 @@
+# response_cache.py - Gemini 응답 캐시 모듈
+import hashlib
+import json
+import os
+import time
+
+
+class ResponseCache:
+    """
+    프롬프트 기반 Gemini 응답 캐시
+
+    모델 + generationConfig + 프롬프트의 해시를 키로 생성된 텍스트를 JSON 파일에 저장합니다.
+    항목마다 TTL이 있고, 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, path='data/cache/gemini_responses.json',
+                 ttl_seconds=7 * 24 * 3600, max_entries=200):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = None
+
+    @staticmethod
+    def make_key(model, generation_config, prompt):
+        """모델, 생성 설정, 프롬프트로 캐시 키 생성"""
+        payload = json.dumps(
+            {'model': model, 'generationConfig': generation_config, 'prompt': prompt},
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ 응답 캐시 로드 실패, 새로 시작합니다: {e}")
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 중간에 실패해도 기존 캐시가 깨지지 않도록 임시 파일에 쓰고 교체
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _is_expired(self, entry, now):
+        return now - entry.get('created_at', 0) > self.ttl_seconds
+
+    def get(self, key):
+        """
+        캐시된 텍스트 반환 (없거나 만료되었으면 None)
+
+        조회는 파일을 다시 쓰지 않습니다. 사용 시각/적중 수와 만료 항목 삭제는 메모리에만 반영되고
+        다음 put() 때 함께 저장됩니다 (변화 없는 실행이 캐시 파일을 바꾸지 않도록).
+        """
+        entries = self._load()
+        entry = entries.get(key)
+        if entry is None:
+            return None
+
+        now = time.time()
+        if self._is_expired(entry, now):
+            del entries[key]
+            return None
+
+        entry['last_used_at'] = now
+        entry['hits'] = entry.get('hits', 0) + 1
+        return entry['text']
+
+    def put(self, key, text, model=None):
+        """생성된 텍스트를 캐시에 저장"""
+        entries = self._load()
+        now = time.time()
+        entries[key] = {
+            'text': text,
+            'model': model,
+            'created_at': now,
+            'last_used_at': now,
+            'hits': 0
+        }
+        self._evict(now)
+        self._save()
+
+    def _evict(self, now):
+        entries = self._entries
+
+        for key in [k for k, e in entries.items() if self._is_expired(e, now)]:
+            del entries[key]
+
+        if len(entries) > self.max_entries:
+            by_last_use = sorted(entries, key=lambda k: entries[k].get('last_used_at', 0))
+            for key in by_last_use[:len(entries) - self.max_entries]:
+                del entries[key]
@@ -0,0 +1,204 @@
+# review_selector.py - 프롬프트용 대표 리뷰 선택 모듈
+import math
+import re
+from collections import Counter
+
+# 리뷰 1개당 프롬프트에 들어가는 최대 길이
+TITLE_CHARS = 100
+CONTENT_CHARS = 200
+
+# 리뷰 항목 하나의 고정 오버헤드 (번호, 감정 태그, 따옴표 등)
+ENTRY_OVERHEAD_TOKENS = 12
+
+_HANGUL_RE = re.compile(r'[가-힣]')
+_WORD_RE = re.compile(r'[가-힣A-Za-z]{2,}')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 대략적인 토큰 수를 추정합니다.
+
+    Gemini 토크나이저 기준으로 한글은 글자당 약 1토큰,
+    그 외 문자는 약 4글자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL_RE.findall(text))
+    other = len(text) - hangul
+    return hangul + math.ceil(other / 4)
+
+
+def review_vector(review: dict) -> Counter:
+    """
+    리뷰를 키워드 벡터로 변환합니다.
+
+    감정 분석 키워드가 있으면 그것을 사용하고, 없으면 본문 단어를 사용합니다.
+    감정 자체도 하나의 차원으로 포함해 같은 감정끼리 묶이도록 합니다.
+    """
+    vector = Counter()
+    keywords = (review.get('positive_keywords') or []) + (review.get('negative_keywords') or [])
+    if keywords:
+        vector.update(keywords)
+    else:
+        text = f"{review.get('title') or ''} {review.get('content') or ''}"
+        vector.update(_WORD_RE.findall(text[:TITLE_CHARS + CONTENT_CHARS]))
+
+    vector[f"__sentiment:{review.get('sentiment', 'neutral')}"] += 2
+    return vector
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(value * b.get(key, 0) for key, value in a.items())
+    if not dot:
+        return 0.0
+    norm_a = math.sqrt(sum(v * v for v in a.values()))
+    norm_b = math.sqrt(sum(v * v for v in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def _centroid(vectors: list) -> Counter:
+    centroid = Counter()
+    for vector in vectors:
+        centroid.update(vector)
+    return centroid
+
+
+def cluster_reviews(vectors: list, max_clusters: int = 4, iterations: int = 5) -> list:
+    """
+    키워드 벡터를 코사인 유사도 기준으로 군집화합니다.
+
+    가장 먼 점부터 중심을 고르는 방식으로 초기화하므로 결과가 항상 같습니다.
+
+    Returns:
+        list: 군집별 리뷰 인덱스 리스트 (큰 군집부터)
+    """
+    if not vectors:
+        return []
+
+    k = min(max_clusters, len(vectors))
+
+    # 초기 중심: 첫 리뷰에서 시작해 기존 중심과 가장 덜 닮은 리뷰를 차례로 선택
+    centers = [vectors[0]]
+    while len(centers) < k:
+        farthest = min(
+            range(len(vectors)),
+            key=lambda i: max(_cosine(vectors[i], c) for c in centers)
+        )
+        if any(vectors[farthest] is c for c in centers):
+            break
+        centers.append(vectors[farthest])
+
+    assignment = None
+    for _ in range(iterations):
+        new_assignment = [
+            max(range(len(centers)), key=lambda c: _cosine(vector, centers[c]))
+            for vector in vectors
+        ]
+        if new_assignment == assignment:
+            break
+        assignment = new_assignment
+
+        members = [[] for _ in centers]
+        for index, cluster in enumerate(assignment):
+            members[cluster].append(vectors[index])
+        centers = [_centroid(m) if m else centers[c] for c, m in enumerate(members)]
+
+    clusters = [[] for _ in centers]
+    for index, cluster in enumerate(assignment):
+        clusters[cluster].append(index)
+
+    clusters = [c for c in clusters if c]
+    clusters.sort(key=len, reverse=True)
+    return clusters
+
+
+def _review_entry(review: dict, role: str, cluster_size: int) -> dict:
+    return {
+        'title': (review.get('title') or '')[:TITLE_CHARS],
+        'content': (review.get('content') or '')[:CONTENT_CHARS],
+        'sentiment': review.get('sentiment') or 'neutral',
+        'date': review.get('date') or '',
+        'role': role,
+        'cluster_size': cluster_size
+    }
+
+
+def entry_tokens(entry: dict) -> int:
+    """프롬프트에 들어갈 리뷰 항목 하나의 토큰 수 추정"""
+    return (ENTRY_OVERHEAD_TOKENS
+            + estimate_tokens(entry['title'])
+            + estimate_tokens(entry['content']))
+
+
+def select_representative_reviews(reviews: list, token_budget: int = 1200,
+                                  max_clusters: int = 4) -> list:
+    """
+    토큰 예산 안에서 대표 리뷰와 이질적인 리뷰를 선택합니다.
+
+    1. 리뷰를 키워드 벡터로 군집화합니다.
+    2. 큰 군집부터 중심에 가장 가까운 리뷰(대표 리뷰)를 고릅니다.
+    3. 이미 고른 리뷰들과 가장 덜 닮은 리뷰(이질 리뷰)를 고릅니다.
+    4. 예산이 바닥날 때까지 대표/이질 리뷰를 번갈아 추가합니다.
+
+    Args:
+        reviews: [{'title': str, 'content': str, 'sentiment': str, ...}, ...]
+        token_budget: 선택된 리뷰 항목 전체에 허용되는 토큰 수
+        max_clusters: 최대 군집 수
+
+    Returns:
+        list: [{'title', 'content', 'sentiment', 'date', 'role', 'cluster_size'}, ...]
+    """
+    if not reviews or token_budget <= 0:
+        return []
+
+    vectors = [review_vector(r) for r in reviews]
+    clusters = cluster_reviews(vectors, max_clusters=max_clusters)
+
+    # 군집별 대표 리뷰 (군집 중심과 가장 가까운 리뷰)
+    representatives = []
+    cluster_of = {}
+    for cluster in clusters:
+        centroid = _centroid(vectors[i] for i in cluster)
+        medoid = max(cluster, key=lambda i: _cosine(vectors[i], centroid))
+        representatives.append(medoid)
+        for i in cluster:
+            cluster_of[i] = len(cluster)
+
+    selected = []
+    chosen = set()
+    used_tokens = 0
+
+    def try_add(index, role):
+        nonlocal used_tokens
+        entry = _review_entry(reviews[index], role, cluster_of.get(index, 1))
+        cost = entry_tokens(entry)
+        if used_tokens + cost > token_budget:
+            return False
+        selected.append(entry)
+        chosen.add(index)
+        used_tokens += cost
+        return True
+
+    pending = list(representatives)
+    while pending or len(chosen) < len(reviews):
+        added = False
+
+        if pending:
+            added = try_add(pending.pop(0), 'representative') or added
+
+        remaining = [i for i in range(len(reviews)) if i not in chosen and i not in pending]
+        if remaining and chosen:
+            divergent = min(
+                remaining,
+                key=lambda i: max(_cosine(vectors[i], vectors[j]) for j in chosen)
+            )
+            added = try_add(divergent, 'divergent') or added
+
+        if not added and not pending:
+            break
+
+    return selected
@@ -0,0 +1,358 @@
+# scheduler.py - 요청 예산 안에서 새 글이 나올 가능성이 높은 곳부터 크롤링하는 스케줄러
+import datetime
+import functools
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+
+from metrics import METRICS
+from naver_dates import in_window
+
+DAY_SECONDS = 24 * 3600
+
+
+def _locked(method):
+    """스케줄러 상태를 읽고 바꾸는 메서드를 잠금 안에서 실행 (미리 받기 스레드와 공유)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class BudgetExhausted(Exception):
+    """요청 예산이 없어 요청하지 않음 (받기 실패와 달리 거절한 글로 기록하지 않음)"""
+
+
+def _content_hash(review):
+    text = f"{review.get('title', '')}\n{review.get('date', '')}\n{review.get('content', '')}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class CrawlScheduler:
+    """
+    키워드/게시물 통계를 바탕으로 정해진 요청 수(budget)를 나눠 쓰는 크롤링 스케줄러
+
+    - 키워드: 하루당 새 글 수를 EWMA로 추적해, 마지막 크롤링 이후 쌓였을 것으로 보이는
+      새 글이 많은 키워드에 더 많은(깊은) 검색 페이지를 배정합니다.
+      조용한 키워드도 max_idle_days가 지나면 최소 1페이지는 확인합니다.
+    - 게시물: 이미 수집한 글은 상세 페이지를 다시 받지 않고 저장된 내용을 재사용하고,
+      수정 여부 재확인은 1일, 2일, 4일... 처럼 변화가 없을수록 간격을 늘립니다.
+      재확인은 예산의 recheck_share 비율까지만 사용합니다.
+    - 거절한 글: 수집 기간 밖이었던 글은 기간이 바뀌어 들어오기 전까지, 받기/파싱에 실패한 글은
+      1일, 2일, 4일... 뒤 재시도 시점까지 상세 페이지를 다시 받지 않습니다.
+
+    상태는 JSON 파일(data/cache/crawl_schedule.json)에 저장됩니다. 매 실행 바뀌므로 저장소에는
+    커밋하지 않고, CI에서는 actions/cache로 다음 실행에 넘깁니다.
+
+    사용 예:
+        scheduler = CrawlScheduler(budget=24)
+        reviews = crawl_naver_blog_multi(keywords, scheduler=scheduler)
+        scheduler.save()
+    """
+
+    def __init__(self, path='data/cache/crawl_schedule.json', budget=24, items_per_page=5,
+                 max_page=5, alpha=0.3, depth_decay=0.5, max_idle_days=7,
+                 recheck_days=1.0, max_recheck_days=32.0, recheck_share=0.25, forget_days=90,
+                 detail_requests=2, now=None):
+        self.path = path
+        self.budget = budget
+        self.items_per_page = items_per_page
+        self.max_page = max_page
+        self.alpha = alpha
+        self.depth_decay = depth_decay
+        self.max_idle_days = max_idle_days
+        self.recheck_days = recheck_days
+        self.max_recheck_days = max_recheck_days
+        self.recheck_budget = int(budget * recheck_share)
+        self.forget_days = forget_days
+        # 글 하나에 드는 요청 수 (블로그 껍데기 페이지 + mainFrame iframe 본문)
+        self.detail_requests = detail_requests
+        self.now = now or time.time()
+
+        self.remaining = budget
+        self.rechecks = 0
+        # 검색 페이지 미리 받기 스레드와 예산/상태를 나눠 쓰므로 공개 메서드는 모두 잠금 안에서 실행
+        self._lock = threading.RLock()
+        self._saved_text = None
+        self._state = self._load()
+        self._run_stats = {}
+
+    # 상태 저장/불러오기
+    def _load(self):
+        state = {'keywords': {}, 'posts': {}, 'rejected': {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._saved_text = f.read()
+                state.update(json.loads(self._saved_text))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ 스케줄 상태 로드 실패, 새로 시작합니다: {e}")
+        return state
+
+    @_locked
+    def save(self):
+        """상태 저장 (오래 보이지 않은 게시물은 정리) - 내용이 그대로면 파일을 쓰지 않고 False"""
+        cutoff = self.now - self.forget_days * DAY_SECONDS
+        posts = self._state['posts']
+        for entries in (posts, self._state['rejected']):
+            for link in [link for link, post in entries.items() if post['last_seen'] < cutoff]:
+                del entries[link]
+
+        text = json.dumps(self._state, ensure_ascii=False, indent=2)
+        if text == self._saved_text:
+            return False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, self.path)
+        self._saved_text = text
+        return True
+
+    # 요청 예산
+    @_locked
+    def spend(self):
+        """요청 1회 사용 (예산이 없으면 False)"""
+        if self.remaining <= 0:
+            METRICS.inc('scheduler_requests_denied')
+            return False
+        self.remaining -= 1
+        return True
+
+    @_locked
+    def refund(self):
+        """미리 확보했다가 쓰지 않은 요청 1회를 돌려받음"""
+        self.remaining += 1
+
+    @_locked
+    def has_budget(self):
+        """예산이 남았는지 (차감하지 않음 - 미리 받기는 실제로 쓸 때 차감)"""
+        return self.remaining > 0
+
+    # 키워드 배정
+    def _expected_new(self, keyword, page):
+        """keyword의 page번째 검색 페이지에서 기대되는 새 글 수"""
+        stats = self._state['keywords'].get(keyword)
+        if stats is None:
+            # 처음 보는 키워드는 모든 페이지가 새 글이라고 가정
+            return float(self.items_per_page)
+
+        idle_days = max(0.0, (self.now - stats['last_crawled_at']) / DAY_SECONDS)
+        first_page = min(self.items_per_page, stats['new_per_day'] * idle_days)
+        return first_page * self.depth_decay ** (page - 1)
+
+    def _is_overdue(self, keyword):
+        stats = self._state['keywords'].get(keyword)
+        return stats is None or self.now - stats['last_crawled_at'] >= self.max_idle_days * DAY_SECONDS
+
+    def _page_cost(self, expected):
+        return 1 + expected * self.detail_requests
+
+    @_locked
+    def plan(self, keywords):
+        """
+        키워드별 검색 페이지 수 배정
+
+        검색 페이지 1개의 비용은 검색 요청 1회 + 기대 새 글 수 × detail_requests회의 상세 요청으로 보고,
+        (기대 새 글 수 / 비용)이 큰 페이지부터 예산이 남는 동안 고릅니다.
+
+        Returns:
+            dict: {키워드: 페이지 수} (0이면 이번에는 건너뜀)
+        """
+        pages = {keyword: 0 for keyword in keywords}
+        reserved = 0.0
+
+        # 오래 확인하지 않은 키워드는 1페이지를 먼저 확보
+        for keyword in keywords:
+            if self._is_overdue(keyword) and reserved + 1 <= self.budget:
+                pages[keyword] = 1
+                reserved += self._page_cost(self._expected_new(keyword, 1))
+
+        candidates = []
+        for keyword in keywords:
+            page = pages[keyword] + 1
+            expected = self._expected_new(keyword, page)
+            heapq.heappush(candidates, (-expected / self._page_cost(expected), page, keyword, expected))
+
+        while candidates:
+            _, page, keyword, expected = heapq.heappop(candidates)
+            cost = self._page_cost(expected)
+            if page > self.max_page or expected < 0.5 or reserved + cost > self.budget:
+                continue
+            pages[keyword] = page
+            reserved += cost
+            expected = self._expected_new(keyword, page + 1)
+            heapq.heappush(candidates, (-expected / self._page_cost(expected), page + 1, keyword, expected))
+
+        for keyword, count in pages.items():
+            print(f"🗓️ {keyword}: {count}페이지 (기대 새 글 {self._expected_new(keyword, 1):.1f}개)")
+        return pages
+
+    # 게시물
+    def _recheck_interval(self, post):
+        days = self.recheck_days * 2 ** post.get('unchanged_checks', 0)
+        return min(days, self.max_recheck_days) * DAY_SECONDS
+
+    @_locked
+    def cached_review(self, link):
+        """
+        다시 받을 필요가 없는 게시물이면 저장된 리뷰 반환, 받아야 하면 None
+
+        처음 보는 글과 재확인 시점이 된 글은 None (재확인 예산이 없으면 재확인은 미룸)
+        """
+        post = self._state['posts'].get(link)
+        if post is None:
+            return None
+
+        post['last_seen'] = self.now
+        due = self.now - post['last_checked'] >= self._recheck_interval(post)
+        if due and self.rechecks < self.recheck_budget and self.remaining > 0:
+            self.rechecks += 1
+            return None
+        METRICS.inc('scheduler_posts_reused')
+        return dict(post['review'])
+
+    @_locked
+    def rejected_reason(self, link, since=None, until=None):
+        """
+        다시 받지 않을 거절된 글이면 거절 이유 반환, 받아야 하면 None
+
+        기간 밖이던 글은 since~until이 바뀌어 날짜가 들어오면, 실패한 글은 retry_after가 지나면 None
+        """
+        entry = self._state['rejected'].get(link)
+        if entry is None:
+            return None
+
+        if entry['reason'] == 'out_of_window':
+            due = in_window(datetime.date.fromisoformat(entry['date']), since, until)
+        else:
+            due = self.now >= entry['retry_after']
+        if due:
+            return None
+
+        entry['last_seen'] = self.now
+        METRICS.inc('scheduler_posts_skipped', reason=entry['reason'])
+        return entry['reason']
+
+    @_locked
+    def observe_rejected(self, keyword, link, reason, date=None):
+        """
+        수집하지 않은 글 기록
+
+        Args:
+            reason: 'out_of_window' (날짜가 수집 기간 밖, date 필요) 또는 'failed' (받기/파싱 실패)
+        """
+        entry = self._state['rejected'].get(link) or {'keyword': keyword, 'attempts': 0}
+        attempts = entry['attempts'] + 1
+        days = min(self.recheck_days * 2 ** (attempts - 1), self.max_recheck_days)
+        entry.update(reason=reason, date=date.isoformat() if date else None, attempts=attempts,
+                     last_seen=self.now, last_checked=self.now,
+                     retry_after=self.now + days * DAY_SECONDS)
+        self._state['rejected'][link] = entry
+        METRICS.inc('scheduler_posts_rejected', reason=reason)
+
+    @_locked
+    def observe_post(self, keyword, review):
+        """상세 페이지에서 받은 게시물 기록 (새 글이면 True)"""
+        link = review['link']
+        self._state['rejected'].pop(link, None)
+        digest = _content_hash(review)
+        post = self._state['posts'].get(link)
+        stats = self._run_stats.setdefault(keyword, {'new': 0, 'changed': 0})
+
+        if post is None:
+            self._state['posts'][link] = {
+                'keyword': keyword,
+                'review': review,
+                'hash': digest,
+                'first_seen': self.now,
+                'last_seen': self.now,
+                'last_checked': self.now,
+                'last_changed': self.now,
+                'unchanged_checks': 0
+            }
+            stats['new'] += 1
+            METRICS.inc('scheduler_new_posts', keyword=keyword)
+            return True
+
+        if post['hash'] != digest:
+            post.update(review=review, hash=digest, last_changed=self.now, unchanged_checks=0)
+            stats['changed'] += 1
+            METRICS.inc('scheduler_changed_posts', keyword=keyword)
+        else:
+            post['unchanged_checks'] = post.get('unchanged_checks', 0) + 1
+        post['last_seen'] = post['last_checked'] = self.now
+        return False
+
+    @_locked
+    def last_reviews(self, keyword):
+        """이번에 건너뛴 키워드의 지난 크롤링 결과 (저장된 내용 그대로)"""
+        stats = self._state['keywords'].get(keyword, {})
+        posts = self._state['posts']
+        reviews = []
+        for link in stats.get('last_links', []):
+            if link in posts:
+                posts[link]['last_seen'] = self.now
+                reviews.append(dict(posts[link]['review']))
+        return reviews
+
+    @_locked
+    def finish_keyword(self, keyword, pages, reviews):
+        """
+        키워드 크롤링 결과로 하루당 새 글 수(EWMA) 갱신
+
+        지난번보다 얕게 크롤링했으면 이번에 보지 못한 깊은 페이지의 글은 지난 결과에서 이어받습니다.
+
+        Returns:
+            list: 이어받은 글까지 합친 리뷰 목록
+        """
+        if pages <= 0:
+            return reviews
+        new_count = self._run_stats.get(keyword, {}).get('new', 0)
+        stats = self._state['keywords'].get(keyword)
+
+        if stats is None:
+            # 첫 크롤링은 기간을 알 수 없으므로 하루 동안 쌓인 것으로 봄
+            stats = self._state['keywords'][keyword] = {'new_per_day': float(new_count), 'runs': 0}
+        else:
+            idle_days = max((self.now - stats['last_crawled_at']) / DAY_SECONDS, 1 / 24)
+            rate = new_count / idle_days
+            stats['new_per_day'] = self.alpha * rate + (1 - self.alpha) * stats['new_per_day']
+
+        if pages < stats.get('last_pages', 0):
+            links = {review['link'] for review in reviews}
+            reviews = reviews + [review for review in self.last_reviews(keyword)
+                                 if review['link'] not in links]
+
+        stats['runs'] += 1
+        stats['last_crawled_at'] = self.now
+        stats['last_pages'] = pages
+        stats['last_new'] = new_count
+        stats['last_links'] = [review['link'] for review in reviews]
+        if new_count:
+            stats['last_new_at'] = self.now
+        print(f"🗓️ {keyword}: 새 글 {new_count}개, 하루 평균 {stats['new_per_day']:.2f}개로 갱신")
+        return reviews
+
+    @_locked
+    def summary(self):
+        used = self.budget - self.remaining
+        new_posts = sum(s['new'] for s in self._run_stats.values())
+        changed_posts = sum(s['changed'] for s in self._run_stats.values())
+        return {
+            'budget': self.budget,
+            'requests_used': used,
+            'rechecks': self.rechecks,
+            'new_posts': new_posts,
+            'changed_posts': changed_posts,
+            'known_posts': len(self._state['posts']),
+            'rejected_posts': len(self._state['rejected'])
+        }
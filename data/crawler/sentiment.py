@@ -1,6 +1,10 @@
 # sentiment.py - 감정 분석 모듈
 import re
 from collections import Counter
+from metrics import METRICS
+
+# 긍정/부정 키워드 목록이나 판단 로직을 바꾸면 올려주세요 (파이프라인 단계 재실행 기준)
+LEXICON_VERSION = 1
 
 def analyze_sentiment(text: str) -> dict:
     """
@@ -73,6 +77,7 @@ def analyze_sentiment_simple(text: str) -> str:
     result = analyze_sentiment(text)
     return result['sentiment']
 
+@METRICS.timed('sentiment')
 def batch_analyze_reviews(reviews: list) -> list:
     """
     여러 리뷰를 한번에 감정 분석
@@ -92,20 +97,19 @@ def batch_analyze_reviews(reviews: list) -> list:
         # 감정 분석 실행
         sentiment_result = analyze_sentiment(full_text)
         
-        # 기존 리뷰에 감정 분석 결과 추가
-        analyzed_review = review.copy()
-        analyzed_review.update({
+        # 기존 리뷰에 감정 분석 결과를 붙인 새 dict (복사 후 update 대신 한 번에 생성)
+        analyzed_reviews.append({
+            **review,
             'sentiment': sentiment_result['sentiment'],
             'sentiment_confidence': sentiment_result['confidence'],
             'sentiment_reasoning': sentiment_result['reasoning'],
             'positive_keywords': sentiment_result['positive_keywords'],
             'negative_keywords': sentiment_result['negative_keywords']
         })
-        
-        analyzed_reviews.append(analyzed_review)
     
     return analyzed_reviews
 
+@METRICS.timed('summary')
 def get_sentiment_summary(reviews: list) -> dict:
     """
     리뷰들의 감정 분석 요약 통계
@@ -126,8 +130,8 @@ def get_sentiment_summary(reviews: list) -> dict:
     all_negative_keywords = []
     
     for review in reviews:
-        all_positive_keywords.extend(review.get('positive_keywords', []))
-        all_negative_keywords.extend(review.get('negative_keywords', []))
+        all_positive_keywords.extend(review.get('positive_keywords') or ())
+        all_negative_keywords.extend(review.get('negative_keywords') or ())
     
     top_positive = Counter(all_positive_keywords).most_common(5)
     top_negative = Counter(all_negative_keywords).most_common(5)
@@ -0,0 +1,114 @@
+# stage_manifest.py - 파이프라인 단계별 입력 해시 기록 (입력이 같으면 단계 건너뛰기)
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+# 감정 분석이 리뷰에 덧붙이는 필드 (원본 리뷰 해시에서는 제외)
+ANALYSIS_FIELDS = (
+    'sentiment', 'sentiment_confidence', 'sentiment_reasoning',
+    'positive_keywords', 'negative_keywords'
+)
+
+
+def content_hash(*parts):
+    """JSON으로 직렬화할 수 있는 값들의 sha256 해시"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def reviews_hash(reviews):
+    """감정 분석 결과를 뺀 원본 리뷰 목록의 해시 (순서 포함)"""
+    return content_hash([
+        {k: v for k, v in review.items() if k not in ANALYSIS_FIELDS}
+        for review in reviews
+    ])
+
+
+# 보고서의 생성일 줄 (같은 내용을 다른 날 다시 만들어도 해시가 같도록 제외)
+GENERATED_DATE_RE = re.compile(r'^\*\*생성일\*\*:.*$', re.MULTILINE)
+
+
+def report_hash(text):
+    """생성일 줄을 뺀 보고서 본문의 해시"""
+    return content_hash(GENERATED_DATE_RE.sub('', text))
+
+
+class StageManifest:
+    """
+    단계별 마지막 실행 기록을 JSON 파일에 저장합니다.
+
+    각 단계는 입력(이전 단계 출력 해시 + 설정)의 해시를 키로 기록되고,
+    다음 실행에서 같은 키가 나오면 저장된 산출물 파일을 다시 사용합니다.
+
+    사용 예:
+        manifest = StageManifest()
+        entry = manifest.lookup('analyze', input_hash)
+        if entry is None:
+            ...  # 단계 실행
+            manifest.record('analyze', input_hash, output_hash, [path])
+        manifest.save()
+    """
+
+    def __init__(self, path='data/cache/pipeline_manifest.json'):
+        self.path = path
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ 단계 기록 로드 실패, 새로 시작합니다: {e}")
+        return self._entries
+
+    def get(self, stage):
+        """단계의 마지막 기록 (없으면 None)"""
+        return self._load().get(stage)
+
+    def lookup(self, stage, input_hash):
+        """입력 해시가 같고 산출물 파일이 모두 남아 있으면 기록 반환, 아니면 None"""
+        entry = self._load().get(stage)
+        if not entry or entry.get('input') != input_hash:
+            return None
+        if not all(os.path.exists(path) for path in entry.get('artifacts', [])):
+            return None
+        return entry
+
+    def record(self, stage, input_hash, output_hash, artifacts=()):
+        """단계 실행 결과 기록 (save()를 불러야 파일에 반영) - 입력/출력/산출물이 같으면 그대로 둠"""
+        entries = self._load()
+        entry = entries.get(stage)
+        if (entry and entry.get('input') == input_hash and entry.get('output') == output_hash
+                and entry.get('artifacts') == list(artifacts)):
+            return
+        entries[stage] = {
+            'input': input_hash,
+            'output': output_hash,
+            'artifacts': list(artifacts),
+            'updated_at': datetime.now().isoformat()
+        }
+        self._dirty = True
+
+    def save(self):
+        """바뀐 내용이 있을 때만 저장 (변화 없는 날에는 파일도 그대로)"""
+        if not self._dirty:
+            return False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        return True
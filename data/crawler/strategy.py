@@ -1,170 +1,74 @@
 # strategy.py - 마케팅 전략 생성 모듈
 import json
 import os
-from datetime import datetime
+from metrics import METRICS, write_run_metrics
 from sentiment import get_sentiment_summary
+from report_renderer import DEFAULT_BRANCH, DEFAULT_REGION, RenderedReport, ReportRenderer, write_encoded
 
-def generate_marketing_strategy(reviews: list) -> str:
-    """리뷰 분석 기반 AI 마케팅 전략 생성"""
+@METRICS.timed('strategy')
+def generate_marketing_report(reviews: list, strategist=None, trend=None) -> RenderedReport:
+    """
+    generate_marketing_strategy와 같지만 저장에 바로 쓸 RenderedReport 반환
+
+    기본 분석 전략이면 마크다운과 함께 JSON 보고서도 들어 있습니다.
+    """
     if not reviews:
-        return "리뷰가 없어서 마케팅 전략을 생성할 수 없습니다."
+        return RenderedReport.from_markdown(DEFAULT_BRANCH, "리뷰가 없어서 마케팅 전략을 생성할 수 없습니다.")
     
     try:
         # Gemini AI 사용 시도
-        from gemini_api import GeminiMarketingStrategist
+        if strategist is None:
+            from gemini_api import GeminiMarketingStrategist
+            strategist = GeminiMarketingStrategist()
         
-        strategist = GeminiMarketingStrategist()
         ai_strategy = strategist.generate_marketing_strategy(reviews)
-        return ai_strategy
+        if trend and getattr(strategist, 'last_fallback', False):
+            # 생성기의 간단한 대체 전략에는 추이가 없으므로 기본 분석 전략 사용
+            return render_basic_report(reviews, trend)
+        return RenderedReport.from_markdown(getattr(strategist, 'branch_name', DEFAULT_BRANCH), ai_strategy)
         
     except Exception as e:
         print(f"⚠️ AI 전략 생성 실패: {e}")
         print("📊 기본 분석 전략으로 대체합니다...")
         
         # 기본 분석으로 대체
-        return generate_basic_marketing_strategy(reviews)
+        return render_basic_report(reviews, trend)
+
+def generate_marketing_strategy(reviews: list, strategist=None, trend=None) -> str:
+    """리뷰 분석 기반 AI 마케팅 전략 생성 (strategist를 넘기면 재사용, trend는 기본 전략에 사용)"""
+    return generate_marketing_report(reviews, strategist, trend).markdown
 
-def generate_basic_marketing_strategy(reviews: list) -> str:
-    """기본 규칙 기반 마케팅 전략 (AI 실패시 대체)"""
+@METRICS.timed('report_render')
+def render_basic_report(reviews: list, trend=None, branch_name=DEFAULT_BRANCH, region=DEFAULT_REGION,
+                        formats=('markdown', 'json')) -> RenderedReport:
+    """기본 규칙 기반 전략 보고서 렌더링 (마크다운 + JSON)"""
     # 감정 분석 요약 통계
     summary = get_sentiment_summary(reviews)
-    
-    strategy = f"""# 📊 우리끼리 키즈카페 대전문화점 마케팅 전략 보고서
-
-**생성일**: {datetime.now().strftime('%Y년 %m월 %d일')}
-**분석 기간**: 2025년 6월 이후 작성된 리뷰
-**총 리뷰 수**: {summary['total_reviews']}개
-**분석 방식**: 기본 규칙 기반 분석
-
-## 🎯 리뷰 감정 분석 결과
-
-### 전체 감정 분포
-- **긍정적 리뷰**: {summary['positive_count']}개 ({summary['positive_ratio']}%)
-- **부정적 리뷰**: {summary['negative_count']}개 ({summary['negative_ratio']}%)
-- **중립적 리뷰**: {summary['neutral_count']}개 ({summary['neutral_ratio']}%)
-
-### 고객 만족도 지표
-"""
-    
-    # 만족도 판단
-    if summary['positive_ratio'] >= 70:
-        satisfaction_level = "매우 높음"
-        satisfaction_emoji = "🟢"
-    elif summary['positive_ratio'] >= 50:
-        satisfaction_level = "양호"
-        satisfaction_emoji = "🟡"
-    else:
-        satisfaction_level = "개선 필요"
-        satisfaction_emoji = "🔴"
-    
-    strategy += f"**고객 만족도**: {satisfaction_emoji} {satisfaction_level} ({summary['positive_ratio']}%)\n\n"
-    
-    # 주요 키워드 분석
-    if summary['top_positive_keywords']:
-        strategy += "### 🔥 고객들이 가장 좋아하는 점\n"
-        for keyword, count in summary['top_positive_keywords']:
-            strategy += f"- **{keyword}**: {count}회 언급\n"
-        strategy += "\n"
-    
-    if summary['top_negative_keywords']:
-        strategy += "### ⚠️ 개선이 필요한 점\n"
-        for keyword, count in summary['top_negative_keywords']:
-            strategy += f"- **{keyword}**: {count}회 언급\n"
-        strategy += "\n"
-    
-    # 전략적 제안
-    strategy += """## 🚀 마케팅 전략 제안
-
-### 1. 즉시 실행 가능한 전략
-"""
-    
-    if summary['positive_ratio'] > summary['negative_ratio']:
-        strategy += """
-#### 🎯 강점 극대화 전략
-- **긍정 리뷰 활용**: 고객 후기를 SNS 및 매장 내 적극 게시
-- **입소문 마케팅**: 만족한 고객들의 추천 이벤트 진행
-- **리뷰 인센티브**: 네이버/구글 리뷰 작성 고객 대상 할인 혜택
-"""
-    else:
-        strategy += """
-#### 🔧 개선 우선 전략  
-- **즉시 개선**: 부정적 피드백 사항 우선 해결
-- **고객 소통**: 불만 고객 직접 연락하여 관계 회복
-- **서비스 교육**: 직원 친절 서비스 교육 강화
-"""
-    
-    strategy += """
-### 2. 콘텐츠 마케팅 전략
+    renderer = ReportRenderer(branch_name, region)
+    return renderer.render(summary, trend, formats=formats)
 
-#### 📱 SNS 활용 방안
-- **인스타그램**: 아이들 놀이 모습 릴스 제작
-- **네이버 블로그**: 키즈카페 이용 팁 포스팅
-- **유튜브**: 시설 투어 및 놀이 가이드 영상
+def generate_basic_marketing_strategy(reviews: list, trend=None, branch_name=DEFAULT_BRANCH,
+                                      region=DEFAULT_REGION) -> str:
+    """
+    기본 규칙 기반 마케팅 전략 (AI 실패시 대체)
 
-#### 🏷️ 해시태그 전략
-- #우리끼리대전문화점
-- #대전키즈카페
-- #무인키즈카페
-- #아이와함께대전
+    trend에 TrendTracker.snapshot()을 넘기면 누적 추이와 이상 징후 섹션을 덧붙입니다.
+    여러 형식(JSON, 대시보드 조각)이나 여러 지점이 필요하면 report_renderer를 직접 사용하세요.
+    """
+    return render_basic_report(reviews, trend, branch_name, region, formats=('markdown',)).markdown
 
-### 3. 고객 관리 전략
+def strategy_file_path(date_str: str) -> str:
+    """대시보드가 읽는 날짜별 전략 파일 경로"""
+    return os.path.join('data', 'strategies', f'{date_str}_marketing_strategy.md')
 
-#### 🎁 프로모션 아이디어
-- **신규 고객**: 첫 방문 할인 쿠폰
-- **단골 고객**: VIP 멤버십 프로그램
-- **생일 이벤트**: 아이 생일 기념 무료 이용권
-- **리뷰 이벤트**: 포토 리뷰 작성시 다음 방문 할인
-
-#### 📊 고객 피드백 시스템
-- **정기 설문**: 월 1회 고객 만족도 조사
-- **즉시 대응**: 부정적 리뷰 24시간 내 답변
-- **개선 공지**: 고객 건의사항 반영 결과 공유
-
-### 4. 시설 및 서비스 개선 방안
-"""
-    
-    # 부정적 키워드 기반 개선 방안
-    if summary['top_negative_keywords']:
-        strategy += "\n#### 🔧 우선 개선 항목\n"
-        for keyword, count in summary['top_negative_keywords'][:3]:
-            if keyword in ['더럽', '청소', '냄새']:
-                strategy += f"- **청결 관리**: {keyword} 관련 불만 해결을 위한 청소 횟수 증가\n"
-            elif keyword in ['불친절', '직원']:
-                strategy += f"- **서비스 교육**: {keyword} 관련 직원 교육 프로그램 강화\n"
-            elif keyword in ['비싸', '가격']:
-                strategy += f"- **가격 정책**: {keyword} 관련 합리적 요금제 검토\n"
-            else:
-                strategy += f"- **{keyword} 개선**: 고객 불만 사항 즉시 해결\n"
-    
-    strategy += """
-### 5. 성과 측정 및 모니터링
-
-#### 📈 KPI 지표
-- **리뷰 평점**: 월평균 4.0점 이상 목표
-- **긍정 리뷰 비율**: 70% 이상 유지
-- **신규 고객 비율**: 월 20% 이상
-- **재방문율**: 60% 이상
-
-#### 🔍 모니터링 계획
-- **일간**: 새로운 리뷰 확인 및 대응
-- **주간**: 고객 만족도 트렌드 분석
-- **월간**: 마케팅 성과 평가 및 전략 수정
-
----
-
-> ⚠️ **참고**: 이 전략은 기본 분석으로 생성되었습니다. 
-> 더 정교한 AI 전략을 원하시면 Gemini API 키를 설정해주세요.
-"""
-    
-    return strategy
-
-def save_strategy_to_file(strategy: str, date_str: str) -> str:
-    """마케팅 전략을 파일로 저장"""
+def save_strategy_to_file(strategy, date_str: str) -> str:
+    """마케팅 전략을 파일로 저장 (RenderedReport면 이미 인코딩한 마크다운을 그대로 기록)"""
     os.makedirs('data/strategies', exist_ok=True)
-    path = f'data/strategies/{date_str}_marketing_strategy.md'
+    path = strategy_file_path(date_str)
+    data = strategy.encoded('markdown') if isinstance(strategy, RenderedReport) else strategy
     
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(strategy)
+    with METRICS.timer('file_write'):
+        write_encoded(data, [path])
     
     print(f"✅ Marketing strategy saved to: {path}")
     return path
@@ -183,7 +87,8 @@ def load_reviews_and_generate_strategy(reviews_file_path: str) -> str:
     except json.JSONDecodeError:
         return "리뷰 파일을 읽는 중 오류가 발생했습니다."
 
-if __name__ == "__main__":
+def main():
+    """최신 리뷰 파일로 마케팅 전략 생성 및 저장"""
     print("🎯 마케팅 전략 생성기")
     
     # 최신 리뷰 파일 찾기 (여러 형태 지원)
@@ -213,7 +118,7 @@ if __name__ == "__main__":
             print(f"📊 총 {len(reviews)}개 리뷰 분석 예정")
         except:
             print("❌ 리뷰 파일 읽기 실패")
-            exit()
+            return
         
         # 마케팅 전략 생성
         strategy = load_reviews_and_generate_strategy(reviews_path)
@@ -228,9 +133,22 @@ if __name__ == "__main__":
         print(strategy[:1000] + "...")
         print(f"\n✅ 완료! 전략 파일: {strategy_path}")
         
+        write_run_metrics('strategy')
+        
     else:
         print("❌ 리뷰 파일이 없습니다.")
         print("다음 중 하나를 먼저 실행하세요:")
         print("  - fixed_iframe_crawler.py (권장)")
         print("  - simplified_crawler.py")
-        print("  - crawler.py")
\ No newline at end of file
+        print("  - crawler.py")
+
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    from profiling import add_profile_arguments, profiler_from_args
+    
+    parser = add_profile_arguments(argparse.ArgumentParser(description='마케팅 전략 생성기'))
+    args = parser.parse_args()
+    
+    with profiler_from_args(args, 'strategy') or contextlib.nullcontext():
+        main()
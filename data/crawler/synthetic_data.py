@@ -0,0 +1,144 @@
+# synthetic_data.py - 테스트/벤치마크용 합성 한국어 리뷰와 네이버 블로그 HTML 생성
+import datetime
+import html
+import random
+
+# 합성 데이터 날짜의 기준일 (결과가 실행 날짜에 따라 달라지지 않도록 고정)
+BASE_DATE = datetime.date(2025, 6, 20)
+
+BLOG_SKINS = ('smarteditor', 'postviewarea', 'iframe')
+
+_BRANCHES = ['대전문화점', '대전둔산점', '세종나성점', '청주복대점']
+
+_OPENINGS = [
+    '주말에 아이랑 다녀왔어요.', '비 오는 날 갈 곳을 찾다가 방문했습니다.',
+    '조카들 데리고 처음 가봤어요.', '평일 오후라 한적하게 놀다 왔어요.',
+    '친구 가족이랑 같이 방문했어요.', '아이 생일이라 특별히 찾아갔어요.',
+]
+
+_POSITIVE = [
+    '시설이 깨끗하고 좋아요.', '직원분이 친절해서 만족했어요.', '아이들이 정말 재미있게 놀았어요.',
+    '공간이 넓고 안전해서 추천합니다.', '놀이기구가 다양해서 최고였어요.', '가격 대비 훌륭한 곳이에요.',
+    '음료도 괜찮고 편리했어요.', '아이가 웃음이 끊이지 않았어요.',
+]
+
+_NEGATIVE = [
+    '주차가 좀 불편했어요.', '사람이 많아서 시끄럽고 좁았어요.', '화장실이 지저분해서 아쉽네요.',
+    '가격이 조금 비싸요.', '일부 놀이기구가 고장 나 있어서 실망했어요.', '냄새가 좀 나서 별로였어요.',
+    '직원이 불친절해서 불만이었어요.',
+]
+
+_NEUTRAL = [
+    '위치는 찾기 쉬운 편이에요.', '운영 시간은 오전 10시부터예요.', '간식은 따로 챙겨 가면 됩니다.',
+    '예약 없이도 입장 가능했어요.', '양말은 꼭 챙기세요.', '2시간 이용권으로 들어갔어요.',
+]
+
+
+def _sentences(rng, sentiment):
+    pools = {
+        'positive': (_POSITIVE, _POSITIVE, _NEUTRAL),
+        'negative': (_NEGATIVE, _NEGATIVE, _NEUTRAL),
+        'neutral': (_NEUTRAL, _NEUTRAL, _POSITIVE + _NEGATIVE),
+    }[sentiment]
+    count = rng.randint(3, 7)
+    parts = [rng.choice(_OPENINGS)]
+    for _ in range(count):
+        parts.append(rng.choice(rng.choice(pools)))
+    return ' '.join(parts)
+
+
+def make_review(index, seed=0):
+    """index가 같으면 항상 같은 합성 리뷰 dict를 반환"""
+    rng = random.Random(seed * 1000003 + index)
+    sentiment = rng.choices(('positive', 'negative', 'neutral'), weights=(6, 2, 2))[0]
+    branch = rng.choice(_BRANCHES)
+    day = BASE_DATE - datetime.timedelta(days=rng.randint(0, 365))
+    return {
+        'title': f"우리끼리 키즈카페 {branch} {rng.choice(['후기', '방문기', '솔직 리뷰', '재방문'])}",
+        'link': f"https://blog.naver.com/user{index % 5000}/22{index:010d}",
+        'date': day.isoformat(),
+        'content': _sentences(rng, sentiment)[:500]
+    }
+
+
+def iter_reviews(count, seed=0):
+    """합성 리뷰를 하나씩 생성 (대량 생성 시 메모리 절약)"""
+    for index in range(count):
+        yield make_review(index, seed)
+
+
+def generate_reviews(count, seed=0):
+    """합성 리뷰 리스트 생성"""
+    return list(iter_reviews(count, seed))
+
+
+def naver_date_text(day, rng):
+    """네이버 블로그에서 볼 수 있는 여러 날짜 표기 중 하나로 변환"""
+    style = rng.randrange(3)
+    if style == 0:
+        return f"{day.year}. {day.month}. {day.day}. {rng.randint(0, 23)}:{rng.randint(0, 59):02d}"
+    if style == 1:
+        return day.strftime('%Y.%m.%d.')
+    return day.strftime('%Y/%m/%d %H:%M')
+
+
+def render_blog_post(review, skin='smarteditor', rng=None):
+    """
+    리뷰를 실제 네이버 블로그 스킨과 비슷한 HTML로 렌더링합니다.
+
+    - smarteditor : 스마트에디터 ONE (div.se-main-container, span.se_publishDate)
+    - postviewarea: 구버전 에디터 (div#postViewArea, p.date)
+    - iframe      : 본문 없이 PostView를 iframe으로 여는 껍데기 페이지
+    """
+    rng = rng or random.Random(review['link'])
+    title = html.escape(review['title'])
+    day = datetime.date.fromisoformat(review['date'])
+    date_text = html.escape(naver_date_text(day, rng))
+    paragraphs = ''.join(
+        f'<p class="se-text-paragraph"><span>{html.escape(sentence.strip())}.</span></p>'
+        for sentence in review['content'].split('.') if sentence.strip()
+    )
+    padding = '<div class="blog_ad" aria-hidden="true"></div>' * rng.randint(5, 30)
+
+    if skin == 'smarteditor':
+        body = f"""<div id="whole-body"><div class="se-viewer se-theme-default">
+<div class="se-documentTitle"><div class="se-module se-module-text se-title-text">
+<p class="se-text-paragraph"><span>{title}</span></p></div></div>
+<div class="blog2_container"><span class="nick">블로거</span>
+<span class="se_publishDate pcol2">{date_text}</span></div>
+<div class="se-main-container">{paragraphs}</div></div></div>"""
+    elif skin == 'postviewarea':
+        body = f"""<div id="post-area"><div class="htitle"><span class="pcol1 itemSubjectBoldfont">{title}</span></div>
+<p class="date fil5 pcol2 _postAddDate">{date_text}</p>
+<div id="postViewArea"><div class="post-view">{paragraphs}</div></div></div>"""
+    elif skin == 'iframe':
+        blog_id, log_no = review['link'].rstrip('/').split('/')[-2:]
+        # 대체 서버는 호스트를 경로 앞에 붙여 흉내 내므로 PostView도 /blog.naver.com/ 아래에 있음
+        body = f"""<div id="mainFrameWrap">
+<iframe id="mainFrame" name="mainFrame" src="/blog.naver.com/PostView.naver?blogId={blog_id}&amp;logNo={log_no}"
+ scrolling="auto" frameborder="0" width="100%"></iframe></div>"""
+    else:
+        raise ValueError(f"알 수 없는 블로그 스킨: {skin}")
+
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title} : 네이버 블로그</title></head>
+<body>{padding}{body}{padding}</body></html>"""
+
+
+def render_search_page(keyword, items):
+    """
+    네이버 블로그 검색 결과 페이지 HTML 생성
+
+    Args:
+        items: [{'title': str, 'link': str}, ...]
+    """
+    entries = ''.join(
+        f"""<li class="bx"><div class="total_wrap api_ani_send"><div class="total_area">
+<div class="total_tit"><a href="{html.escape(item['link'])}" class="link_tit" title="{html.escape(item['title'])}">{html.escape(item['title'])}</a></div>
+<div class="total_dsc_wrap"><a class="total_dsc">{html.escape(item.get('snippet', ''))}</a></div>
+</div></div></li>"""
+        for item in items
+    )
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{html.escape(keyword)} : 네이버 블로그검색</title></head>
+<body><div id="main_pack"><section class="sc_new sp_blog"><ul class="lst_total">{entries}</ul></section></div></body></html>"""
@@ -0,0 +1,5 @@
+# conftest.py - 크롤러 모듈은 패키지가 아니므로 data/crawler를 import 경로에 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
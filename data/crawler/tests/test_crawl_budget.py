@@ -0,0 +1,61 @@
+# test_crawl_budget.py - 크롤러의 요청 예산 차감 테스트 (로컬 대체 네이버 서버 사용)
+import pytest
+
+import fixed_iframe_crawler as crawler
+from crawl_executor import HybridCrawlExecutor
+from fake_naver_server import FakeNaverConfig, FakeNaverServer
+from metrics import METRICS
+from scheduler import CrawlScheduler
+
+
+@pytest.fixture
+def iframe_server(monkeypatch):
+    # 모든 글이 mainFrame iframe 껍데기 페이지 (글 하나에 요청 2회)
+    server = FakeNaverServer(FakeNaverConfig(skins='iframe=1'))
+    server.start()
+    monkeypatch.setattr(crawler, 'SEARCH_URL', server.search_url)
+    monkeypatch.setattr(crawler, 'REQUEST_DELAY', (0, 0))
+    monkeypatch.setattr(crawler, 'PAGE_DELAY', (0, 0))
+    yield server
+    server.stop()
+
+
+def _crawl(tmp_path, budget, prefetch, executor=None):
+    scheduler = CrawlScheduler(str(tmp_path / 'schedule.json'), budget=budget)
+    reviews = crawler.crawl_naver_blog('키즈카페', max_page=2, scheduler=scheduler,
+                                       items_per_page=3, prefetch=prefetch, since=None,
+                                       executor=executor)
+    return scheduler, reviews
+
+
+@pytest.mark.parametrize('prefetch', [0, 1])
+def test_iframe_follow_costs_a_second_unit(iframe_server, tmp_path, prefetch):
+    # 검색 1페이지(1) + 글 3개 × (껍데기 + iframe) = 7
+    scheduler, reviews = _crawl(tmp_path, budget=7, prefetch=prefetch)
+    assert len(reviews) == 3
+    assert scheduler.remaining == 0
+
+
+def test_prefetched_page_is_charged_only_when_used(iframe_server, tmp_path):
+    METRICS.reset()
+    # 미리 받은 2페이지는 상세 페이지가 예산을 다 써서 쓰지 못하므로 차감하지 않음
+    scheduler, reviews = _crawl(tmp_path, budget=7, prefetch=1)
+    assert len(reviews) == 3
+    assert METRICS.counters.get(('search_prefetch_discarded', ())) == 1
+
+
+def test_denied_iframe_is_not_recorded_as_failed(iframe_server, tmp_path):
+    # 1페이지(1) + 글 1개(2) + 두 번째 글 껍데기(1)에서 예산 소진
+    scheduler, reviews = _crawl(tmp_path, budget=4, prefetch=0)
+    assert len(reviews) == 1
+    assert scheduler.summary()['rejected_posts'] == 0
+
+
+@pytest.mark.parametrize('budget, expected', [(7, 3), (4, 1)])
+def test_executor_reserves_iframe_unit_in_order(iframe_server, tmp_path, budget, expected):
+    # 요청이 비동기로 진행돼도 앞 글의 iframe 본문이 뒤 글보다 먼저 예산을 받음
+    with HybridCrawlExecutor(workers=1) as executor:
+        scheduler, reviews = _crawl(tmp_path, budget=budget, prefetch=1, executor=executor)
+    assert len(reviews) == expected
+    assert scheduler.remaining == 0
+    assert scheduler.summary()['rejected_posts'] == 0
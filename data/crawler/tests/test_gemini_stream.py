@@ -0,0 +1,59 @@
+# test_gemini_stream.py - 스트리밍 호출의 시간 초과/재시도 테스트
+import json
+
+import pytest
+
+from gemini_api import GeminiMarketingStrategist, GeminiRetryableError
+
+
+class _Response:
+    def __init__(self, status_code, chunks=()):
+        self.status_code = status_code
+        self.text = ''
+        self.encoding = None
+        self._lines = [
+            'data: ' + json.dumps({'candidates': [{'content': {'parts': [{'text': chunk}]}}]})
+            for chunk in chunks
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self._lines)
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.timeouts = []
+
+    def post(self, url, headers=None, json=None, stream=False, timeout=None):
+        self.timeouts.append(timeout)
+        return self.responses.pop(0)
+
+
+def _strategist(session, max_retries):
+    return GeminiMarketingStrategist(api_key='test-key', use_cache=False, timeout=7,
+                                     max_retries=max_retries, retry_backoff=0, session=session)
+
+
+def test_stream_retries_rate_limit_with_configured_timeout():
+    session = _Session([_Response(429), _Response(503), _Response(200, ['전략 ', '본문'])])
+    strategist = _strategist(session, max_retries=2)
+
+    assert ''.join(strategist._stream_gemini_api('prompt')) == '전략 본문'
+    assert session.timeouts == [7, 7, 7]
+    assert strategist.retry_count == 2
+
+
+def test_stream_raises_retryable_error_after_last_attempt():
+    session = _Session([_Response(429), _Response(429)])
+    strategist = _strategist(session, max_retries=1)
+
+    with pytest.raises(GeminiRetryableError):
+        list(strategist._stream_gemini_api('prompt'))
+    assert not session.responses
@@ -0,0 +1,63 @@
+# test_naver_dates.py - 네이버 날짜 파싱과 원문 빠른 경로 테스트
+import datetime
+
+from fixed_iframe_crawler import parse_blog_post
+from naver_dates import find_date_in_html, in_window, parse_naver_date
+
+NOW = datetime.datetime(2025, 6, 12, 9, 0)
+CONTENT = '<div class="se-main-container">' + '아이들이 정말 재미있게 놀았어요. ' * 10 + '</div>'
+
+
+def test_absolute_formats():
+    assert parse_naver_date('2025. 6. 10. 14:30') == datetime.date(2025, 6, 10)
+    assert parse_naver_date('2025.06.10.') == datetime.date(2025, 6, 10)
+    assert parse_naver_date('2025/06/10 14:30') == datetime.date(2025, 6, 10)
+    assert parse_naver_date('2025년 6월 10일') == datetime.date(2025, 6, 10)
+    assert parse_naver_date('2025. 2. 30.') is None
+
+
+def test_relative_formats():
+    assert parse_naver_date('3시간 전', NOW) == datetime.date(2025, 6, 12)
+    assert parse_naver_date('2일 전', NOW) == datetime.date(2025, 6, 10)
+    assert parse_naver_date('어제', NOW) == datetime.date(2025, 6, 11)
+    assert parse_naver_date('공감 12', NOW) is None
+
+
+def test_in_window():
+    day = datetime.date(2025, 6, 10)
+    assert in_window(day)
+    assert in_window(day, since=day, until=day)
+    assert not in_window(day, since=datetime.date(2025, 6, 11))
+    assert not in_window(day, until=datetime.date(2025, 6, 9))
+
+
+def test_fast_path_follows_selector_order():
+    # 문서 앞쪽의 span.date보다 span.se_publishDate가 먼저
+    html = ('<span class="date">2023.01.01.</span>'
+            '<span class="se_publishDate pcol2">2025. 6. 10.</span>' + CONTENT)
+    assert find_date_in_html(html, NOW) == datetime.date(2025, 6, 10)
+
+    date, content = parse_blog_post(html, since=datetime.date(2024, 1, 1), now=NOW)
+    assert date == datetime.date(2025, 6, 10)
+    assert content is not None
+
+
+def test_fast_path_defers_nested_text_to_parser():
+    html = ('<span class="se_publishDate"><em>2025. 6. 10.</em></span>'
+            '<span class="date">2023.01.01.</span>' + CONTENT)
+    assert find_date_in_html(html, NOW) is None
+    assert parse_blog_post(html, since=datetime.date(2024, 1, 1), now=NOW)[0] == datetime.date(2025, 6, 10)
+
+
+def test_out_of_window_post_skips_content():
+    html = '<p class="date fil5 pcol2 _postAddDate">2023. 3. 1. 10:00</p>' + CONTENT
+    assert parse_blog_post(html, since=datetime.date(2024, 1, 1), now=NOW) == (datetime.date(2023, 3, 1), None)
+
+
+def test_undated_post_is_rejected_when_window_given():
+    html = f'<html><body>{CONTENT}</body></html>'
+    assert parse_blog_post(html, since=datetime.date(2025, 1, 1), now=NOW) == (None, None)
+    assert parse_blog_post(html, until=datetime.date(2025, 6, 1), now=NOW) == (None, None)
+    # 기간이 없으면 예전처럼 오늘 날짜로 대체
+    date, content = parse_blog_post(html, now=NOW)
+    assert date == NOW.date() and content
@@ -0,0 +1,57 @@
+# test_records.py - Review 레코드 왕복 변환 테스트
+import json
+
+from records import Review
+from sentiment import batch_analyze_reviews
+from synthetic_data import generate_reviews
+
+
+def _round_trip(reviews):
+    return [Review.from_dict(review).to_dict() for review in reviews]
+
+
+def test_round_trip_analyzed_reviews():
+    reviews = batch_analyze_reviews(generate_reviews(200, seed=1))
+    restored = _round_trip(reviews)
+    assert restored == reviews
+    assert json.dumps(restored, ensure_ascii=False) == json.dumps(reviews, ensure_ascii=False)
+
+
+def test_round_trip_keeps_partial_and_reordered_keys():
+    reviews = [
+        {'title': '제목', 'link': 'https://blog.naver.com/a/1'},
+        {'content': '본문', 'date': '2025-06-10', 'title': '순서가 다른 글', 'link': 'l'},
+        {'title': 't', 'link': 'l', 'date': '2025.06.10.', 'content': 'c', 'sentiment': 'positive'},
+        {'title': 't', 'link': 'l', 'date': '2025-06-10', 'content': 'c', 'source': 'cafe',
+         'sentiment': 'negative', 'negative_keywords': ['불친절']},
+    ]
+    restored = _round_trip(reviews)
+    assert restored == reviews
+    assert [list(r) for r in restored] == [list(r) for r in reviews]
+
+
+def test_partly_analyzed_review_keeps_each_field():
+    # 감정이 없어도 키워드는 그대로, 값이 None인 필드도 그대로
+    reviews = [
+        {'title': 't', 'link': 'l', 'date': '2025-06-10', 'content': 'c',
+         'positive_keywords': ['친절'], 'negative_keywords': ['비싸']},
+        {'title': 't', 'link': 'l', 'date': None, 'content': 'c', 'sentiment': None,
+         'sentiment_confidence': None, 'sentiment_reasoning': None,
+         'positive_keywords': None, 'negative_keywords': []},
+        {'title': 't', 'link': 'l', 'date': '2025-06-10', 'content': 'c', 'sentiment': 'mixed',
+         'sentiment_confidence': 1, 'sentiment_reasoning': [], 'positive_keywords': ['좋아']},
+    ]
+    assert _round_trip(reviews) == reviews
+    assert not Review.from_dict(reviews[0]).analyzed
+
+
+def test_fields_set_after_loading_are_written():
+    review = Review.from_dict({'title': 't', 'link': 'l', 'date': '2025-06-10', 'content': 'c'})
+    review.sentiment = 'positive'
+    review.negative_keywords = []
+    assert review.to_dict() == {'title': 't', 'link': 'l', 'date': '2025-06-10', 'content': 'c',
+                                'sentiment': 'positive', 'negative_keywords': []}
+
+    built = Review(title='t', link='l', sentiment='neutral', extra={'source': 'cafe'})
+    assert built.to_dict() == {'title': 't', 'link': 'l', 'date': None, 'content': None,
+                               'sentiment': 'neutral', 'source': 'cafe'}
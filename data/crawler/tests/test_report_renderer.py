@@ -0,0 +1,45 @@
+# test_report_renderer.py - 보고서 렌더링과 전략 파일 저장 테스트
+import json
+
+from gemini_api import GeminiMarketingStrategist
+from report_renderer import FORMATS, ReportRenderer
+from sentiment import batch_analyze_reviews, get_sentiment_summary
+from synthetic_data import generate_reviews
+
+
+def _as_json(value):
+    # (키워드, 횟수) 튜플은 JSON에서 목록이 됨
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def _report():
+    reviews = batch_analyze_reviews(generate_reviews(50, seed=4))
+    return reviews, ReportRenderer().render(get_sentiment_summary(reviews))
+
+
+def test_render_formats():
+    reviews, report = _report()
+    assert set(report.outputs) == set(FORMATS)
+    assert report.markdown.startswith('# 📊')
+    assert report['json']['summary']['total_reviews'] == len(reviews)
+    assert json.loads(report.encoded('json')) == _as_json(report['json'])
+    assert report.encoded('json') is report.encoded('json')
+
+
+def test_save_strategy_writes_one_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reviews, report = _report()
+    strategist = GeminiMarketingStrategist(api_key='test-key', use_cache=False)
+    dated = str(tmp_path / 'dated.md')
+    saved = strategist.save_strategy(report, reviews, timestamp='20250610_000000', extra_paths=[dated])
+
+    md_path, json_path, latest_path = saved[:3]
+    assert saved[3:] == [dated]
+    for path in (md_path, latest_path, dated):
+        assert (tmp_path / path).read_bytes() == report.encoded('markdown')
+
+    text = (tmp_path / json_path).read_text(encoding='utf-8')
+    assert text.startswith('{\n  "timestamp"')  # 저장소에 커밋되는 파일이므로 들여쓰기 유지
+    data = json.loads(text)
+    assert data['strategy_markdown'] == report.markdown
+    assert data['report'] == _as_json(report['json'])
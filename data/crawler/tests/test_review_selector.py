@@ -0,0 +1,24 @@
+# test_review_selector.py - 대표 리뷰 선택 테스트
+from review_selector import entry_tokens, review_vector, select_representative_reviews
+from sentiment import batch_analyze_reviews
+from synthetic_data import generate_reviews
+
+
+def test_none_fields_are_treated_as_missing():
+    # 분석이 덜 된 리뷰나 저장된 JSON에서 읽은 리뷰는 값이 None일 수 있음
+    review = {'title': '놀이 시설이 깨끗해요', 'content': None, 'sentiment': None,
+              'positive_keywords': None, 'negative_keywords': ['불친절']}
+    assert review_vector(review)['불친절'] == 1
+    assert review_vector({'title': None, 'content': '넓고 깨끗', 'positive_keywords': None})
+
+    selected = select_representative_reviews([review, dict(review, negative_keywords=None)])
+    assert [entry['sentiment'] for entry in selected] == ['neutral', 'neutral']
+    assert all(entry['content'] == '' for entry in selected)
+
+
+def test_selection_stays_within_budget():
+    reviews = batch_analyze_reviews(generate_reviews(100, seed=3))
+    selected = select_representative_reviews(reviews, token_budget=600)
+    assert selected
+    assert sum(entry_tokens(entry) for entry in selected) <= 600
+    assert {entry['role'] for entry in selected} <= {'representative', 'divergent'}
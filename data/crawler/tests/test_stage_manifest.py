@@ -0,0 +1,63 @@
+# test_stage_manifest.py - 단계 기록의 건너뛰기 판단과 해시 테스트
+from stage_manifest import StageManifest, content_hash, report_hash, reviews_hash
+
+
+def _manifest(tmp_path):
+    return StageManifest(str(tmp_path / 'manifest.json'))
+
+
+def test_lookup_matches_only_same_input(tmp_path):
+    artifact = tmp_path / 'reviews.json'
+    artifact.write_text('[]', encoding='utf-8')
+    manifest = _manifest(tmp_path)
+    assert manifest.lookup('analyze', 'a') is None
+
+    manifest.record('analyze', 'a', 'out', [str(artifact)])
+    assert manifest.lookup('analyze', 'a')['output'] == 'out'
+    assert manifest.lookup('analyze', 'b') is None
+    assert manifest.lookup('strategy', 'a') is None
+
+
+def test_missing_artifact_invalidates_entry(tmp_path):
+    artifact = tmp_path / 'latest.md'
+    artifact.write_text('# 전략', encoding='utf-8')
+    manifest = _manifest(tmp_path)
+    manifest.record('strategy', 'a', 'out', [str(artifact)])
+    assert manifest.lookup('strategy', 'a') is not None
+
+    artifact.unlink()
+    assert manifest.lookup('strategy', 'a') is None
+
+
+def test_save_only_when_changed(tmp_path):
+    manifest = _manifest(tmp_path)
+    assert manifest.save() is False
+
+    manifest.record('export', 'a', 'a', [])
+    assert manifest.save() is True
+    saved = (tmp_path / 'manifest.json').read_text(encoding='utf-8')
+
+    # 같은 기록은 다시 써도 파일이 그대로
+    reloaded = _manifest(tmp_path)
+    reloaded.record('export', 'a', 'a', [])
+    assert reloaded.save() is False
+    assert (tmp_path / 'manifest.json').read_text(encoding='utf-8') == saved
+
+    reloaded.record('export', 'b', 'b', [])
+    assert reloaded.save() is True
+    assert _manifest(tmp_path).lookup('export', 'b') is not None
+
+
+def test_report_hash_ignores_generated_date():
+    report = "# 전략\n\n**생성일**: 2025년 06월 10일\n\n본문\n"
+    next_day = report.replace('06월 10일', '06월 11일')
+    assert report_hash(report) == report_hash(next_day)
+    assert report_hash(report) != report_hash(report.replace('본문', '다른 본문'))
+
+
+def test_reviews_hash_ignores_analysis_fields():
+    reviews = [{'title': '제목', 'link': 'l', 'content': '본문'}]
+    analyzed = [dict(reviews[0], sentiment='positive', positive_keywords=['친절'])]
+    assert reviews_hash(reviews) == reviews_hash(analyzed)
+    assert reviews_hash(reviews) != reviews_hash(reviews + reviews)
+    assert content_hash('a', 1) != content_hash('a', 2)
@@ -0,0 +1,77 @@
+# test_trend.py - TrendTracker EWMA 갱신과 이상 징후 감지 테스트
+import pytest
+
+from trend import TrendTracker, is_warning
+
+
+def _reviews(day, total, negative, start=0):
+    """day에 쓰인 리뷰 total개 중 앞의 negative개는 부정, 나머지는 긍정"""
+    return [
+        {
+            'date': day,
+            'link': f'https://blog.naver.com/test/{day}-{start + i}',
+            'sentiment': 'negative' if i < negative else 'positive',
+        }
+        for i in range(total)
+    ]
+
+
+def _tracker(tmp_path, **options):
+    return TrendTracker(str(tmp_path / 'trend_state.json'), **options)
+
+
+def test_ewma_updates_when_day_closes(tmp_path):
+    tracker = _tracker(tmp_path, alpha=0.3)
+    tracker.update(_reviews('2025-06-01', 4, 1))
+    assert tracker.series['negative'].ewma is None  # 진행 중인 날은 반영하지 않음
+
+    tracker.update(_reviews('2025-06-02', 4, 2))
+    assert tracker.series['negative'].ewma == pytest.approx(25.0)
+
+    tracker.update(_reviews('2025-06-03', 4, 0))
+    series = tracker.series['negative']
+    assert series.ewma == pytest.approx(25.0 + 0.3 * 25.0)
+    assert series.ewvar == pytest.approx(0.7 * 25.0 * 0.3 * 25.0)
+    assert tracker.observed_days == 2
+
+
+def test_negative_spike_raises_alert(tmp_path):
+    tracker = _tracker(tmp_path)
+    for day in ('2025-06-01', '2025-06-02', '2025-06-03', '2025-06-04'):
+        assert tracker.update(_reviews(day, 10, 1)) == []
+
+    events = tracker.update(_reviews('2025-06-05', 10, 8))
+    assert [(e['series'], e['direction']) for e in events] == [('negative', 'up')]
+    assert is_warning(events[0])
+    assert events[0]['baseline'] == pytest.approx(10.0)
+    assert tracker.snapshot()['alerts'] == events
+
+
+def test_no_alert_during_warmup_or_small_days(tmp_path):
+    tracker = _tracker(tmp_path)
+    tracker.update(_reviews('2025-06-01', 10, 1))
+    # 관측일이 warmup_days보다 적으면 급변해도 알리지 않음
+    assert tracker.update(_reviews('2025-06-02', 10, 9)) == []
+
+    for day in ('2025-06-03', '2025-06-04', '2025-06-05'):
+        tracker.update(_reviews(day, 10, 1))
+    # 하루 리뷰가 min_reviews보다 적으면 알리지 않음
+    assert tracker.update(_reviews('2025-06-06', 2, 2)) == []
+
+
+def test_same_reviews_are_counted_once_and_state_round_trips(tmp_path):
+    tracker = _tracker(tmp_path)
+    first = _reviews('2025-06-01', 5, 2) + _reviews('2025-06-02', 5, 1)
+    tracker.update(first)
+    snapshot = tracker.snapshot()
+
+    # 다음 실행에 같은 글이 다시 들어와도 건수가 늘지 않음
+    tracker.update(first)
+    assert tracker.snapshot() == snapshot
+    assert tracker.save() is True
+    assert tracker.save() is False
+
+    reloaded = _tracker(tmp_path)
+    assert reloaded.snapshot() == snapshot
+    reloaded.update(first)
+    assert reloaded.snapshot() == snapshot
@@ -0,0 +1,386 @@
+# trend.py - 날짜순으로 들어오는 리뷰의 감정/키워드 추이를 누적하고 급변(이상 징후)을 감지
+import collections
+import datetime
+import json
+import math
+import os
+
+from metrics import METRICS
+
+# 감정 비율 추이 (키워드 추이는 'keyword:더럽'처럼 부정 키워드마다 생김)
+SENTIMENT_SERIES = ('negative', 'positive')
+# 긍정 비율은 추이만 보고 이상 징후는 부정 비율/부정 키워드에서만 찾음
+ALERT_SERIES = ('negative',)
+KEYWORD_PREFIX = 'keyword:'
+
+# 대시보드가 읽는 요약 파일
+SNAPSHOT_PATH = 'data/trends/latest.json'
+
+
+class _Series:
+    """지표 하나의 추이 (EWMA 평균/분산 + 최근 window_days일 일별 건수) - 크기가 일정함"""
+
+    __slots__ = ('ewma', 'ewvar', 'hits')
+
+    def __init__(self, window_days, ewma=None, ewvar=0.0, hits=()):
+        self.ewma = ewma
+        self.ewvar = ewvar
+        self.hits = collections.deque(hits, maxlen=window_days)
+
+    def to_dict(self):
+        return {'ewma': self.ewma, 'ewvar': self.ewvar, 'hits': list(self.hits)}
+
+
+def _ratio(hits, total):
+    return round(hits / total * 100, 1) if total else 0.0
+
+
+def is_warning(event):
+    """나빠지는 방향(부정 비율/키워드 증가)의 이상 징후인지"""
+    return event['direction'] == 'up'
+
+
+class TrendTracker:
+    """
+    리뷰 감정/부정 키워드 비율의 추이를 점진적으로 갱신하는 추적기
+
+    - 리뷰를 날짜순으로 받아 하루 단위로 모으고, 하루가 끝나면(더 늦은 날짜의 글이 오면)
+      지표별 EWMA 평균/분산과 최근 window_days일 합계를 갱신합니다.
+      지나간 리뷰는 다시 읽지 않으며, 지표 하나가 차지하는 상태 크기는 일정합니다.
+    - 부정 비율과 부정 키워드 언급 비율이 평소(EWMA)보다 min_delta(%p) 이상, 그리고
+      z_threshold배의 표준편차(지난 변동폭과 그날 리뷰 수로 인한 표본 오차 중 큰 쪽) 이상
+      벗어나면 이상 징후로 기록합니다. 언급 1건만으로는 증가로 보지 않습니다.
+      아직 진행 중인 날도 임시로 검사해 바로 알립니다.
+    - 이미 마감한 날짜보다 이른 글(늦게 수집된 글)은 반영하지 않습니다.
+
+    상태는 JSON 파일(data/cache/trend_state.json)에 저장됩니다.
+
+    사용 예:
+        tracker = TrendTracker()
+        events = tracker.update(analyzed_reviews)
+        tracker.save()
+        snapshot = tracker.snapshot()   # 전략 보고서/대시보드용 요약
+    """
+
+    def __init__(self, path='data/cache/trend_state.json', window_days=7, alpha=0.3,
+                 min_delta=15.0, z_threshold=2.0, min_reviews=3, warmup_days=3, max_events=100):
+        self.path = path
+        self.window_days = window_days
+        self.alpha = alpha
+        self.min_delta = min_delta
+        self.z_threshold = z_threshold
+        self.min_reviews = min_reviews
+        self.warmup_days = warmup_days
+        self.max_events = max_events
+
+        self._dirty = False
+        self._load()
+
+    # 상태 저장/불러오기
+    def _reset(self):
+        self.reviews_seen = 0
+        self.observed_days = 0
+        self.last_closed = None
+        self.totals = collections.deque(maxlen=self.window_days)
+        self.series = {name: _Series(self.window_days) for name in SENTIMENT_SERIES}
+        self.events = []
+
+        # 진행 중인 하루 (같은 글이 다음 실행에 다시 들어와도 한 번만 셈)
+        self.open_date = None
+        self.open_total = 0
+        self.open_hits = collections.Counter()
+        self.open_links = set()
+
+    def _load(self):
+        self._reset()
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.reviews_seen = state['reviews_seen']
+            self.observed_days = state['observed_days']
+            self.last_closed = state['last_closed']
+            self.totals.extend(state['totals'])
+            for name, series in state['series'].items():
+                self.series[name] = _Series(self.window_days, **series)
+            self.events = state['events']
+            self.open_date = state['open_date']
+            self.open_total = state['open_total']
+            self.open_hits.update(state['open_hits'])
+            self.open_links.update(state['open_links'])
+        except (OSError, KeyError, TypeError, json.JSONDecodeError) as e:
+            print(f"⚠️ 추이 상태 로드 실패, 새로 시작합니다: {e}")
+            self._reset()
+
+    def save(self):
+        """바뀐 내용이 있을 때만 저장"""
+        if not self._dirty:
+            return False
+
+        state = {
+            'reviews_seen': self.reviews_seen,
+            'observed_days': self.observed_days,
+            'last_closed': self.last_closed,
+            'totals': list(self.totals),
+            'series': {name: series.to_dict() for name, series in self.series.items()},
+            'events': self.events,
+            'open_date': self.open_date,
+            'open_total': self.open_total,
+            'open_hits': dict(self.open_hits),
+            'open_links': sorted(self.open_links)
+        }
+        _write_json(self.path, state)
+        self._dirty = False
+        return True
+
+    # 하루 단위 집계
+    def _series_for(self, name):
+        series = self.series.get(name)
+        if series is None:
+            # 새 키워드는 지금까지 매일 0%였던 것과 같음
+            hits = [0] * len(self.totals)
+            series = self.series[name] = _Series(
+                self.window_days, ewma=0.0 if self.observed_days else None, hits=hits
+            )
+        return series
+
+    def _check(self, day, name, series, hits, total):
+        """하루 비율이 평소와 크게 다르면 이상 징후 dict 반환"""
+        if total < self.min_reviews or series.ewma is None or self.observed_days < self.warmup_days:
+            return None
+        if name not in ALERT_SERIES and not name.startswith(KEYWORD_PREFIX):
+            return None
+
+        value = hits / total * 100
+        delta = value - series.ewma
+        if delta > 0 and hits < 2:
+            return None
+        baseline = series.ewma / 100
+        sampling_error = math.sqrt(baseline * (1 - baseline) / total) * 100
+        spread = max(math.sqrt(series.ewvar), sampling_error)
+        if abs(delta) < self.min_delta or abs(delta) < self.z_threshold * spread:
+            return None
+        return {
+            'date': day,
+            'series': name,
+            'direction': 'up' if delta > 0 else 'down',
+            'value': round(value, 1),
+            'baseline': round(series.ewma, 1),
+            'delta': round(delta, 1),
+            'reviews': total
+        }
+
+    def _record_event(self, event):
+        """이상 징후 기록 (같은 날짜/지표는 최신 값으로 덮어씀). 새 기록이면 True"""
+        for index, previous in enumerate(self.events):
+            if previous['date'] == event['date'] and previous['series'] == event['series']:
+                self.events[index] = event
+                return False
+        self.events.append(event)
+        del self.events[:-self.max_events]
+        METRICS.inc('trend_events', series=event['series'])
+        return True
+
+    def _check_open_day(self):
+        events = []
+        for name in list(self.series):
+            event = self._check(self.open_date, name, self.series[name],
+                                self.open_hits[name], self.open_total)
+            if event is not None and self._record_event(event):
+                events.append(event)
+        return events
+
+    def _close_day(self, next_date):
+        """진행 중인 하루를 마감하고 지표 갱신 (next_date까지 비어 있는 날은 0건으로 채움)"""
+        events = self._check_open_day()
+
+        for name, series in self.series.items():
+            hits = self.open_hits[name]
+            series.hits.append(hits)
+            if self.open_total:
+                value = hits / self.open_total * 100
+                if series.ewma is None:
+                    series.ewma = value
+                else:
+                    # 지수 가중 평균/분산 (값 하나로 O(1) 갱신)
+                    diff = value - series.ewma
+                    increment = self.alpha * diff
+                    series.ewma += increment
+                    series.ewvar = (1 - self.alpha) * (series.ewvar + diff * increment)
+        self.totals.append(self.open_total)
+        if self.open_total:
+            self.observed_days += 1
+
+        gap_days = (datetime.date.fromisoformat(next_date)
+                    - datetime.date.fromisoformat(self.open_date)).days - 1
+        for _ in range(min(gap_days, self.window_days)):
+            self.totals.append(0)
+            for series in self.series.values():
+                series.hits.append(0)
+
+        self.last_closed = self.open_date
+        self.open_date = next_date
+        self.open_total = 0
+        self.open_hits.clear()
+        self.open_links.clear()
+        return events
+
+    def _add(self, review):
+        self.open_total += 1
+        self.reviews_seen += 1
+        self.open_links.add(review.get('link'))
+
+        sentiment = review.get('sentiment')
+        if sentiment in SENTIMENT_SERIES:
+            self.open_hits[sentiment] += 1
+        # 한 리뷰에 같은 키워드가 여러 번 있어도 한 번만 셈 (리뷰 중 언급 비율)
+        for keyword in set(review.get('negative_keywords') or ()):
+            name = KEYWORD_PREFIX + keyword
+            self._series_for(name)
+            self.open_hits[name] += 1
+
+    def update(self, reviews):
+        """
+        감정 분석된 리뷰 반영 (이번 목록 안에서만 날짜순 정렬)
+
+        Returns:
+            list: 새로 감지된 이상 징후
+        """
+        dated = []
+        for review in reviews:
+            try:
+                day = datetime.date.fromisoformat(review['date']).isoformat()
+            except (KeyError, TypeError, ValueError):
+                METRICS.inc('trend_reviews_skipped', reason='date')
+                continue
+            if 'sentiment' not in review:
+                METRICS.inc('trend_reviews_skipped', reason='not_analyzed')
+                continue
+            dated.append((day, review))
+        dated.sort(key=lambda item: item[0])
+
+        events = []
+        for day, review in dated:
+            if self.open_date is None:
+                self.open_date = day
+            elif day < self.open_date:
+                METRICS.inc('trend_reviews_skipped', reason='late')
+                continue
+            elif day > self.open_date:
+                events.extend(self._close_day(day))
+
+            if review.get('link') in self.open_links:
+                continue
+            self._add(review)
+            self._dirty = True
+
+        if self.open_date is not None:
+            events.extend(self._check_open_day())
+        if events:
+            self._dirty = True
+        for event in events:
+            mark = '🚨' if is_warning(event) else '📉'
+            print(f"{mark} {event['date']} {event['series']}: {event['value']}% "
+                  f"(평소 {event['baseline']}%, {event['delta']:+}%p)")
+        return events
+
+    # 요약
+    def snapshot(self, recent_events=10):
+        """
+        전략 보고서/대시보드용 요약 (진행 중인 하루 포함 최근 window_days일 기준)
+
+        Returns:
+            dict: {'as_of', 'window_days', 'window_reviews', 'series': {이름: {...}}, 'alerts': [...]}
+        """
+        window_total = sum(self.totals) + self.open_total
+        series_summary = {}
+        for name, series in self.series.items():
+            window_hits = sum(series.hits) + self.open_hits[name]
+            if name.startswith(KEYWORD_PREFIX) and not window_hits:
+                continue
+            series_summary[name] = {
+                'window_ratio': _ratio(window_hits, window_total),
+                'window_hits': window_hits,
+                'ewma': round(series.ewma, 1) if series.ewma is not None else None,
+                'today': _ratio(self.open_hits[name], self.open_total)
+            }
+
+        cutoff = None
+        if self.open_date is not None:
+            cutoff = (datetime.date.fromisoformat(self.open_date)
+                      - datetime.timedelta(days=self.window_days)).isoformat()
+        alerts = [event for event in self.events
+                  if is_warning(event) and cutoff is not None and event['date'] > cutoff]
+        return {
+            'as_of': self.open_date,
+            'reviews_seen': self.reviews_seen,
+            'window_days': self.window_days,
+            'window_reviews': window_total,
+            'series': series_summary,
+            'alerts': alerts[-recent_events:]
+        }
+
+    def write_snapshot(self, path=SNAPSHOT_PATH):
+        """대시보드가 읽는 요약 파일 저장 (내용이 같으면 그대로 두고 False)"""
+        snapshot = self.snapshot()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    if json.load(f) == snapshot:
+                        return False
+            except (OSError, json.JSONDecodeError):
+                pass
+        _write_json(path, snapshot)
+        return True
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """저장된 추이 요약 (없으면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def format_trend_lines(snapshot, max_keywords=3):
+    """보고서용 추이 요약 문장 목록"""
+    if not snapshot or not snapshot.get('window_reviews'):
+        return []
+
+    series = snapshot['series']
+    lines = []
+    negative = series.get('negative')
+    if negative:
+        baseline = f" (평소 {negative['ewma']}%)" if negative['ewma'] is not None else ""
+        lines.append(f"- **최근 {snapshot['window_days']}일 부정 비율**: "
+                     f"{negative['window_ratio']}%{baseline}, 리뷰 {snapshot['window_reviews']}개")
+
+    keywords = sorted(
+        ((name[len(KEYWORD_PREFIX):], data) for name, data in series.items()
+         if name.startswith(KEYWORD_PREFIX)),
+        key=lambda item: -item[1]['window_hits']
+    )
+    for keyword, data in keywords[:max_keywords]:
+        lines.append(f"- **{keyword}** 언급: 리뷰의 {data['window_ratio']}% ({data['window_hits']}건)")
+
+    for event in snapshot.get('alerts', []):
+        label = event['series']
+        if label.startswith(KEYWORD_PREFIX):
+            label = f"'{label[len(KEYWORD_PREFIX):]}' 언급"
+        else:
+            label = '부정 리뷰' if label == 'negative' else '긍정 리뷰'
+        lines.append(f"- 🚨 **{event['date']}** {label} 비율 {event['value']}% "
+                     f"(평소 {event['baseline']}%)")
+    return lines
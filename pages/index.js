@@ -2,7 +2,7 @@
 import { useState } from 'react';
 import Head from 'next/head';
 
-export default function Dashboard({ reviews, strategy }) {
+export default function Dashboard({ reviews, strategy, trend }) {
   const [activeTab, setActiveTab] = useState('overview');
 
   // 감정 분석 통계 계산
@@ -24,6 +24,15 @@ export default function Dashboard({ reviews, strategy }) {
 
   const stats = getSentimentStats();
 
+  // 누적 추이 (data/trends/latest.json, 파이프라인 trend 단계에서 생성)
+  const trendKeywords = trend
+    ? Object.entries(trend.series)
+        .filter(([name]) => name.startsWith('keyword:'))
+        .map(([name, data]) => ({ keyword: name.slice('keyword:'.length), ...data }))
+        .sort((a, b) => b.window_hits - a.window_hits)
+        .slice(0, 5)
+    : [];
+
   return (
     <div className="min-h-screen pink-gradient-bg">
       <Head>
@@ -189,6 +198,41 @@ export default function Dashboard({ reviews, strategy }) {
                 </div>
               </div>
             )}
+
+            {/* 최근 추이 및 이상 징후 */}
+            {trend && trend.window_reviews > 0 && (
+              <div className="bg-white rounded-2xl shadow-lg p-8">
+                <h3 className="text-2xl font-bold text-pink-600 mb-2 text-center">
+                  📈 최근 {trend.window_days}일 추이
+                </h3>
+                <p className="text-center text-gray-500 mb-6">
+                  리뷰 {trend.window_reviews}개 • 부정 비율 {trend.series.negative.window_ratio}%
+                  {trend.series.negative.ewma !== null && ` (평소 ${trend.series.negative.ewma}%)`}
+                </p>
+
+                {trend.alerts.length > 0 && (
+                  <div className="space-y-3 mb-6">
+                    {trend.alerts.map((alert) => (
+                      <div key={`${alert.date}-${alert.series}`} className="p-4 rounded-xl bg-red-50 border-l-4 border-red-400 text-red-700">
+                        🚨 {alert.date}{' '}
+                        {alert.series === 'negative' ? '부정 리뷰' : `'${alert.series.slice('keyword:'.length)}' 언급`}{' '}
+                        비율 {alert.value}% (평소 {alert.baseline}%)
+                      </div>
+                    ))}
+                  </div>
+                )}
+
+                {trendKeywords.length > 0 && (
+                  <div className="flex flex-wrap justify-center gap-3">
+                    {trendKeywords.map((item) => (
+                      <span key={item.keyword} className="inline-flex items-center px-4 py-2 rounded-full text-sm font-medium bg-red-100 text-red-800">
+                        {item.keyword} {item.window_ratio}% ({item.window_hits}건)
+                      </span>
+                    ))}
+                  </div>
+                )}
+              </div>
+            )}
           </div>
         )}
 
@@ -306,6 +350,7 @@ export default function Dashboard({ reviews, strategy }) {
 export async function getStaticProps() {
   let reviews = [];
   let strategy = '';
+  let trend = null;
 
   try {
     const fs = require('fs');
@@ -345,6 +390,12 @@ export async function getStaticProps() {
       }
     }
 
+    // 추이 요약 파일
+    const trendPath = path.join(process.cwd(), 'data', 'trends', 'latest.json');
+    if (fs.existsSync(trendPath)) {
+      trend = JSON.parse(fs.readFileSync(trendPath, 'utf8'));
+    }
+
   } catch (error) {
     console.error('데이터 로딩 에러:', error);
   }
@@ -352,7 +403,8 @@ export async function getStaticProps() {
   return {
     props: {
       reviews,
-      strategy
+      strategy,
+      trend
     },
     revalidate: 3600 // 1시간마다 재생성
   };